@@ -26,7 +26,11 @@ from .actions_runtime import (
 from .const import (
     AMBIENT_BRIGHT_THRESHOLD_DEFAULT,
     AMBIENT_DARK_THRESHOLD_DEFAULT,
-    AUTOSAVE_DEBOUNCE_SECONDS,
+    AUTOMATION_STARTUP_REAPPLY_CONCURRENCY,
+    CONF_STARTUP_BUDGET_SECONDS,
+    CONF_STARTUP_REAPPLY_CONCURRENCY,
+    CONF_STATE_JOURNAL,
+    DEFAULT_STARTUP_BUDGET_SECONDS,
     DOMAIN,
     EVENT_TOPOMATION_HANDOFF_TRACE,
     EVENT_TOPOMATION_OCCUPANCY_CHANGED,
@@ -37,9 +41,11 @@ from .const import (
     STORAGE_VERSION,
 )
 from .coordinator import TopomationCoordinator
+from .entity_dispatcher import LocationEventDispatcher
 from .event_bridge import EventBridge
 from .managed_actions import TopomationManagedActions
 from .panel import async_register_panel, async_unregister_panel
+from .persistence import StateJournal, TopomationPersistence
 from .recent_activity import (
     EVENT_RECENT_ACTIVITY_CHANGED,
     TopomationRecentActivityModule,
@@ -48,8 +54,9 @@ from .recent_activity import (
     MODULE_ID as RECENT_ACTIVITY_MODULE_ID,
 )
 from .services import async_register_services, async_unregister_services
+from .startup_timing import StartupTimer
 from .sync_manager import SyncManager, managed_shadow_entity_ids_for_ambient
-from .websocket_api import async_register_websocket_api, build_occupancy_projection_states
+from .websocket_api import OccupancyProjectionStore, async_register_websocket_api
 
 if TYPE_CHECKING:
     from homeassistant.config_entries import ConfigEntry
@@ -58,6 +65,16 @@ _LOGGER = logging.getLogger(__name__)
 _META_ROLE_KEY = "role"
 _MANAGED_SHADOW_ROLE = "managed_shadow"
 _MAX_OCCUPANCY_EXPLAINABILITY_EVENTS = 20
+# Kernel events that mutate persisted topology config (``topomation.config``).
+_CONFIG_PERSIST_EVENT_TYPES = (
+    "location.created",
+    "location.deleted",
+    "location.parent_changed",
+    "location.renamed",
+    "adjacency.created",
+    "adjacency.updated",
+    "adjacency.deleted",
+)
 # Drop stayed-occupied explainability rows when another occupied state row was
 # logged moments ago (motion + lights + propagation bursts).
 _OCCUPANCY_EXTENSION_EXPLAINABILITY_THROTTLE_SECONDS = 10
@@ -458,15 +475,23 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     _LOGGER.info("Setting up Topomation integration")
 
     hass.data.setdefault(DOMAIN, {})
+    startup = StartupTimer(
+        budget_seconds=float(
+            entry.options.get(CONF_STARTUP_BUDGET_SECONDS, DEFAULT_STARTUP_BUDGET_SECONDS)
+        )
+    )
 
     # 1. Create kernel components
     loc_mgr = LocationManager()
     bus = EventBus()
     bus.set_location_manager(loc_mgr)
-    loc_mgr.set_event_bus(bus)
+    startup.lap("kernel_init")
 
-    # 2. Load saved configuration
+    # 2. Load saved configuration. The bus is attached afterwards so the bulk
+    # restore does not publish one location.created event per location.
     has_saved_configuration = await _load_configuration(hass, loc_mgr)
+    loc_mgr.set_event_bus(bus)
+    startup.lap("config_load")
 
     # 3. Initialize modules
     platform_adapter = HAPlatformAdapter(hass)
@@ -490,29 +515,63 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         lambda: deque(maxlen=_MAX_OCCUPANCY_EXPLAINABILITY_EVENTS)
     )
 
+    startup.lap("module_init")
+
     # 4. Attach modules to kernel
     for module in modules.values():
         module.attach(bus, loc_mgr)
+    startup.lap("module_attach")
 
     # 5. Set up default configs for new locations
     _setup_default_configs(loc_mgr, modules)
+    startup.lap("default_configs")
+
+    persistence = TopomationPersistence(
+        hass,
+        config_payload=lambda: _configuration_payload(loc_mgr),
+        state_payload=lambda: _module_state_payload(modules),
+    )
+    journal = (
+        persistence.enable_journal(modules)
+        if entry.options.get(CONF_STATE_JOURNAL, False)
+        else None
+    )
 
     # 6. Restore module runtime state
-    await _restore_module_state(hass, loc_mgr, modules)
+    await _restore_module_state(hass, loc_mgr, modules, journal=journal)
+    if journal is not None:
+        # Fold the replayed journal into a fresh snapshot before new records append.
+        await journal.async_compact()
+    startup.lap("state_restore")
 
     # 7. Create coordinator for timeout scheduling
     coordinator = TopomationCoordinator(hass, modules)
+    # Recent activity pushes its per-property expiries; kernel modules are polled.
+    recent_activity_module.set_deadline_callback(
+        coordinator.push_deadlines_for(RECENT_ACTIVITY_MODULE_ID)
+    )
 
     # Keep timeout scheduling aligned with runtime occupancy changes.
     # Initial scheduling happens at startup, then this hook reschedules whenever
-    # occupancy events mutate active holds/timeouts.
+    # occupancy events mutate active holds/timeouts. One state change can publish
+    # several such events; the coordinator recomputes once per loop iteration.
     @callback
     def _reschedule_timeouts(_: Event) -> None:
-        coordinator.schedule_next_timeout()
+        coordinator.request_reschedule()
 
     bus.subscribe(_reschedule_timeouts, EventFilter(event_type="occupancy.changed"))
     bus.subscribe(_reschedule_timeouts, EventFilter(event_type="occupancy.signal"))
 
+    # Last projected panel row per location; occupancy.changed refreshes only the
+    # changed location, its occupancy-group peers, and their ancestors.
+    occupancy_projection = OccupancyProjectionStore(
+        hass,
+        loc_mgr,
+        occupancy_module,
+        occupancy_recent_changes,
+    )
+    occupancy_projection.attach(bus)
+
     @callback
     def _forward_occupancy_changed(event: Event) -> None:
         """Mirror kernel occupancy changes onto HA event bus for panel live updates."""
@@ -557,28 +616,26 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         ha_payload["recent_changes"] = list(recent_changes)
 
         hass.bus.async_fire(EVENT_TOPOMATION_OCCUPANCY_CHANGED, ha_payload)
-        kernel = hass.data.get(DOMAIN, {}).get(entry.entry_id)
-        if isinstance(kernel, dict):
-            try:
-                projected_states = build_occupancy_projection_states(hass, kernel)
-            except Exception:  # pragma: no cover - defensive event bridge
-                _LOGGER.debug(
-                    "Failed to build occupancy projection for live event",
-                    exc_info=True,
-                )
-            else:
-                live_states = _live_occupancy_projection_event_states(
-                    projected_states,
-                    location_id,
+        try:
+            projected_states = occupancy_projection.refresh_location(location_id)
+        except Exception:  # pragma: no cover - defensive event bridge
+            _LOGGER.debug(
+                "Failed to build occupancy projection for live event",
+                exc_info=True,
+            )
+        else:
+            live_states = _live_occupancy_projection_event_states(
+                projected_states,
+                location_id,
+            )
+            if live_states:
+                hass.bus.async_fire(
+                    EVENT_TOPOMATION_OCCUPANCY_STATE_CHANGED,
+                    {
+                        "entry_id": entry.entry_id,
+                        "states": live_states,
+                    },
                 )
-                if live_states:
-                    hass.bus.async_fire(
-                        EVENT_TOPOMATION_OCCUPANCY_STATE_CHANGED,
-                        {
-                            "entry_id": entry.entry_id,
-                            "states": live_states,
-                        },
-                    )
 
     bus.subscribe(_forward_occupancy_changed, EventFilter(event_type="occupancy.changed"))
 
@@ -655,8 +712,15 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     bus.subscribe(_forward_handoff_trace, EventFilter(event_type="occupancy.handoff"))
 
+    startup.lap("runtime_wiring")
+
     # 8. Set up sync manager for bidirectional HA ↔ Topology sync
-    sync_manager = SyncManager(hass, loc_mgr, bus)
+    sync_manager = SyncManager(
+        hass,
+        loc_mgr,
+        bus,
+        on_topology_changed=persistence.schedule_config,
+    )
     await sync_manager.async_setup()
     has_explicit_root = any(
         bool(getattr(location, "is_explicit_root", False))
@@ -676,6 +740,9 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             reparent_floors_to_default_building=not has_saved_configuration,
         )
         _setup_default_configs(loc_mgr, modules)
+        # Bootstrap may have retyped the home anchor as a property.
+        recent_activity_module.invalidate_ancestor_cache()
+    startup.lap("sync_import")
 
     # Managed shadow areas for floor/building/grounds/property hosts must exist before
     # platforms register occupancy entities (hosts no longer expose their own sensors).
@@ -685,18 +752,30 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     occupancy_rebuild = getattr(occupancy_module, "on_location_config_changed", None)
     if callable(occupancy_rebuild):
         occupancy_rebuild("__managed_shadow_reconcile__", {})
+    startup.lap("shadow_reconcile")
 
     # 9. Set up event bridge (HA → kernel)
     event_bridge = EventBridge(hass, bus, loc_mgr, modules.get("occupancy"))
     await event_bridge.async_setup()
+    startup.lap("event_bridge_setup")
     reconcile = getattr(event_bridge, "async_reconcile_policy_sources", None)
     if callable(reconcile):
         maybe_awaitable = reconcile()
         if isawaitable(maybe_awaitable):
             await maybe_awaitable
+    startup.lap("policy_reconcile")
 
     # 10. Runtime observers for occupied/vacant native HA automations.
-    actions_runtime = TopomationActionsRuntime(hass, loc_mgr, bus)
+    actions_runtime = TopomationActionsRuntime(
+        hass,
+        loc_mgr,
+        bus,
+        startup_reapply_concurrency=int(
+            entry.options.get(
+                CONF_STARTUP_REAPPLY_CONCURRENCY, AUTOMATION_STARTUP_REAPPLY_CONCURRENCY
+            )
+        ),
+    )
     await actions_runtime.async_setup()
     managed_action_rules = TopomationManagedActions(hass, loc_mgr)
     managed_rule_rebuild_unsub: Callable[[], None] | None = None
@@ -751,74 +830,42 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         EventFilter(event_type="location.deleted"),
     )
 
-    # 11. Debounced persistence scheduler for runtime/config edits.
-    autosave_unsub = None
-    autosave_running = False
-    autosave_again = False
-
-    async def _run_autosave() -> None:
-        nonlocal autosave_running, autosave_again
-        if autosave_running:
-            autosave_again = True
-            return
+    startup.lap("actions_runtime")
 
-        autosave_running = True
-        try:
-            await _save_state(hass, entry.entry_id, loc_mgr, modules)
-        except Exception:  # pragma: no cover - defensive logging
-            _LOGGER.exception("Debounced autosave failed")
-        finally:
-            autosave_running = False
-            if autosave_again:
-                autosave_again = False
-                _schedule_persist("coalesced")
+    # 11. Debounced persistence: topology config and runtime state are written by
+    # separate writers, each only after its own kind of change.
+    _schedule_persist = persistence.schedule_config
+    _cancel_pending_persist = persistence.cancel
 
     @callback
-    def _schedule_persist(reason: str = "unspecified") -> None:
-        nonlocal autosave_unsub
-        if autosave_unsub is not None:
-            return
-
-        _LOGGER.debug("Scheduling Topomation autosave (%s)", reason)
-
-        @callback
-        def _handle_autosave(_: Any) -> None:
-            nonlocal autosave_unsub
-            autosave_unsub = None
-            hass.async_create_task(_run_autosave())
-
-        autosave_unsub = async_call_later(
-            hass,
-            AUTOSAVE_DEBOUNCE_SECONDS,
-            _handle_autosave,
-        )
+    def _schedule_config_on_topology_event(event: Event) -> None:
+        persistence.schedule_config(event.type)
 
-    @callback
-    def _cancel_pending_persist() -> None:
-        nonlocal autosave_unsub
-        if autosave_unsub is None:
-            return
-        autosave_unsub()
-        autosave_unsub = None
+    for event_type in _CONFIG_PERSIST_EVENT_TYPES:
+        bus.subscribe(_schedule_config_on_topology_event, EventFilter(event_type=event_type))
 
     @callback
-    def _schedule_persist_on_occupancy(_: Event) -> None:
-        _schedule_persist("occupancy.changed")
-
-    bus.subscribe(_schedule_persist_on_occupancy, EventFilter(event_type="occupancy.changed"))
+    def _schedule_state_on_occupancy(event: Event) -> None:
+        persistence.schedule_state(event.type, "occupancy", event.location_id)
 
     @callback
-    def _schedule_persist_on_recent_activity(_: Event) -> None:
-        _schedule_persist("recent_activity.changed")
+    def _schedule_state_on_recent_activity(event: Event) -> None:
+        persistence.schedule_state(event.type, RECENT_ACTIVITY_MODULE_ID, event.location_id)
 
+    bus.subscribe(_schedule_state_on_occupancy, EventFilter(event_type="occupancy.changed"))
     bus.subscribe(
-        _schedule_persist_on_recent_activity,
+        _schedule_state_on_recent_activity,
         EventFilter(event_type=EVENT_RECENT_ACTIVITY_CHANGED),
     )
 
     # Persist topology migration updates for existing installs as soon as possible.
     if should_bootstrap_structure and has_saved_configuration:
         _schedule_persist("upgrade/ensure_home_root")
+    # Entities register per-location occupancy handlers here instead of each
+    # subscribing to every occupancy event on the bus.
+    entity_dispatcher = LocationEventDispatcher(bus)
+    entry.async_on_unload(entity_dispatcher.async_teardown)
+
     # 12. Store kernel in hass.data
     hass.data[DOMAIN][entry.entry_id] = {
         "entry": entry,
@@ -827,26 +874,33 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         "modules": modules,
         "coordinator": coordinator,
         "occupancy_recent_changes": occupancy_recent_changes,
+        "occupancy_projection": occupancy_projection,
+        "entity_dispatcher": entity_dispatcher,
         "sync_manager": sync_manager,
         "event_bridge": event_bridge,
         "actions_runtime": actions_runtime,
         "managed_action_rules": managed_action_rules,
+        "persistence": persistence,
         "schedule_persist": _schedule_persist,
         "cancel_pending_persist": _cancel_pending_persist,
+        "startup_timing": startup,
     }
 
     # Apply options to existing registry entries before platform setup.
     _prune_hidden_entities(hass, entry)
 
     entry.async_on_unload(entry.add_update_listener(_async_handle_options_update))
+    startup.lap("persistence_wiring")
 
     # 13. Register panel, WebSocket API, and services
     await async_register_panel(hass, entry.entry_id)
     async_register_websocket_api(hass)
     async_register_services(hass)
+    startup.lap("panel_websocket_services")
 
     # 14. Set up platforms (entities)
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    startup.lap("platform_forwarding")
 
     # 15. Schedule initial timeout check
     coordinator.schedule_next_timeout()
@@ -855,12 +909,15 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     @callback
     async def save_state_on_shutdown(_: Event) -> None:
         """Save state before shutdown."""
-        await _save_state(hass, entry.entry_id, loc_mgr, modules)
+        await persistence.async_save_all()
 
     entry.async_on_unload(
         hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, save_state_on_shutdown)
     )
 
+    startup.lap("finalize")
+    startup.finish(entry.entry_id)
+
     _LOGGER.info("Topomation integration setup complete")
     return True
 
@@ -875,12 +932,16 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     if callable(cancel_pending_persist):
         cancel_pending_persist()
 
-    await _save_state(
-        hass,
-        entry.entry_id,
-        kernel["location_manager"],
-        kernel["modules"],
-    )
+    persistence: TopomationPersistence | None = kernel.get("persistence")
+    if persistence is not None:
+        await persistence.async_save_all()
+    else:
+        await _save_state(
+            hass,
+            entry.entry_id,
+            kernel["location_manager"],
+            kernel["modules"],
+        )
 
     # Unload platforms
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
@@ -898,6 +959,11 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         actions_runtime: TopomationActionsRuntime = kernel["actions_runtime"]
         await actions_runtime.async_teardown()
 
+        # Stop timeout scheduling
+        coordinator: TopomationCoordinator | None = kernel.get("coordinator")
+        if coordinator is not None:
+            coordinator.async_cancel()
+
         # Remove from hass.data
         hass.data[DOMAIN].pop(entry.entry_id)
         if not hass.data[DOMAIN]:
@@ -993,6 +1059,68 @@ def _supports_adjacency_dump(loc_mgr: LocationManager) -> bool:
     return callable(list_method)
 
 
+def _pending_restore_key(location_id: str, item: Mapping[str, Any]) -> tuple[str, int, str, str]:
+    """Stable create ordering that preserves sibling order indexes on restore."""
+    parent_id = item.get("parent_id")
+    parent_key = str(parent_id) if isinstance(parent_id, str) and parent_id else ""
+    raw_order = item.get("order")
+    order_key = raw_order if isinstance(raw_order, int) else 10**9
+    name_key = str(item.get("name", location_id)).casefold()
+    return parent_key, order_key, name_key, location_id
+
+
+def _location_restore_plan(
+    pending: Mapping[str, Mapping[str, Any]],
+    loc_mgr: LocationManager,
+) -> list[tuple[str, Mapping[str, Any], bool]]:
+    """Return ``(location_id, item, orphaned)`` in parent-first creation order.
+
+    One topological pass: siblings are sorted once by ``_pending_restore_key``
+    and each subtree is emitted right after its parent. Items whose parent is
+    neither pending nor already present (dangling references and cycles) are
+    emitted as orphans, smallest key first, followed by their subtrees.
+    """
+    children: dict[str, list[str]] = defaultdict(list)
+    roots: list[str] = []
+    for location_id, item in pending.items():
+        parent_id = item.get("parent_id")
+        if parent_id and parent_id in pending:
+            children[parent_id].append(location_id)
+        elif not parent_id or loc_mgr.get_location(parent_id) is not None:
+            roots.append(location_id)
+
+    restore_keys = {
+        location_id: _pending_restore_key(location_id, item) for location_id, item in pending.items()
+    }
+    _key = restore_keys.__getitem__
+    for sibling_ids in children.values():
+        sibling_ids.sort(key=_key)
+
+    plan: list[tuple[str, Mapping[str, Any], bool]] = []
+    visited: set[str] = set()
+
+    def _emit_subtree(start_id: str, orphaned: bool) -> None:
+        visited.add(start_id)
+        plan.append((start_id, pending[start_id], orphaned))
+        queue = deque(children.get(start_id, ()))
+        while queue:
+            location_id = queue.popleft()
+            if location_id in visited:
+                continue
+            visited.add(location_id)
+            plan.append((location_id, pending[location_id], False))
+            queue.extend(children.get(location_id, ()))
+
+    for location_id in sorted(roots, key=_key):
+        _emit_subtree(location_id, orphaned=False)
+
+    if len(visited) < len(pending):
+        for location_id in sorted(pending.keys() - visited, key=_key):
+            if location_id not in visited:
+                _emit_subtree(location_id, orphaned=True)
+    return plan
+
+
 async def _load_configuration(hass: HomeAssistant, loc_mgr: LocationManager) -> bool:
     """Load saved location configuration.
 
@@ -1022,62 +1150,29 @@ async def _load_configuration(hass: HomeAssistant, loc_mgr: LocationManager) ->
         normalized = dict(item)
         pending[location_id] = normalized
 
-    def _pending_restore_key(location_id: str, item: Mapping[str, Any]) -> tuple[str, int, str, str]:
-        """Stable create ordering that preserves sibling order indexes on restore."""
-        parent_id = item.get("parent_id")
-        parent_key = str(parent_id) if isinstance(parent_id, str) and parent_id else ""
-        raw_order = item.get("order")
-        order_key = raw_order if isinstance(raw_order, int) else 10**9
-        name_key = str(item.get("name", location_id)).casefold()
-        return parent_key, order_key, name_key, location_id
-
     created: set[str] = set()
-    while pending:
-        progressed = False
-        for location_id, item in sorted(
-            pending.items(),
-            key=lambda entry: _pending_restore_key(entry[0], entry[1]),
-        ):
-            parent_id = item.get("parent_id")
-            if parent_id and parent_id not in created and loc_mgr.get_location(parent_id) is None:
-                continue
-
-            if loc_mgr.get_location(location_id) is None:
-                try:
+    for location_id, item, orphaned in _location_restore_plan(pending, loc_mgr):
+        if loc_mgr.get_location(location_id) is None:
+            try:
+                if orphaned:
+                    # Cycle or dangling parent reference: restore as unassigned.
                     loc_mgr.create_location(
                         id=location_id,
                         name=item.get("name", location_id),
-                        parent_id=parent_id,
+                        parent_id=None,
+                        is_explicit_root=False,
+                        order=item.get("order"),
+                    )
+                else:
+                    loc_mgr.create_location(
+                        id=location_id,
+                        name=item.get("name", location_id),
+                        parent_id=item.get("parent_id"),
                         is_explicit_root=bool(item.get("is_explicit_root", False)),
                         order=item.get("order"),
                     )
-                except ValueError as err:
-                    _LOGGER.warning("Failed to restore location %s: %s", location_id, err)
-
-            created.add(location_id)
-            pending.pop(location_id)
-            progressed = True
-
-        if progressed:
-            continue
-
-        # Break cycles or bad parent references by forcing creation.
-        location_id, item = min(
-            pending.items(),
-            key=lambda entry: _pending_restore_key(entry[0], entry[1]),
-        )
-        pending.pop(location_id)
-        if loc_mgr.get_location(location_id) is None:
-            try:
-                loc_mgr.create_location(
-                    id=location_id,
-                    name=item.get("name", location_id),
-                    parent_id=None,
-                    is_explicit_root=False,
-                    order=item.get("order"),
-                )
             except ValueError as err:
-                _LOGGER.warning("Failed to restore orphan location %s: %s", location_id, err)
+                _LOGGER.warning("Failed to restore location %s: %s", location_id, err)
         created.add(location_id)
 
     # Restore entity mappings and per-location module configs.
@@ -1397,10 +1492,14 @@ async def _restore_module_state(
     hass: HomeAssistant,
     loc_mgr: LocationManager,
     modules: dict[str, Any],
+    *,
+    journal: StateJournal | None = None,
 ) -> None:
-    """Restore runtime state for all modules."""
+    """Restore runtime state for all modules, replaying the state journal when enabled."""
     store = Store(hass, STORAGE_VERSION, STORAGE_KEY_STATE)
     data = await store.async_load()
+    if journal is not None:
+        data = await journal.async_replay(data)
 
     if not data:
         _LOGGER.debug("No saved state found")
@@ -1434,10 +1533,20 @@ async def _save_state(
     loc_mgr: LocationManager,
     modules: dict[str, Any],
 ) -> None:
-    """Save kernel state to persistent storage."""
+    """Save module runtime state and topology configuration to persistent storage."""
     _LOGGER.debug("Saving kernel state")
 
-    # Save module state
+    state_store = Store(hass, STORAGE_VERSION, STORAGE_KEY_STATE)
+    await state_store.async_save(_module_state_payload(modules))
+
+    config_store = Store(hass, STORAGE_VERSION, STORAGE_KEY_CONFIG)
+    await config_store.async_save(_configuration_payload(loc_mgr))
+
+    _LOGGER.info("Kernel state saved")
+
+
+def _module_state_payload(modules: dict[str, Any]) -> dict[str, Any]:
+    """Return the ``topomation.state`` payload (module runtime state)."""
     state_data = {}
     for module_id, module in modules.items():
         try:
@@ -1446,11 +1555,11 @@ async def _save_state(
             _LOGGER.error(
                 "Failed to dump state for %s: %s", module_id, e, exc_info=True
             )
+    return state_data
 
-    state_store = Store(hass, STORAGE_VERSION, STORAGE_KEY_STATE)
-    await state_store.async_save(state_data)
 
-    # Save topology configuration (locations, hierarchy, module configs).
+def _configuration_payload(loc_mgr: LocationManager) -> dict[str, Any]:
+    """Return the ``topomation.config`` payload (locations, hierarchy, module configs)."""
     config_locations: list[dict[str, Any]] = []
     for location in loc_mgr.all_locations():
         if location.id == "house" and location.is_explicit_root:
@@ -1508,7 +1617,4 @@ async def _save_state(
 
         config_payload["adjacency_edges"] = serialized_edges
 
-    config_store = Store(hass, STORAGE_VERSION, STORAGE_KEY_CONFIG)
-    await config_store.async_save(config_payload)
-
-    _LOGGER.info("Kernel state saved")
+    return config_payload
@@ -2,9 +2,10 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
-from collections.abc import Mapping
+from collections.abc import Iterable, Mapping, Sized
 from dataclasses import dataclass
 from time import monotonic
 from typing import TYPE_CHECKING, Any, Literal, cast
@@ -12,13 +13,17 @@ from typing import TYPE_CHECKING, Any, Literal, cast
 from home_topology import Event as KernelEvent
 from home_topology import EventBus, EventFilter
 from homeassistant.components.automation import DATA_COMPONENT as AUTOMATION_DATA_COMPONENT
+from homeassistant.components.automation import EVENT_AUTOMATION_RELOADED
 from homeassistant.const import EVENT_HOMEASSISTANT_STARTED
 from homeassistant.core import CALLBACK_TYPE, CoreState, HomeAssistant, callback
 from homeassistant.core import Event as HAEvent
-from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.event import async_call_later, async_track_state_change_event
 
+from .binary_sensor import async_get_occupancy_entity_id
 from .const import (
     AUTOMATION_STARTUP_BUFFER_SECONDS,
+    AUTOMATION_STARTUP_REAPPLY_CONCURRENCY,
     AUTOMATION_STARTUP_RECONCILE_INTERVAL_SECONDS,
     AUTOMATION_STARTUP_RECONCILE_TIMEOUT_SECONDS,
     EVENT_TOPOMATION_ACTIONS_SUMMARY,
@@ -61,7 +66,20 @@ class _TopomationMetadata:
 
 
 class TopomationActionsRuntime:
-    """Observe occupied/vacant transitions and startup reapply for action automations."""
+    """Observe occupied/vacant transitions and startup reapply for action automations.
+
+    Topomation-managed automations are parsed once into a catalog indexed by
+    location and by (location, trigger type). The catalog is rebuilt after an
+    automation reload, an automation entity registry change, or when the
+    automation component or its entity count changes. Enabled state is checked
+    per lookup against the automation's current HA state.
+
+    Startup rules left pending by a reapply pass are re-evaluated when one of
+    the entities they wait on (lux, ambient fallback or occupancy) reports a
+    known state, and once more when the reconcile window ends. Interval polling
+    remains only for waits no state listener can observe: automations not
+    loaded yet, or a location whose occupancy sensor is not registered.
+    """
 
     def __init__(
         self,
@@ -74,6 +92,7 @@ class TopomationActionsRuntime:
             AUTOMATION_STARTUP_RECONCILE_INTERVAL_SECONDS
         ),
         startup_reconcile_timeout_seconds: int = AUTOMATION_STARTUP_RECONCILE_TIMEOUT_SECONDS,
+        startup_reapply_concurrency: int = AUTOMATION_STARTUP_REAPPLY_CONCURRENCY,
     ) -> None:
         """Initialize runtime helpers."""
         self.hass = hass
@@ -82,12 +101,25 @@ class TopomationActionsRuntime:
         self._startup_delay_seconds = startup_delay_seconds
         self._startup_reconcile_interval_seconds = startup_reconcile_interval_seconds
         self._startup_reconcile_timeout_seconds = startup_reconcile_timeout_seconds
+        self._startup_reapply_concurrency = max(1, int(startup_reapply_concurrency))
+        self._last_startup_reapply: dict[str, Any] | None = None
         self._startup_listener_unsub: CALLBACK_TYPE | None = None
         self._startup_delay_unsub: CALLBACK_TYPE | None = None
         self._startup_reconcile_retry_unsub: CALLBACK_TYPE | None = None
         self._startup_reconcile_started_at: float | None = None
         self._startup_triggered_automation_ids: set[str] = set()
+        self._startup_inflight_automation_ids: set[str] = set()
+        self._startup_pending: dict[str, list[dict[str, Any]]] = {}
+        self._startup_watched: dict[str, set[str]] = {}
+        self._startup_tracked: dict[str, CALLBACK_TYPE] = {}
+        self._startup_timeout_unsub: CALLBACK_TYPE | None = None
+        self._startup_dirty_locations: set[str] = set()
         self._bus_subscribed = False
+        self._catalog_by_location: dict[str, tuple[_TopomationAutomation, ...]] | None = None
+        self._catalog_by_trigger: dict[tuple[str, str], tuple[str, ...]] = {}
+        self._catalog_signature: tuple[int, int | None] | None = None
+        self._catalog_builds = 0
+        self._catalog_unsubs: list[CALLBACK_TYPE] = []
 
     async def async_setup(self) -> None:
         """Set up occupancy transition summaries and optional startup reapply."""
@@ -98,6 +130,18 @@ class TopomationActionsRuntime:
             )
             self._bus_subscribed = True
 
+        if not self._catalog_unsubs:
+            self._catalog_unsubs = [
+                self.hass.bus.async_listen(
+                    EVENT_AUTOMATION_RELOADED, self._handle_automation_catalog_changed
+                ),
+                self.hass.bus.async_listen(
+                    er.EVENT_ENTITY_REGISTRY_UPDATED,
+                    self._handle_automation_catalog_changed,
+                    event_filter=self._is_automation_registry_event,
+                ),
+            ]
+
         if self.hass.state is CoreState.running:
             self._schedule_startup_reapply()
             return
@@ -113,6 +157,11 @@ class TopomationActionsRuntime:
             self._bus.unsubscribe(self._handle_occupancy_changed)
             self._bus_subscribed = False
 
+        for unsub in self._catalog_unsubs:
+            unsub()
+        self._catalog_unsubs = []
+        self.invalidate_automation_catalog()
+
         if callable(self._startup_listener_unsub):
             self._startup_listener_unsub()
             self._startup_listener_unsub = None
@@ -120,9 +169,37 @@ class TopomationActionsRuntime:
         if callable(self._startup_delay_unsub):
             self._startup_delay_unsub()
             self._startup_delay_unsub = None
-        if callable(self._startup_reconcile_retry_unsub):
-            self._startup_reconcile_retry_unsub()
-            self._startup_reconcile_retry_unsub = None
+        self._stop_startup_reconcile()
+
+    @callback
+    def invalidate_automation_catalog(self) -> None:
+        """Drop the parsed automation catalog; the next lookup rebuilds it."""
+        self._catalog_by_location = None
+        self._catalog_by_trigger = {}
+        self._catalog_signature = None
+
+    @staticmethod
+    @callback
+    def _is_automation_registry_event(event_data: Mapping[str, Any]) -> bool:
+        entity_id = event_data.get("entity_id")
+        old_entity_id = event_data.get("old_entity_id")
+        return any(
+            isinstance(value, str) and value.startswith("automation.")
+            for value in (entity_id, old_entity_id)
+        )
+
+    @callback
+    def _handle_automation_catalog_changed(self, _: HAEvent) -> None:
+        self.invalidate_automation_catalog()
+
+    def catalog_diagnostics(self) -> dict[str, int]:
+        """Return automation catalog size and rebuild count."""
+        catalog = self._catalog_by_location or {}
+        return {
+            "locations": len(catalog),
+            "automations": sum(len(automations) for automations in catalog.values()),
+            "builds": self._catalog_builds,
+        }
 
     @callback
     def _handle_homeassistant_started(self, _: HAEvent) -> None:
@@ -146,42 +223,96 @@ class TopomationActionsRuntime:
         )
 
     async def async_reapply_startup_actions(self) -> None:
-        """Apply startup-eligible automations for opted-in locations."""
+        """Apply startup-eligible automations for opted-in locations.
+
+        Locations run concurrently, at most ``startup_reapply_concurrency`` at a
+        time; each location still triggers its own automations in order.
+        """
+        start = monotonic()
         if self._startup_reconcile_started_at is None:
-            self._startup_reconcile_started_at = monotonic()
-        automations = self._iter_topomation_automations()
-        automations_by_location: dict[str, list[_TopomationAutomation]] = {}
-        for automation in automations:
-            automations_by_location.setdefault(automation.location_id, []).append(automation)
+            self._startup_reconcile_started_at = start
+        automations_by_location = self._enabled_automations_by_location()
 
-        total_pending = 0
+        startup_locations: list[tuple[str, list[_TopomationAutomation]]] = []
         total_startup_rules = 0
         for location in self._loc_mgr.all_locations():
             location_automations = automations_by_location.get(location.id, [])
-            total_startup_rules += sum(
+            startup_rules = sum(
                 1
                 for automation in location_automations
                 if automation.run_on_startup is True
             )
-            if not any(
-                automation.run_on_startup is True for automation in location_automations
-            ):
+            if startup_rules == 0:
                 continue
-            total_pending += await self._async_reapply_location(
-                location.id,
-                automations=location_automations,
+            total_startup_rules += startup_rules
+            startup_locations.append((location.id, location_automations))
+
+        semaphore = asyncio.Semaphore(self._startup_reapply_concurrency)
+
+        async def _reapply(
+            location_id: str, location_automations: list[_TopomationAutomation]
+        ) -> list[dict[str, Any]]:
+            async with semaphore:
+                return await self._async_reapply_location(
+                    location_id,
+                    automations=location_automations,
+                )
+
+        pending_by_location = await asyncio.gather(
+            *(
+                _reapply(location_id, location_automations)
+                for location_id, location_automations in startup_locations
             )
-        self._schedule_startup_reconcile_retry(
-            total_pending if total_startup_rules > 0 else 1
         )
+        self._startup_pending = {
+            location_id: pending
+            for (location_id, _), pending in zip(
+                startup_locations, pending_by_location, strict=True
+            )
+            if pending
+        }
+        total_pending = sum(len(pending) for pending in pending_by_location)
+        duration_ms = int((monotonic() - start) * 1000)
+        self._last_startup_reapply = {
+            "locations": len(startup_locations),
+            "startup_rules": total_startup_rules,
+            "pending_automations": total_pending,
+            "concurrency": self._startup_reapply_concurrency,
+            "duration_ms": duration_ms,
+        }
+        if startup_locations:
+            _LOGGER.info(
+                "Startup reapply pass: locations=%d rules=%d pending=%d concurrency=%d "
+                "duration_ms=%d",
+                len(startup_locations),
+                total_startup_rules,
+                total_pending,
+                self._startup_reapply_concurrency,
+                duration_ms,
+            )
+        if total_startup_rules == 0:
+            # Automation entities may not be loaded yet; look again later.
+            self._schedule_startup_reconcile_retry()
+        else:
+            self._update_startup_watch()
+
+    def startup_reapply_diagnostics(self) -> dict[str, Any] | None:
+        """Return the latest startup reapply pass summary and what is still awaited."""
+        if not self._last_startup_reapply:
+            return None
+        return {
+            **self._last_startup_reapply,
+            "waiting_locations": len(self._startup_pending),
+            "watched_entities": len(self._startup_tracked),
+        }
 
     async def _async_reapply_location(
         self,
         location_id: str,
         *,
         automations: list[_TopomationAutomation] | None = None,
-    ) -> int:
-        """Reapply startup automations for one location against current HA state."""
+    ) -> list[dict[str, Any]]:
+        """Reapply startup automations for one location; return what is still pending."""
         start = monotonic()
         reconcile_elapsed_seconds = int(
             start - (self._startup_reconcile_started_at or start)
@@ -222,8 +353,12 @@ class TopomationActionsRuntime:
         triggered = 0
 
         for automation_entity_id in matched_automations:
-            if automation_entity_id in self._startup_triggered_automation_ids:
+            if (
+                automation_entity_id in self._startup_triggered_automation_ids
+                or automation_entity_id in self._startup_inflight_automation_ids
+            ):
                 continue
+            self._startup_inflight_automation_ids.add(automation_entity_id)
             try:
                 await self.hass.services.async_call(
                     "automation",
@@ -249,6 +384,8 @@ class TopomationActionsRuntime:
                     automation_entity_id,
                     err,
                 )
+            finally:
+                self._startup_inflight_automation_ids.discard(automation_entity_id)
 
         duration_ms = int((monotonic() - start) * 1000)
         summary: dict[str, Any] = {
@@ -285,18 +422,144 @@ class TopomationActionsRuntime:
             len(failures),
             duration_ms,
         )
-        return len(pending_automations)
+        return pending_automations
 
-    def _schedule_startup_reconcile_retry(self, total_pending: int) -> None:
-        """Schedule another startup pass while opted-in rules are waiting for HA state."""
-        if total_pending <= 0:
-            return
+    def _startup_reconcile_expired(self) -> bool:
+        """Return True once the startup reconcile window has ended (or never began)."""
         if self._startup_reconcile_started_at is None:
-            return
-        if (
+            return True
+        return (
             monotonic() - self._startup_reconcile_started_at
             >= self._startup_reconcile_timeout_seconds
-        ):
+        )
+
+    @callback
+    def _update_startup_watch(self) -> None:
+        """Track exactly the entities pending startup rules wait on."""
+        if not self._startup_pending or self._startup_reconcile_expired():
+            # Rules still pending after their timed-out evaluation stay skipped.
+            self._startup_pending = {}
+            self._stop_startup_reconcile()
+            return
+
+        watched: dict[str, set[str]] = {}
+        watch_kinds: dict[str, set[str]] = {}
+        unresolved_locations: set[str] = set()
+
+        def _watch(entity_id: str, location_id: str, kind: str) -> None:
+            watched.setdefault(entity_id, set()).add(location_id)
+            watch_kinds.setdefault(entity_id, set()).add(kind)
+
+        for location_id, pending in self._startup_pending.items():
+            for item in pending:
+                if item["reason"] == "waiting_for_occupancy_state":
+                    occupancy_entity_id = self._find_occupancy_entity(location_id)
+                    if occupancy_entity_id is None:
+                        unresolved_locations.add(location_id)
+                        continue
+                    _watch(occupancy_entity_id, location_id, "occupancy")
+                    continue
+                for entity_id in item.get("lux_entity_ids", ()):
+                    _watch(entity_id, location_id, "lux")
+                for entity_id in item.get("fallback_entity_ids", ()):
+                    _watch(entity_id, location_id, "fallback")
+
+        self._startup_watched = watched
+        for entity_id in self._startup_tracked.keys() - watched.keys():
+            self._startup_tracked.pop(entity_id)()
+        ready_locations: set[str] = set()
+        for entity_id in watched.keys() - self._startup_tracked.keys():
+            self._startup_tracked[entity_id] = async_track_state_change_event(
+                self.hass,
+                entity_id,
+                self._handle_startup_watch_event,
+            )
+            # The entity may have become usable while the previous pass was still
+            # awaiting automation triggers, before this listener existed.
+            if self._startup_watch_entity_ready(entity_id, watch_kinds[entity_id]):
+                ready_locations.update(watched[entity_id])
+        if ready_locations:
+            self._queue_startup_reevaluation(ready_locations)
+
+        if self._startup_timeout_unsub is None:
+            remaining = self._startup_reconcile_timeout_seconds - (
+                monotonic() - cast(float, self._startup_reconcile_started_at)
+            )
+            self._startup_timeout_unsub = async_call_later(
+                self.hass,
+                max(remaining, 0),
+                self._handle_startup_reconcile_timeout,
+            )
+        if unresolved_locations:
+            self._schedule_startup_reconcile_retry(unresolved_locations)
+
+    def _startup_watch_entity_ready(self, entity_id: str, kinds: set[str]) -> bool:
+        """Return True when a watched entity already has state a pending rule can use."""
+        if "lux" in kinds and self._has_numeric_state(entity_id):
+            return True
+        if "fallback" in kinds and self._has_known_state(entity_id):
+            return True
+        if "occupancy" in kinds:
+            state = self.hass.states.get(entity_id)
+            return state is not None and state.state in {"on", "off"}
+        return False
+
+    @callback
+    def _handle_startup_watch_event(self, event: HAEvent) -> None:
+        """Re-evaluate locations whose pending rules wait on an entity that became known."""
+        location_ids = self._startup_watched.get(event.data["entity_id"])
+        new_state = event.data.get("new_state")
+        if not location_ids or new_state is None:
+            return
+        if new_state.state in {"unknown", "unavailable"}:
+            return
+        self._queue_startup_reevaluation(location_ids)
+
+    @callback
+    def _handle_startup_reconcile_timeout(self, _: object) -> None:
+        """Give every still-pending rule its final, timed-out evaluation."""
+        self._startup_timeout_unsub = None
+        self._queue_startup_reevaluation(self._startup_pending)
+
+    @callback
+    def _queue_startup_reevaluation(self, location_ids: Iterable[str]) -> None:
+        """Coalesce re-evaluation requests into one task per burst of state changes."""
+        run_scheduled = bool(self._startup_dirty_locations)
+        self._startup_dirty_locations.update(location_ids)
+        if not run_scheduled and self._startup_dirty_locations:
+            self.hass.async_create_task(self._async_reevaluate_startup_locations())
+
+    async def _async_reevaluate_startup_locations(self) -> None:
+        """Re-run startup reapply for only the pending rules of the queued locations."""
+        location_ids = sorted(self._startup_dirty_locations)
+        self._startup_dirty_locations = set()
+        automations_by_location = self._enabled_automations_by_location()
+        for location_id in location_ids:
+            pending = self._startup_pending.get(location_id)
+            if not pending:
+                continue
+            pending_ids = {item["automation_entity_id"] for item in pending}
+            still_pending = await self._async_reapply_location(
+                location_id,
+                automations=[
+                    automation
+                    for automation in automations_by_location.get(location_id, [])
+                    if automation.entity_id in pending_ids
+                ],
+            )
+            if still_pending:
+                self._startup_pending[location_id] = still_pending
+            else:
+                self._startup_pending.pop(location_id, None)
+        self._update_startup_watch()
+
+    def _schedule_startup_reconcile_retry(self, location_ids: set[str] | None = None) -> None:
+        """Poll again for waits no state listener can observe.
+
+        With ``location_ids`` only those locations' pending rules are re-evaluated;
+        without, the full startup pass runs again.
+        """
+        if self._startup_reconcile_expired():
             return
         if callable(self._startup_reconcile_retry_unsub):
             return
@@ -304,7 +567,10 @@ class TopomationActionsRuntime:
         @callback
         def _retry(_: object) -> None:
             self._startup_reconcile_retry_unsub = None
-            self.hass.async_create_task(self.async_reapply_startup_actions())
+            if location_ids is None:
+                self.hass.async_create_task(self.async_reapply_startup_actions())
+            else:
+                self._queue_startup_reevaluation(location_ids)
 
         self._startup_reconcile_retry_unsub = async_call_later(
             self.hass,
@@ -312,6 +578,20 @@ class TopomationActionsRuntime:
             _retry,
         )
 
+    @callback
+    def _stop_startup_reconcile(self) -> None:
+        """Drop startup state listeners and timers."""
+        for unsub in self._startup_tracked.values():
+            unsub()
+        self._startup_tracked = {}
+        self._startup_watched = {}
+        if callable(self._startup_timeout_unsub):
+            self._startup_timeout_unsub()
+            self._startup_timeout_unsub = None
+        if callable(self._startup_reconcile_retry_unsub):
+            self._startup_reconcile_retry_unsub()
+            self._startup_reconcile_retry_unsub = None
+
     @callback
     def _handle_occupancy_changed(self, event: KernelEvent) -> None:
         """Log summary for each occupancy transition and matching action automations."""
@@ -344,15 +624,7 @@ class TopomationActionsRuntime:
 
     def _find_occupancy_entity(self, location_id: str) -> str | None:
         """Resolve the occupancy binary sensor entity for a location."""
-        for state in self.hass.states.async_all("binary_sensor"):
-            entity_id = state.entity_id
-            attrs = state.attributes
-            if attrs.get("device_class") != "occupancy":
-                continue
-            if attrs.get("location_id") != location_id:
-                continue
-            return entity_id
-        return None
+        return async_get_occupancy_entity_id(self.hass, location_id)
 
     def _automations_for(
         self,
@@ -360,14 +632,12 @@ class TopomationActionsRuntime:
         trigger_type: OccupancyActionTriggerType,
     ) -> list[str]:
         """Collect enabled Topomation automation entity IDs for a location/trigger."""
-        matched: list[str] = []
-        for automation in self._iter_topomation_automations():
-            if automation.location_id != location_id:
-                continue
-            if automation.trigger_type != trigger_type:
-                continue
-            matched.append(automation.entity_id)
-        return matched
+        self._automation_catalog()
+        return [
+            entity_id
+            for entity_id in self._catalog_by_trigger.get((location_id, trigger_type), ())
+            if self._is_automation_enabled(entity_id)
+        ]
 
     def _startup_automations_for(
         self,
@@ -380,7 +650,9 @@ class TopomationActionsRuntime:
         """Collect startup-eligible automations for a location/current occupancy state."""
         matched: list[str] = []
         source_automations = (
-            automations if automations is not None else self._iter_topomation_automations()
+            automations
+            if automations is not None
+            else self._enabled_automations_by_location().get(location_id, [])
         )
         for automation in source_automations:
             if automation.location_id != location_id:
@@ -426,7 +698,9 @@ class TopomationActionsRuntime:
         """Collect startup automations still waiting for prerequisite state."""
         pending: list[dict[str, Any]] = []
         source_automations = (
-            automations if automations is not None else self._iter_topomation_automations()
+            automations
+            if automations is not None
+            else self._enabled_automations_by_location().get(location_id, [])
         )
         for automation in source_automations:
             if automation.location_id != location_id:
@@ -580,12 +854,61 @@ class TopomationActionsRuntime:
         return state.state not in {"unknown", "unavailable"}
 
     def _iter_topomation_automations(self) -> list[_TopomationAutomation]:
-        """Parse Topomation-managed automation entities from HA automation component."""
+        """Return enabled Topomation-managed automations from the catalog."""
+        return [
+            automation
+            for automations in self._automation_catalog().values()
+            for automation in automations
+            if self._is_automation_enabled(automation.entity_id)
+        ]
+
+    def _enabled_automations_by_location(self) -> dict[str, list[_TopomationAutomation]]:
+        """Group enabled catalog automations by location."""
+        grouped: dict[str, list[_TopomationAutomation]] = {}
+        for location_id, automations in self._automation_catalog().items():
+            enabled = [
+                automation
+                for automation in automations
+                if self._is_automation_enabled(automation.entity_id)
+            ]
+            if enabled:
+                grouped[location_id] = enabled
+        return grouped
+
+    def _automation_catalog(self) -> dict[str, tuple[_TopomationAutomation, ...]]:
+        """Return the parsed catalog by location, rebuilding it when stale."""
         component = self.hass.data.get(AUTOMATION_DATA_COMPONENT)
         if component is None:
-            return []
-
+            return {}
         raw_entities = getattr(component, "entities", [])
+        signature = (id(component), len(raw_entities) if isinstance(raw_entities, Sized) else None)
+        if (
+            self._catalog_by_location is not None
+            and signature[1] is not None
+            and signature == self._catalog_signature
+        ):
+            return self._catalog_by_location
+
+        by_location: dict[str, list[_TopomationAutomation]] = {}
+        by_trigger: dict[tuple[str, str], list[str]] = {}
+        for automation in self._parse_topomation_automations(raw_entities):
+            by_location.setdefault(automation.location_id, []).append(automation)
+            by_trigger.setdefault((automation.location_id, automation.trigger_type), []).append(
+                automation.entity_id
+            )
+        self._catalog_by_location = {
+            location_id: tuple(automations) for location_id, automations in by_location.items()
+        }
+        self._catalog_by_trigger = {key: tuple(ids) for key, ids in by_trigger.items()}
+        self._catalog_signature = signature
+        self._catalog_builds += 1
+        return self._catalog_by_location
+
+    def _parse_topomation_automations(
+        self,
+        raw_entities: Mapping[str, Any] | Iterable[Any],
+    ) -> list[_TopomationAutomation]:
+        """Parse Topomation-managed automation entities from HA automation component."""
         automation_entities = (
             list(raw_entities.values())
             if isinstance(raw_entities, Mapping)
@@ -599,8 +922,6 @@ class TopomationActionsRuntime:
                 continue
             if not isinstance(raw_config, Mapping):
                 continue
-            if not self._is_automation_enabled(entity_id):
-                continue
 
             metadata = self._parse_topomation_metadata(raw_config.get("description"))
             if metadata is None:
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import logging
+import time
 from collections.abc import Callable, Mapping
 from datetime import UTC, datetime
 from typing import TYPE_CHECKING, Any
@@ -16,8 +17,19 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-
-from .const import DOMAIN
+from homeassistant.helpers.event import async_call_later
+
+from .const import (
+    CONF_EXPLAINABILITY_REFRESH,
+    CONF_EXPLAINABILITY_THROTTLE_SECONDS,
+    DEFAULT_EXPLAINABILITY_REFRESH,
+    DEFAULT_EXPLAINABILITY_THROTTLE_SECONDS,
+    DOMAIN,
+    EXPLAINABILITY_REFRESH_MODES,
+    EXPLAINABILITY_REFRESH_OFF,
+    EXPLAINABILITY_REFRESH_ON_CHANGE,
+)
+from .entity_dispatcher import LocationEventDispatcher
 from .recent_activity import EVENT_RECENT_ACTIVITY_CHANGED
 from .recent_activity import MODULE_ID as RECENT_ACTIVITY_MODULE_ID
 from .sync_manager import _is_shadow_host
@@ -27,6 +39,48 @@ if TYPE_CHECKING:
 
 _LOGGER = logging.getLogger(__name__)
 
+# location_id -> entity_id for occupancy sensors currently added to HA, shared by
+# every config entry (ids are unique per integration, like the unique_ids).
+_OCCUPANCY_ENTITY_INDEX = f"{DOMAIN}_occupancy_entity_ids"
+
+
+def _occupancy_entity_index(hass: HomeAssistant) -> dict[str, str]:
+    """Return the shared location -> occupancy entity index."""
+    return hass.data.setdefault(_OCCUPANCY_ENTITY_INDEX, {})
+
+
+@callback
+def async_get_occupancy_entity_id(hass: HomeAssistant, location_id: str) -> str | None:
+    """Resolve the occupancy binary sensor entity_id for a topology location.
+
+    Live sensors register themselves on add; registry entries cover sensors that
+    are registered but not added yet (startup, disabled entities).
+    """
+    entity_id = hass.data.get(_OCCUPANCY_ENTITY_INDEX, {}).get(location_id)
+    if entity_id:
+        return entity_id
+    registry = er.async_get(hass)
+    return registry.async_get_entity_id("binary_sensor", DOMAIN, f"occupancy_{location_id}")
+
+
+def _explainability_options(entry: ConfigEntry) -> tuple[str, float]:
+    """Resolve the signal-driven explainability refresh mode and interval."""
+    options = getattr(entry, "options", None)
+    if not isinstance(options, Mapping):
+        options = {}
+    mode = options.get(CONF_EXPLAINABILITY_REFRESH, DEFAULT_EXPLAINABILITY_REFRESH)
+    if mode not in EXPLAINABILITY_REFRESH_MODES:
+        mode = DEFAULT_EXPLAINABILITY_REFRESH
+    try:
+        interval = float(
+            options.get(
+                CONF_EXPLAINABILITY_THROTTLE_SECONDS, DEFAULT_EXPLAINABILITY_THROTTLE_SECONDS
+            )
+        )
+    except (TypeError, ValueError):
+        interval = DEFAULT_EXPLAINABILITY_THROTTLE_SECONDS
+    return mode, interval
+
 
 def _location_ha_area_id(location: object) -> str | None:
     """Resolve canonical HA area linkage for a location-like object."""
@@ -115,6 +169,8 @@ async def async_setup_entry(
     modules = kernel["modules"]
     occupancy_module = modules.get("occupancy")
     recent_activity_module = modules.get(RECENT_ACTIVITY_MODULE_ID)
+    dispatcher = kernel.get("entity_dispatcher")
+    explainability_refresh, explainability_throttle_seconds = _explainability_options(entry)
 
     # Create occupancy sensor for each non-host location (areas, subareas, explicit roots, …)
     entities: list[BinarySensorEntity] = []
@@ -129,6 +185,7 @@ async def async_setup_entry(
                     bus,
                     recent_activity_module=recent_activity_module,
                     ha_area_id=_location_ha_area_id(location),
+                    dispatcher=dispatcher,
                 )
                 recent_activity_sensors_by_location_id[location.id] = recent_activity_sensor
                 entities.append(recent_activity_sensor)
@@ -144,6 +201,9 @@ async def async_setup_entry(
                 .get("occupancy_recent_changes", {})
                 .get(current_location_id, [])
             ),
+            dispatcher=dispatcher,
+            explainability_refresh=explainability_refresh,
+            explainability_throttle_seconds=explainability_throttle_seconds,
         )
         sensors_by_location_id[location.id] = occupancy_sensor
         entities.append(occupancy_sensor)
@@ -174,6 +234,7 @@ async def async_setup_entry(
                     bus,
                     recent_activity_module=recent_activity_module,
                     ha_area_id=_location_ha_area_id(location),
+                    dispatcher=dispatcher,
                 )
                 recent_activity_sensors_by_location_id[location_id] = recent_activity_sensor
                 async_add_entities([recent_activity_sensor])
@@ -190,6 +251,9 @@ async def async_setup_entry(
                 .get("occupancy_recent_changes", {})
                 .get(current_location_id, [])
             ),
+            dispatcher=dispatcher,
+            explainability_refresh=explainability_refresh,
+            explainability_throttle_seconds=explainability_throttle_seconds,
         )
         sensors_by_location_id[location_id] = occupancy_sensor
         async_add_entities([occupancy_sensor])
@@ -230,10 +294,26 @@ async def async_setup_entry(
 
 
 class OccupancyBinarySensor(BinarySensorEntity):
-    """Binary sensor representing location occupancy state."""
+    """Binary sensor representing location occupancy state.
+
+    ``occupancy.changed`` always writes state. Source-level ``occupancy.signal``
+    events only refresh explainability attributes, per ``explainability_refresh``:
+    ``on_change`` writes when they differ, ``throttled`` writes at most once per
+    interval with a trailing flush, and ``off`` skips them.
+    """
 
     _attr_device_class = BinarySensorDeviceClass.OCCUPANCY
     _attr_should_poll = False
+    # Explainability payloads churn on every signal; keep them out of the recorder.
+    _unrecorded_attributes = frozenset(
+        {
+            "contributions",
+            "direct_locks",
+            "explanation",
+            "recent_changes",
+            "seconds_until_vacant",
+        }
+    )
 
     def __init__(
         self,
@@ -243,14 +323,22 @@ class OccupancyBinarySensor(BinarySensorEntity):
         occupancy_module: OccupancyModule | None = None,
         ha_area_id: str | None = None,
         recent_changes_provider: Callable[[str], list[dict[str, Any]]] | None = None,
+        dispatcher: LocationEventDispatcher | None = None,
+        explainability_refresh: str = DEFAULT_EXPLAINABILITY_REFRESH,
+        explainability_throttle_seconds: float = DEFAULT_EXPLAINABILITY_THROTTLE_SECONDS,
     ) -> None:
         """Initialize the sensor."""
         self._location_id = location_id
         self._location_name = location_name
         self._bus = bus
+        self._dispatcher = dispatcher or LocationEventDispatcher(bus)
         self._occupancy_module = occupancy_module
         self._ha_area_id = ha_area_id
         self._recent_changes_provider = recent_changes_provider or (lambda _: [])
+        self._explainability_refresh = explainability_refresh
+        self._explainability_throttle_seconds = explainability_throttle_seconds
+        self._last_explainability_write: float | None = None
+        self._explainability_flush_cancel: Callable[[], None] | None = None
 
         self._attr_unique_id = f"occupancy_{location_id}"
         self._attr_name = f"{location_name} Occupancy"
@@ -313,6 +401,18 @@ class OccupancyBinarySensor(BinarySensorEntity):
 
     def _hydrate_from_module_state(self) -> bool:
         """Initialize entity state from current occupancy module state."""
+        if not self._load_module_state():
+            return False
+        self.async_write_ha_state()
+        _LOGGER.debug(
+            "Hydrated occupancy for %s: %s",
+            self._location_id,
+            "occupied" if self._attr_is_on else "vacant",
+        )
+        return True
+
+    def _load_module_state(self) -> bool:
+        """Apply current occupancy module state to entity fields without writing."""
         if self._occupancy_module is None:
             return False
 
@@ -334,13 +434,68 @@ class OccupancyBinarySensor(BinarySensorEntity):
             return False
 
         self._apply_state_payload(payload)
+        return True
+
+    def _explainability_snapshot(self) -> tuple[Any, ...]:
+        """Return the state and attributes an explainability write would publish."""
+        # seconds_until_vacant follows from effective_timeout_at and the clock.
+        attrs = {
+            key: value
+            for key, value in self._attr_extra_state_attributes.items()
+            if key != "seconds_until_vacant"
+        }
+        return (self._attr_is_on, attrs)
+
+    @callback
+    def _refresh_explainability(self, *, only_if_changed: bool = False) -> None:
+        """Re-read explainability attributes and write them to HA."""
+        previous = self._explainability_snapshot() if only_if_changed else None
+        if not self._load_module_state():
+            attrs = dict(self._attr_extra_state_attributes)
+            attrs["recent_changes"] = self._recent_changes_provider(self._location_id)
+            self._attr_extra_state_attributes = attrs
+        if previous is not None and previous == self._explainability_snapshot():
+            return
+        self._last_explainability_write = time.monotonic()
         self.async_write_ha_state()
-        _LOGGER.debug(
-            "Hydrated occupancy for %s: %s",
-            self._location_id,
-            "occupied" if self._attr_is_on else "vacant",
+
+    @callback
+    def _cancel_explainability_flush(self) -> None:
+        """Cancel a pending throttled explainability write."""
+        if self._explainability_flush_cancel is not None:
+            self._explainability_flush_cancel()
+            self._explainability_flush_cancel = None
+
+    @callback
+    def _flush_explainability(self, _now: datetime) -> None:
+        """Write the explainability refresh deferred by the throttle window."""
+        self._explainability_flush_cancel = None
+        self._refresh_explainability()
+
+    @callback
+    def _on_explainability_signal(self) -> None:
+        """Apply the explainability refresh policy to one occupancy.signal."""
+        if self._explainability_refresh == EXPLAINABILITY_REFRESH_OFF:
+            return
+        if self._explainability_refresh == EXPLAINABILITY_REFRESH_ON_CHANGE:
+            self._refresh_explainability(only_if_changed=True)
+            return
+
+        if self._explainability_flush_cancel is not None:
+            return
+        wait = 0.0
+        if self._last_explainability_write is not None:
+            wait = (
+                self._last_explainability_write
+                + self._explainability_throttle_seconds
+                - time.monotonic()
+            )
+        if wait <= 0 or self.hass is None:
+            self._refresh_explainability()
+            return
+        self._explainability_flush_cancel = async_call_later(
+            self.hass, wait, self._flush_explainability
         )
-        return True
 
     def _ensure_registry_area_assignment(self) -> None:
         """Assign this entity to its HA area when location linkage exists."""
@@ -371,38 +526,47 @@ class OccupancyBinarySensor(BinarySensorEntity):
         @callback
         def on_occupancy_changed(event: Event) -> None:
             """Update state when occupancy changes."""
-            if event.location_id == self._location_id:
-                payload = event.payload
-                if not isinstance(payload, Mapping):
-                    return
-                self._apply_state_payload(payload)
-                self.async_write_ha_state()
-                _LOGGER.debug(
-                    "Updated occupancy for %s: %s",
-                    self._location_id,
-                    "occupied" if self._attr_is_on else "vacant",
-                )
+            payload = event.payload
+            if not isinstance(payload, Mapping):
+                return
+            # This write carries the latest explainability attributes too.
+            self._cancel_explainability_flush()
+            self._apply_state_payload(payload)
+            self._last_explainability_write = time.monotonic()
+            self.async_write_ha_state()
+            _LOGGER.debug(
+                "Updated occupancy for %s: %s",
+                self._location_id,
+                "occupied" if self._attr_is_on else "vacant",
+            )
 
         @callback
         def on_occupancy_signal(event: Event) -> None:
             """Refresh explainability attributes on source-level occupancy activity."""
-            if event.location_id != self._location_id:
-                return
-            if not self._hydrate_from_module_state():
-                attrs = dict(self._attr_extra_state_attributes)
-                attrs["recent_changes"] = self._recent_changes_provider(self._location_id)
-                self._attr_extra_state_attributes = attrs
-                self.async_write_ha_state()
-
-        # Subscribe to occupancy changed events
-        self._bus.subscribe(
-            on_occupancy_changed,
-            EventFilter(event_type="occupancy.changed"),
+            self._on_explainability_signal()
+
+        self.async_on_remove(self._cancel_explainability_flush)
+        # Subscribe to this location's occupancy events
+        self.async_on_remove(
+            self._dispatcher.async_subscribe(
+                "occupancy.changed", self._location_id, on_occupancy_changed
+            )
         )
-        self._bus.subscribe(
-            on_occupancy_signal,
-            EventFilter(event_type="occupancy.signal"),
+        self.async_on_remove(
+            self._dispatcher.async_subscribe(
+                "occupancy.signal", self._location_id, on_occupancy_signal
+            )
         )
+        if self.hass is not None and self.entity_id:
+            _occupancy_entity_index(self.hass)[self._location_id] = self.entity_id
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Drop this sensor from the occupancy entity index."""
+        if self.hass is None:
+            return
+        index = _occupancy_entity_index(self.hass)
+        if index.get(self._location_id) == self.entity_id:
+            del index[self._location_id]
 
 
 class PropertyRecentActivityBinarySensor(BinarySensorEntity):
@@ -418,11 +582,13 @@ class PropertyRecentActivityBinarySensor(BinarySensorEntity):
         bus: EventBus,
         recent_activity_module: Any | None = None,
         ha_area_id: str | None = None,
+        dispatcher: LocationEventDispatcher | None = None,
     ) -> None:
         """Initialize the sensor."""
         self._location_id = location_id
         self._location_name = location_name
         self._bus = bus
+        self._dispatcher = dispatcher or LocationEventDispatcher(bus)
         self._recent_activity_module = recent_activity_module
         self._ha_area_id = ha_area_id
 
@@ -505,15 +671,14 @@ class PropertyRecentActivityBinarySensor(BinarySensorEntity):
 
         @callback
         def on_recent_activity_changed(event: Event) -> None:
-            if event.location_id != self._location_id:
-                return
             payload = event.payload
             if not isinstance(payload, Mapping):
                 return
             self._apply_state_payload(payload)
             self.async_write_ha_state()
 
-        self._bus.subscribe(
-            on_recent_activity_changed,
-            EventFilter(event_type=EVENT_RECENT_ACTIVITY_CHANGED),
+        self.async_on_remove(
+            self._dispatcher.async_subscribe(
+                EVENT_RECENT_ACTIVITY_CHANGED, self._location_id, on_recent_activity_changed
+            )
         )
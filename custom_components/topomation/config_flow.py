@@ -9,7 +9,17 @@ from homeassistant.config_entries import ConfigEntry, ConfigFlow, ConfigFlowResu
 from homeassistant.core import callback
 
 from .const import (
+    AUTOMATION_STARTUP_REAPPLY_CONCURRENCY,
+    CONF_EXPLAINABILITY_REFRESH,
+    CONF_EXPLAINABILITY_THROTTLE_SECONDS,
+    CONF_STARTUP_BUDGET_SECONDS,
+    CONF_STARTUP_REAPPLY_CONCURRENCY,
+    CONF_STATE_JOURNAL,
+    DEFAULT_EXPLAINABILITY_REFRESH,
+    DEFAULT_EXPLAINABILITY_THROTTLE_SECONDS,
+    DEFAULT_STARTUP_BUDGET_SECONDS,
     DOMAIN,
+    EXPLAINABILITY_REFRESH_MODES,
     NAME,
     PANEL_URL,
     VERSION,
@@ -53,11 +63,75 @@ class TopomationOptionsFlow(OptionsFlow):
     async def async_step_init(self, user_input: dict[str, Any] | None = None) -> ConfigFlowResult:
         """Show integration options and about info."""
         if user_input is not None:
-            return self.async_create_entry(title="", data={})
+            return self.async_create_entry(
+                title="",
+                data={
+                    CONF_STATE_JOURNAL: bool(user_input.get(CONF_STATE_JOURNAL, False)),
+                    CONF_STARTUP_BUDGET_SECONDS: float(
+                        user_input.get(
+                            CONF_STARTUP_BUDGET_SECONDS, DEFAULT_STARTUP_BUDGET_SECONDS
+                        )
+                    ),
+                    CONF_EXPLAINABILITY_REFRESH: str(
+                        user_input.get(CONF_EXPLAINABILITY_REFRESH, DEFAULT_EXPLAINABILITY_REFRESH)
+                    ),
+                    CONF_EXPLAINABILITY_THROTTLE_SECONDS: float(
+                        user_input.get(
+                            CONF_EXPLAINABILITY_THROTTLE_SECONDS,
+                            DEFAULT_EXPLAINABILITY_THROTTLE_SECONDS,
+                        )
+                    ),
+                    CONF_STARTUP_REAPPLY_CONCURRENCY: int(
+                        user_input.get(
+                            CONF_STARTUP_REAPPLY_CONCURRENCY,
+                            AUTOMATION_STARTUP_REAPPLY_CONCURRENCY,
+                        )
+                    ),
+                },
+            )
 
         return self.async_show_form(
             step_id="init",
-            data_schema=vol.Schema({}),
+            data_schema=vol.Schema(
+                {
+                    vol.Optional(
+                        CONF_STATE_JOURNAL,
+                        default=bool(self._config_entry.options.get(CONF_STATE_JOURNAL, False)),
+                    ): bool,
+                    vol.Optional(
+                        CONF_STARTUP_BUDGET_SECONDS,
+                        default=float(
+                            self._config_entry.options.get(
+                                CONF_STARTUP_BUDGET_SECONDS, DEFAULT_STARTUP_BUDGET_SECONDS
+                            )
+                        ),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0.5, max=120)),
+                    vol.Optional(
+                        CONF_EXPLAINABILITY_REFRESH,
+                        default=self._config_entry.options.get(
+                            CONF_EXPLAINABILITY_REFRESH, DEFAULT_EXPLAINABILITY_REFRESH
+                        ),
+                    ): vol.In(EXPLAINABILITY_REFRESH_MODES),
+                    vol.Optional(
+                        CONF_EXPLAINABILITY_THROTTLE_SECONDS,
+                        default=float(
+                            self._config_entry.options.get(
+                                CONF_EXPLAINABILITY_THROTTLE_SECONDS,
+                                DEFAULT_EXPLAINABILITY_THROTTLE_SECONDS,
+                            )
+                        ),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=1, max=600)),
+                    vol.Optional(
+                        CONF_STARTUP_REAPPLY_CONCURRENCY,
+                        default=int(
+                            self._config_entry.options.get(
+                                CONF_STARTUP_REAPPLY_CONCURRENCY,
+                                AUTOMATION_STARTUP_REAPPLY_CONCURRENCY,
+                            )
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=64)),
+                }
+            ),
             description_placeholders={
                 "version": VERSION,
                 "panel_url": PANEL_URL,
@@ -13,6 +13,25 @@ STORAGE_KEY_CONFIG = f"{DOMAIN}.config"
 STORAGE_KEY_STATE = f"{DOMAIN}.state"
 AUTOSAVE_DEBOUNCE_SECONDS = 5.0
 
+# Options
+CONF_STATE_JOURNAL = "state_journal"
+CONF_STARTUP_BUDGET_SECONDS = "startup_budget_seconds"
+DEFAULT_STARTUP_BUDGET_SECONDS = 5.0
+CONF_EXPLAINABILITY_REFRESH = "explainability_refresh"
+CONF_EXPLAINABILITY_THROTTLE_SECONDS = "explainability_throttle_seconds"
+# How occupancy.signal events refresh occupancy sensor explainability attributes.
+EXPLAINABILITY_REFRESH_ON_CHANGE = "on_change"
+EXPLAINABILITY_REFRESH_THROTTLED = "throttled"
+EXPLAINABILITY_REFRESH_OFF = "off"
+EXPLAINABILITY_REFRESH_MODES = (
+    EXPLAINABILITY_REFRESH_ON_CHANGE,
+    EXPLAINABILITY_REFRESH_THROTTLED,
+    EXPLAINABILITY_REFRESH_OFF,
+)
+DEFAULT_EXPLAINABILITY_REFRESH = EXPLAINABILITY_REFRESH_THROTTLED
+DEFAULT_EXPLAINABILITY_THROTTLE_SECONDS = 10.0
+CONF_STARTUP_REAPPLY_CONCURRENCY = "startup_reapply_concurrency"
+
 # Panel
 PANEL_URL = "/topomation"
 PANEL_TITLE = "TopoMation"
@@ -89,6 +108,7 @@ TOPOMATION_AUTOMATION_METADATA_PREFIX = "[topomation]"
 AUTOMATION_STARTUP_BUFFER_SECONDS = 20
 AUTOMATION_STARTUP_RECONCILE_INTERVAL_SECONDS = 5
 AUTOMATION_STARTUP_RECONCILE_TIMEOUT_SECONDS = 60
+AUTOMATION_STARTUP_REAPPLY_CONCURRENCY = 8
 EVENT_TOPOMATION_ACTIONS_SUMMARY = f"{DOMAIN}_actions_summary"
 EVENT_TOPOMATION_UPDATED = f"{DOMAIN}_updated"
 EVENT_TOPOMATION_OCCUPANCY_CHANGED = f"{DOMAIN}_occupancy_changed"
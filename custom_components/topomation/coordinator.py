@@ -2,56 +2,152 @@
 
 from __future__ import annotations
 
+import asyncio
+import heapq
+import itertools
 import logging
+from collections.abc import Callable
 from datetime import datetime
-from typing import TYPE_CHECKING, Any
+from typing import Any
 
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.event import async_track_point_in_time
 
-if TYPE_CHECKING:
-    pass
-
 _LOGGER = logging.getLogger(__name__)
 
+# Deadline key for modules polled through ``get_next_timeout()``.
+_POLLED_KEY = ""
+# Rebuild the heap once stale entries outnumber live deadlines by this factor.
+_HEAP_COMPACT_FACTOR = 4
+
 
 class TopomationCoordinator:
-    """Coordinator for scheduling module timeout checks."""
+    """Coordinator for scheduling module timeout checks.
+
+    Deadlines live in a min-heap of ``(deadline, seq, module_id, key)`` entries
+    with lazy invalidation: replacing or clearing a deadline only updates
+    ``_deadlines`` and stale heap entries are dropped when they reach the top.
+    Modules bound through ``push_deadlines_for`` report per-key deadlines as they
+    change; other modules are polled via ``get_next_timeout()``. The HA timer is
+    replaced only when the earliest deadline moves.
+
+    Event-driven reschedules go through ``request_reschedule()``, which marks the
+    schedule dirty and recomputes once on the next event-loop iteration, however
+    many kernel events one state change published.
+    """
 
     def __init__(self, hass: HomeAssistant, modules: dict[str, Any]) -> None:
         """Initialize the coordinator."""
         self.hass = hass
         self.modules = modules
         self._timeout_cancel: callable | None = None
+        self._armed_at: datetime | None = None
+        self._heap: list[tuple[datetime, int, str, str]] = []
+        self._deadlines: dict[tuple[str, str], datetime] = {}
+        self._seq = itertools.count()
+        self._push_modules: set[str] = set()
+        self._dirty = False
+        self._deferred_handle: asyncio.Handle | None = None
+        self._reschedule_requests = 0
+        self._reschedules_deferred = 0
+
+    def push_deadlines_for(self, module_id: str) -> Callable[[str, datetime | None], None]:
+        """Stop polling ``module_id`` and return its ``(key, deadline)`` setter."""
+        self._push_modules.add(module_id)
+        self._deadlines.pop((module_id, _POLLED_KEY), None)
+
+        @callback
+        def _set_deadline(key: str, deadline: datetime | None) -> None:
+            self.set_deadline(module_id, key, deadline)
+
+        return _set_deadline
 
-    def schedule_next_timeout(self) -> None:
-        """Schedule the next timeout check across all modules."""
-        # Cancel existing timer
+    @callback
+    def set_deadline(self, module_id: str, key: str, deadline: datetime | None) -> None:
+        """Record (or clear, with ``None``) one deadline and re-arm if the earliest moved."""
+        if self._store_deadline(module_id, key, deadline):
+            self._arm_earliest()
+
+    def _store_deadline(self, module_id: str, key: str, deadline: datetime | None) -> bool:
+        """Update the deadline table and heap; return True when anything changed."""
+        entry_key = (module_id, key)
+        if deadline is None:
+            return self._deadlines.pop(entry_key, None) is not None
+        if self._deadlines.get(entry_key) == deadline:
+            return False
+        self._deadlines[entry_key] = deadline
+        heapq.heappush(self._heap, (deadline, next(self._seq), module_id, key))
+        if len(self._heap) > _HEAP_COMPACT_FACTOR * len(self._deadlines) + 64:
+            self._heap = [
+                (when, next(self._seq), owner, owner_key)
+                for (owner, owner_key), when in self._deadlines.items()
+            ]
+            heapq.heapify(self._heap)
+        return True
+
+    def _is_live(self, entry: tuple[datetime, int, str, str]) -> bool:
+        deadline, _, module_id, key = entry
+        return self._deadlines.get((module_id, key)) == deadline
+
+    def _earliest(self) -> tuple[datetime, str] | None:
+        """Return ``(deadline, module_id)`` of the earliest live entry."""
+        while self._heap and not self._is_live(self._heap[0]):
+            heapq.heappop(self._heap)
+        if not self._heap:
+            return None
+        deadline, _, module_id, _ = self._heap[0]
+        return deadline, module_id
+
+    @callback
+    def request_reschedule(self) -> None:
+        """Mark the schedule dirty and recompute it once on the next loop iteration.
+
+        The armed timer stays in place until then, so no deadline is missed; a
+        direct ``schedule_next_timeout()`` in the meantime absorbs the request.
+        """
+        self._reschedule_requests += 1
+        self._dirty = True
+        if self._deferred_handle is None:
+            self._deferred_handle = self.hass.loop.call_soon(self._run_deferred_reschedule)
+
+    @callback
+    def _run_deferred_reschedule(self) -> None:
+        self._deferred_handle = None
+        if not self._dirty:
+            return
+        self._reschedules_deferred += 1
+        self.schedule_next_timeout()
+
+    @callback
+    def async_cancel(self) -> None:
+        """Cancel the armed timer and any pending deferred reschedule."""
+        if self._deferred_handle is not None:
+            self._deferred_handle.cancel()
+            self._deferred_handle = None
+        self._dirty = False
         if self._timeout_cancel:
             self._timeout_cancel()
             self._timeout_cancel = None
+        self._armed_at = None
 
-        # Find earliest timeout across all modules
-        next_timeout: datetime | None = None
-        next_module: str | None = None
+    def diagnostics(self) -> dict[str, int]:
+        """Return reschedule counters; ``coalesced`` counts recomputes saved."""
+        return {
+            "pending_deadlines": len(self._deadlines),
+            "reschedule_requests": self._reschedule_requests,
+            "deferred_reschedules": self._reschedules_deferred,
+            "coalesced_reschedules": self._reschedule_requests - self._reschedules_deferred,
+        }
 
+    def schedule_next_timeout(self) -> None:
+        """Refresh polled module deadlines and arm the timer for the earliest one."""
+        self._dirty = False
         for module_id, module in self.modules.items():
-            if not hasattr(module, "get_next_timeout"):
+            if module_id in self._push_modules or not hasattr(module, "get_next_timeout"):
                 continue
 
             try:
                 module_timeout = module.get_next_timeout()
-                if module_timeout:
-                    if not isinstance(module_timeout, datetime):
-                        _LOGGER.warning(
-                            "Ignoring non-datetime timeout from %s: %r",
-                            module_id,
-                            module_timeout,
-                        )
-                        continue
-                    if next_timeout is None or module_timeout < next_timeout:
-                        next_timeout = module_timeout
-                        next_module = module_id
             except Exception as e:
                 _LOGGER.error(
                     "Error getting timeout from %s: %s",
@@ -59,31 +155,70 @@ class TopomationCoordinator:
                     e,
                     exc_info=True,
                 )
+                continue
+
+            if module_timeout and not isinstance(module_timeout, datetime):
+                _LOGGER.warning(
+                    "Ignoring non-datetime timeout from %s: %r",
+                    module_id,
+                    module_timeout,
+                )
+                module_timeout = None
+            self._store_deadline(module_id, _POLLED_KEY, module_timeout or None)
+
+        self._arm_earliest()
+
+    def _arm_earliest(self) -> None:
+        """Point the HA timer at the earliest deadline, replacing it only if it moved."""
+        earliest = self._earliest()
+        next_timeout = earliest[0] if earliest else None
+        if self._timeout_cancel is not None and next_timeout == self._armed_at:
+            return
 
-        # Schedule callback
-        if next_timeout:
-            _LOGGER.debug(
-                "Scheduling timeout check at %s (from %s)",
-                next_timeout,
-                next_module,
-            )
-            self._timeout_cancel = async_track_point_in_time(
-                self.hass,
-                self._handle_timeout,
-                next_timeout,
-            )
-        else:
+        if self._timeout_cancel:
+            self._timeout_cancel()
+            self._timeout_cancel = None
+        self._armed_at = None
+
+        if earliest is None:
             _LOGGER.debug("No timeouts to schedule")
+            return
+
+        _LOGGER.debug(
+            "Scheduling timeout check at %s (from %s)",
+            next_timeout,
+            earliest[1],
+        )
+        self._armed_at = next_timeout
+        self._timeout_cancel = async_track_point_in_time(
+            self.hass,
+            self._handle_timeout,
+            next_timeout,
+        )
 
     @callback
     def _handle_timeout(self, now: datetime) -> None:
         """Handle scheduled timeout check."""
         _LOGGER.debug("Running timeout check at %s", now)
+        self._timeout_cancel = None
+        self._armed_at = None
 
-        # Call check_timeouts on all modules
+        due_modules: set[str] = set()
+        while self._heap and self._heap[0][0] <= now:
+            entry = heapq.heappop(self._heap)
+            if not self._is_live(entry):
+                continue
+            _, _, module_id, key = entry
+            del self._deadlines[(module_id, key)]
+            due_modules.add(module_id)
+
+        # Polled modules are always checked; push modules only when one of their
+        # deadlines is due.
         for module_id, module in self.modules.items():
             if not hasattr(module, "check_timeouts"):
                 continue
+            if module_id in self._push_modules and module_id not in due_modules:
+                continue
 
             try:
                 module.check_timeouts(now)
@@ -0,0 +1,59 @@
+"""Diagnostics support for Topomation config entries."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+) -> dict[str, Any]:
+    """Return runtime counters for one loaded Topomation entry."""
+    kernel = hass.data.get(DOMAIN, {}).get(entry.entry_id)
+    if not isinstance(kernel, dict):
+        return {"loaded": False}
+
+    diagnostics: dict[str, Any] = {"loaded": True}
+    loc_mgr = kernel.get("location_manager")
+    all_locations = getattr(loc_mgr, "all_locations", None)
+    if callable(all_locations):
+        diagnostics["location_count"] = len(list(all_locations()))
+
+    event_bridge_diagnostics = getattr(kernel.get("event_bridge"), "diagnostics", None)
+    if callable(event_bridge_diagnostics):
+        diagnostics["event_bridge"] = event_bridge_diagnostics()
+
+    catalog_diagnostics = getattr(kernel.get("actions_runtime"), "catalog_diagnostics", None)
+    if callable(catalog_diagnostics):
+        diagnostics["automation_catalog"] = catalog_diagnostics()
+
+    startup_reapply = getattr(kernel.get("actions_runtime"), "startup_reapply_diagnostics", None)
+    if callable(startup_reapply):
+        diagnostics["startup_reapply"] = startup_reapply()
+
+    rebuild_diagnostics = getattr(kernel.get("managed_action_rules"), "rebuild_diagnostics", None)
+    if callable(rebuild_diagnostics):
+        diagnostics["managed_rule_rebuild"] = rebuild_diagnostics()
+
+    dispatcher_diagnostics = getattr(kernel.get("entity_dispatcher"), "diagnostics", None)
+    if callable(dispatcher_diagnostics):
+        diagnostics["entity_dispatch"] = dispatcher_diagnostics()
+
+    coordinator_diagnostics = getattr(kernel.get("coordinator"), "diagnostics", None)
+    if callable(coordinator_diagnostics):
+        diagnostics["timeouts"] = coordinator_diagnostics()
+
+    persistence_diagnostics = getattr(kernel.get("persistence"), "diagnostics", None)
+    if callable(persistence_diagnostics):
+        diagnostics["persistence"] = persistence_diagnostics()
+
+    startup_timing = getattr(kernel.get("startup_timing"), "as_dict", None)
+    if callable(startup_timing):
+        diagnostics["startup"] = startup_timing()
+    return diagnostics
@@ -0,0 +1,108 @@
+"""Per-location routing of kernel events to Topomation entities."""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable
+
+from home_topology.core.bus import Event, EventBus, EventFilter
+from homeassistant.core import callback
+
+_LOGGER = logging.getLogger(__name__)
+
+EntityEventHandler = Callable[[Event], None]
+
+
+class LocationEventDispatcher:
+    """Subscribe once per event type and route events to handlers by location_id.
+
+    Entity platforms register one handler per (event type, location) instead of
+    putting a closure per entity on the kernel bus that drops every event for
+    other locations. The bus subscription for an event type is added with its
+    first handler and removed with its last, and a failing handler is logged
+    without affecting the others, as on the bus itself.
+    """
+
+    def __init__(self, bus: EventBus) -> None:
+        """Initialize the dispatcher."""
+        self._bus = bus
+        self._handlers: dict[str, dict[str, list[EntityEventHandler]]] = {}
+        self._bus_handlers: dict[str, EntityEventHandler] = {}
+
+    @callback
+    def async_subscribe(
+        self,
+        event_type: str,
+        location_id: str,
+        handler: EntityEventHandler,
+    ) -> Callable[[], None]:
+        """Route ``event_type`` events for ``location_id`` to ``handler``.
+
+        Returns a callable that removes the registration.
+        """
+        by_location = self._handlers.setdefault(event_type, {})
+        by_location.setdefault(location_id, []).append(handler)
+        if event_type not in self._bus_handlers:
+            bus_handler = self._make_bus_handler(event_type)
+            self._bus_handlers[event_type] = bus_handler
+            self._bus.subscribe(bus_handler, EventFilter(event_type=event_type))
+
+        @callback
+        def _unsubscribe() -> None:
+            self._remove(event_type, location_id, handler)
+
+        return _unsubscribe
+
+    @callback
+    def async_teardown(self) -> None:
+        """Drop every registration and the bus subscriptions."""
+        for bus_handler in self._bus_handlers.values():
+            self._bus.unsubscribe(bus_handler)
+        self._bus_handlers.clear()
+        self._handlers.clear()
+
+    def diagnostics(self) -> dict[str, dict[str, int]]:
+        """Return registered locations and handlers per event type."""
+        return {
+            event_type: {
+                "locations": len(by_location),
+                "handlers": sum(len(handlers) for handlers in by_location.values()),
+            }
+            for event_type, by_location in self._handlers.items()
+        }
+
+    def _make_bus_handler(self, event_type: str) -> EntityEventHandler:
+        by_location = self._handlers[event_type]
+
+        @callback
+        def _dispatch(event: Event) -> None:
+            handlers = by_location.get(event.location_id)
+            if not handlers:
+                return
+            for handler in tuple(handlers):
+                try:
+                    handler(event)
+                except Exception:
+                    _LOGGER.exception(
+                        "Error dispatching %s for %s", event_type, event.location_id
+                    )
+
+        return _dispatch
+
+    def _remove(self, event_type: str, location_id: str, handler: EntityEventHandler) -> None:
+        by_location = self._handlers.get(event_type)
+        if by_location is None:
+            return
+        handlers = by_location.get(location_id)
+        if not handlers or handler not in handlers:
+            return
+        handlers.remove(handler)
+        if handlers:
+            return
+        del by_location[location_id]
+        if by_location:
+            return
+        del self._handlers[event_type]
+        bus_handler = self._bus_handlers.pop(event_type, None)
+        if bus_handler is not None:
+            self._bus.unsubscribe(bus_handler)
@@ -2,13 +2,17 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import time
+from collections import Counter
+from dataclasses import dataclass, field
 from datetime import UTC, datetime
+from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
-from home_topology import Event, EventBus, LocationManager
+from home_topology import Event, EventBus, EventFilter, LocationManager
 from homeassistant.const import (
-    EVENT_STATE_CHANGED,
     STATE_OFF,
     STATE_ON,
     STATE_PAUSED,
@@ -16,13 +20,181 @@ from homeassistant.const import (
     STATE_UNAVAILABLE,
     STATE_UNKNOWN,
 )
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback, valid_entity_id
+from homeassistant.helpers.event import async_track_state_change_event
+
+from .state_capture import StateStreamRecorder, prepare_capture_path
 
 if TYPE_CHECKING:
     from homeassistant.core import Event as HAEvent
 
 _LOGGER = logging.getLogger(__name__)
 
+_MEDIA_SIGNAL_KEYS = frozenset({"playback", "volume", "mute"})
+# Keys whose triggers arrive in bursts (dimmer slides, color pickers, volume knobs).
+# Sources on these keys coalesce repeated triggers by default; ``coalesce_window_sec``
+# on the source config overrides the window (0 disables).
+_COALESCED_SIGNAL_KEYS = frozenset({"level", "color", "volume"})
+_DEFAULT_COALESCE_WINDOW_SEC = 2.0
+# Kernel topology events that change which locations exist or which are roots;
+# both feed dispatch (location configs, policy target validation, all_roots).
+_DISPATCH_TOPOLOGY_EVENT_TYPES = (
+    "location.created",
+    "location.deleted",
+    "location.parent_changed",
+)
+_HANDOFF_ADJACENCY_EVENT_TYPES = (
+    "adjacency.created",
+    "adjacency.updated",
+    "adjacency.deleted",
+)
+
+
+@dataclass(slots=True, frozen=True)
+class _SourceRoute:
+    """One configured occupancy source, pre-resolved for state-change dispatch."""
+
+    location_id: str
+    source_id: str
+    signal_key: Any
+    is_media: bool
+    triggers: bool
+    trigger_timeout_set: bool
+    trigger_timeout: Any
+    clears: bool
+    clear_timeout: int
+    coalesce_window_sec: float
+
+    @classmethod
+    def from_config(cls, location_id: str, entity_id: str, source: dict[str, Any]) -> _SourceRoute:
+        """Compile one ``occupancy_sources`` record for an entity."""
+        configured_signal_key = source.get("signal_key")
+        try:
+            off_trailing = int(source.get("off_trailing", 0))
+        except (TypeError, ValueError):
+            off_trailing = 0
+
+        default_window = (
+            _DEFAULT_COALESCE_WINDOW_SEC if configured_signal_key in _COALESCED_SIGNAL_KEYS else 0.0
+        )
+        try:
+            coalesce_window_sec = float(source.get("coalesce_window_sec", default_window) or 0)
+        except (TypeError, ValueError):
+            coalesce_window_sec = default_window
+
+        source_id = source.get("source_id")
+        if not source_id:
+            source_id = entity_id if not configured_signal_key else f"{entity_id}::{configured_signal_key}"
+
+        return cls(
+            location_id=location_id,
+            source_id=source_id,
+            signal_key=configured_signal_key,
+            is_media=entity_id.startswith("media_player."),
+            triggers=source.get("on_event", "trigger") == "trigger",
+            trigger_timeout_set="on_timeout" in source,
+            trigger_timeout=source.get("on_timeout"),
+            # A source without an on-timeout holds occupancy until it turns off.
+            clears=source.get("off_event", "none") == "clear" or source.get("on_timeout") is None,
+            clear_timeout=max(0, off_trailing),
+            coalesce_window_sec=max(0.0, coalesce_window_sec),
+        )
+
+    def resolve(self, signal_type: str, signal_key: str | None) -> dict[str, Any] | None:
+        """Return the source event for an incoming signal, or None when it does not apply."""
+        if self.is_media:
+            if self.signal_key not in _MEDIA_SIGNAL_KEYS or self.signal_key != signal_key:
+                return None
+        elif self.signal_key and self.signal_key != signal_key:
+            return None
+
+        if signal_type == "trigger":
+            if not self.triggers:
+                return None
+            return {
+                "event_type": "trigger",
+                "source_id": self.source_id,
+                "timeout_set": self.trigger_timeout_set,
+                "timeout": self.trigger_timeout if self.trigger_timeout_set else None,
+            }
+        if signal_type == "clear":
+            if not self.clears:
+                return None
+            return {
+                "event_type": "clear",
+                "source_id": self.source_id,
+                "timeout_set": True,
+                "timeout": self.clear_timeout,
+            }
+        return None
+
+
+@dataclass(slots=True, frozen=True)
+class _WiabRoute:
+    """One WIAB preset on one location that references an entity."""
+
+    location_id: str
+    preset: str
+    source_id: str
+    interior: bool
+    door: bool
+    release_timeout_sec: int
+    hold_timeout_sec: int
+
+
+@dataclass(slots=True, frozen=True)
+class _PolicyRoute:
+    """One policy source with its state map and resolved vacate targets."""
+
+    source_id: str
+    targets: tuple[str, ...]
+    # state -> include_locked for vacate mappings; None marks a mapped state with
+    # no supported action, which must not fall through to the normalized state.
+    state_actions: dict[Any, bool | None]
+
+    def include_locked_for(self, new_state: str) -> bool | None:
+        """Return include_locked when this state maps to a vacate, else None."""
+        if new_state in self.state_actions:
+            return self.state_actions[new_state]
+        return self.state_actions.get(str(new_state).strip().lower())
+
+
+@dataclass(slots=True, frozen=True)
+class _HandoffRoute:
+    """One adjacency edge a crossing source can hand occupancy across."""
+
+    # Position in ``all_adjacency_edges()`` so multi-key matches publish in edge order.
+    order: int
+    edge_id: str
+    destination_id: str
+    handoff_window_sec: int
+    boundary_type: str
+
+
+@dataclass(slots=True)
+class _EntityDispatch:
+    """Everything a state change of one entity can drive."""
+
+    sources: list[_SourceRoute] = field(default_factory=list)
+    policy: list[_PolicyRoute] = field(default_factory=list)
+    wiab: list[_WiabRoute] = field(default_factory=list)
+
+
+def _event_fired_at(event: HAEvent) -> float:
+    """Return when a state_changed event fired, as a POSIX timestamp.
+
+    Coalescing runs on this clock rather than processing time so a replayed
+    capture, whose events carry their recorded ``time_fired``, suppresses the
+    same triggers at any replay speed.
+    """
+    fired_at = getattr(event, "time_fired_timestamp", None)
+    if isinstance(fired_at, int | float):
+        return float(fired_at)
+    time_fired = getattr(event, "time_fired", None)
+    if isinstance(time_fired, datetime):
+        return time_fired.timestamp()
+    return time.time()
+
 
 class EventBridge:
     """Bridge HA state changes to normalized occupancy.signal events."""
@@ -39,34 +211,333 @@ class EventBridge:
         self.bus = bus
         self.loc_mgr = loc_mgr
         self.occupancy = occupancy_module
-        self._unsub: callable | None = None
+        # entity_id -> state_changed subscription, limited to entities that can drive occupancy.
+        self._tracked: dict[str, CALLBACK_TYPE] = {}
+        self._subscribed = False
+        self._refresh_handle: asyncio.Handle | None = None
+        self._recorder: StateStreamRecorder | None = None
+        # (location_id, source_id) -> time_fired of the last trigger let through.
+        self._last_trigger_at: dict[tuple[str, str], float] = {}
+        self._coalesced: Counter[str] = Counter()
+        # entity_id -> precompiled work, built lazily from occupancy module config.
+        self._dispatch: dict[str, _EntityDispatch] | None = None
+        self._dispatch_configs: dict[str, Any] = {}
+        # crossing source -> source location_id -> handoff routes, built lazily.
+        self._handoffs: dict[str, dict[str, list[_HandoffRoute]]] | None = None
 
     async def async_setup(self) -> None:
         """Set up the event bridge."""
         _LOGGER.debug("Setting up event bridge")
 
-        # Subscribe to all HA state changes
-        self._unsub = self.hass.bus.async_listen(
-            EVENT_STATE_CHANGED,
-            self._state_changed_listener,
-        )
+        self._subscribed = True
+        self._async_refresh_subscriptions()
+        for event_type in _DISPATCH_TOPOLOGY_EVENT_TYPES:
+            self.bus.subscribe(self._handle_topology_event, EventFilter(event_type=event_type))
+        for event_type in _HANDOFF_ADJACENCY_EVENT_TYPES:
+            self.bus.subscribe(self._handle_adjacency_event, EventFilter(event_type=event_type))
 
     async def async_teardown(self) -> None:
         """Tear down the event bridge."""
-        if self._unsub:
-            self._unsub()
-            self._unsub = None
+        self._subscribed = False
+        await self.async_stop_capture()
+        if self._refresh_handle is not None:
+            self._refresh_handle.cancel()
+            self._refresh_handle = None
+        for unsub in self._tracked.values():
+            unsub()
+        self._tracked = {}
+        self.bus.unsubscribe(self._handle_topology_event)
+        self.bus.unsubscribe(self._handle_adjacency_event)
+
+    @property
+    def tracked_entity_ids(self) -> frozenset[str]:
+        """Return the entity ids whose state changes currently reach the bridge."""
+        return frozenset(self._tracked)
+
+    async def async_start_capture(self, path: Path) -> None:
+        """Record state changes reaching the bridge to ``path`` for offline replay.
+
+        Raises ``FileExistsError`` when ``path`` exists and is not a previous capture.
+        """
+        await self.async_stop_capture()
+        await self.hass.async_add_executor_job(prepare_capture_path, path)
+        self._recorder = StateStreamRecorder(self.hass, path, self._capture_config())
+        _LOGGER.info("Recording EventBridge state stream to %s", path)
+
+    async def async_stop_capture(self) -> int | None:
+        """Stop recording; return the number of recorded events, or None when idle."""
+        recorder, self._recorder = self._recorder, None
+        if recorder is None:
+            return None
+        await recorder.async_close()
+        _LOGGER.info(
+            "Recorded %d state change(s) to %s", recorder.recorded_count, recorder.path
+        )
+        return recorder.recorded_count
+
+    def _capture_config(self) -> dict[str, Any]:
+        """Snapshot topology config in the persisted config-store shape."""
+        locations = [
+            {
+                "id": location.id,
+                "name": location.name,
+                "parent_id": location.parent_id,
+                "is_explicit_root": location.is_explicit_root,
+                "order": getattr(location, "order", None),
+                "entity_ids": list(location.entity_ids),
+                "modules": dict(location.modules),
+            }
+            for location in self._all_locations()
+        ]
+        adjacency_edges: list[dict[str, Any]] = []
+        list_edges = getattr(self.loc_mgr, "all_adjacency_edges", None)
+        if callable(list_edges):
+            for edge in list_edges():
+                edge_payload = self._serialize_edge(edge)
+                if edge_payload is not None:
+                    adjacency_edges.append(dict(edge_payload))
+        return {"locations": locations, "adjacency_edges": adjacency_edges}
+
+    def diagnostics(self) -> dict[str, Any]:
+        """Return runtime counters for config entry diagnostics."""
+        return {
+            "tracked_entities": len(self._tracked),
+            "capture_active": self._recorder is not None,
+            "coalesced_triggers": {
+                "suppressed_total": sum(self._coalesced.values()),
+                "suppressed_by_source": dict(self._coalesced.most_common()),
+            },
+        }
+
+    @callback
+    def invalidate_dispatch(self) -> None:
+        """Drop the entity dispatch table after occupancy config changes."""
+        self._dispatch = None
+        self._dispatch_configs = {}
+        self._schedule_subscription_refresh()
+
+    @callback
+    def invalidate_handoff_index(self) -> None:
+        """Drop the adjacency handoff index after edges change."""
+        self._handoffs = None
+        self._schedule_subscription_refresh()
+
+    @callback
+    def _schedule_subscription_refresh(self) -> None:
+        """Resubscribe on the next loop iteration, coalescing bursts of invalidations."""
+        if not self._subscribed or self._refresh_handle is not None:
+            return
+        self._refresh_handle = self.hass.loop.call_soon(self._async_refresh_subscriptions)
+
+    @callback
+    def _async_refresh_subscriptions(self) -> None:
+        """Track exactly the relevant entities, only touching subscriptions that changed."""
+        self._refresh_handle = None
+        if not self._subscribed:
+            return
+        relevant = self._relevant_entity_ids()
+        for entity_id in self._tracked.keys() - relevant:
+            self._tracked.pop(entity_id)()
+        for entity_id in relevant - self._tracked.keys():
+            self._tracked[entity_id] = async_track_state_change_event(
+                self.hass,
+                entity_id,
+                self._state_changed_listener,
+            )
+
+    def _relevant_entity_ids(self) -> set[str]:
+        """Return occupancy, policy, WIAB and adjacency crossing entities."""
+        relevant = set(self._dispatch_table())
+        relevant.update(
+            crossing_source
+            for crossing_source in self._handoff_index()
+            if valid_entity_id(crossing_source)
+        )
+        return relevant
+
+    @callback
+    def _handle_topology_event(self, _event: Event) -> None:
+        """Rebuild dispatch after locations are added or removed."""
+        self.invalidate_dispatch()
+        # Deleting a location drops its adjacency edges too.
+        self.invalidate_handoff_index()
+
+    @callback
+    def _handle_adjacency_event(self, _event: Event) -> None:
+        """Rebuild the handoff index after adjacency edges change."""
+        self.invalidate_handoff_index()
+
+    def _dispatch_table(self) -> dict[str, _EntityDispatch]:
+        """Return the entity dispatch table, compiling it when invalidated."""
+        if self._dispatch is None:
+            self._dispatch, self._dispatch_configs = self._compile_dispatch()
+        return self._dispatch
+
+    def _entity_dispatch(self, entity_id: str) -> _EntityDispatch | None:
+        """Return precompiled work for an entity, or None when nothing references it."""
+        return self._dispatch_table().get(entity_id)
+
+    def _compile_dispatch(self) -> tuple[dict[str, _EntityDispatch], dict[str, Any]]:
+        """Index occupancy sources, policy sources and WIAB entities by entity_id.
+
+        Entity assignment is checked at dispatch time, so remapping an entity does
+        not require a rebuild; only occupancy config changes do.
+        """
+        dispatch: dict[str, _EntityDispatch] = {}
+        configs: dict[str, Any] = {}
+        root_ids = self._root_location_ids()
+        for location in self._all_locations():
+            location_id = getattr(location, "id", None)
+            if not isinstance(location_id, str) or not location_id:
+                continue
+            occupancy_config = self.loc_mgr.get_module_config(location_id, "occupancy")
+            configs[location_id] = occupancy_config
+            if not isinstance(occupancy_config, dict):
+                continue
+
+            configured_sources = occupancy_config.get("occupancy_sources")
+            if isinstance(configured_sources, list):
+                for source in configured_sources:
+                    if not isinstance(source, dict):
+                        continue
+                    entity_id = source.get("entity_id")
+                    if not isinstance(entity_id, str) or not entity_id:
+                        continue
+                    dispatch.setdefault(entity_id, _EntityDispatch()).sources.append(
+                        _SourceRoute.from_config(location_id, entity_id, source)
+                    )
+
+            policy_sources = occupancy_config.get("policy_sources")
+            if isinstance(policy_sources, list):
+                for source in policy_sources:
+                    if not isinstance(source, dict):
+                        continue
+                    entity_id = source.get("entity_id")
+                    if not isinstance(entity_id, str) or not entity_id:
+                        continue
+                    policy_route = self._compile_policy_route(
+                        location_id,
+                        entity_id,
+                        source,
+                        root_ids,
+                    )
+                    if policy_route is not None:
+                        dispatch.setdefault(entity_id, _EntityDispatch()).policy.append(
+                            policy_route
+                        )
+
+            wiab_raw = occupancy_config.get("wiab")
+            if isinstance(wiab_raw, dict):
+                for route_entity_id, wiab_route in self._compile_wiab_routes(location_id, wiab_raw):
+                    dispatch.setdefault(route_entity_id, _EntityDispatch()).wiab.append(wiab_route)
+
+        return dispatch, configs
+
+    def _compile_policy_route(
+        self,
+        location_id: str,
+        entity_id: str,
+        source: dict[str, Any],
+        root_ids: list[str],
+    ) -> _PolicyRoute | None:
+        """Compile one ``policy_sources`` record; None when it maps no vacate action."""
+        state_map = source.get("state_map")
+        if not isinstance(state_map, dict):
+            return None
+
+        state_actions: dict[Any, bool | None] = {}
+        for state, mapping in state_map.items():
+            if mapping is None:
+                continue
+            mapping_config: dict[str, Any]
+            if isinstance(mapping, str):
+                mapping_config = {"action": mapping}
+            elif isinstance(mapping, dict):
+                mapping_config = mapping
+            else:
+                state_actions[state] = None
+                continue
+            action = str(mapping_config.get("action", "")).strip().lower()
+            if action != "vacate_area":
+                state_actions[state] = None
+                continue
+            state_actions[state] = bool(mapping_config.get("include_locked", True))
+        if all(include_locked is None for include_locked in state_actions.values()):
+            return None
+
+        source_id = source.get("source_id")
+        if not isinstance(source_id, str) or not source_id:
+            source_id = f"policy::{entity_id}"
+
+        return _PolicyRoute(
+            source_id=source_id,
+            targets=tuple(
+                self._resolve_policy_targets(
+                    source,
+                    default_target=location_id,
+                    root_ids=root_ids,
+                )
+            ),
+            state_actions=state_actions,
+        )
+
+    def _compile_wiab_routes(
+        self,
+        location_id: str,
+        wiab: dict[str, Any],
+    ) -> list[tuple[str, _WiabRoute]]:
+        """Expand one location's WIAB preset into per-entity routes.
+
+        Hybrid rooms yield the enclosed-room route before the home-containment
+        route so evaluation order matches the preset semantics.
+        """
+        preset = str(wiab.get("preset", "off")).strip().lower()
+        if preset in {"", "off"}:
+            return []
+
+        presets: list[tuple[str, str, int, int]] = []
+        if preset in {"enclosed_room", "hybrid"}:
+            presets.append(("enclosed_room", "door_entities", 90, 900))
+        if preset in {"home_containment", "hybrid"}:
+            presets.append(("home_containment", "exterior_door_entities", 120, 3600))
+
+        routes: list[tuple[str, _WiabRoute]] = []
+        for preset_name, door_key, default_release, default_hold in presets:
+            interior_entities = self._wiab_entities(wiab, "interior_entities")
+            door_entities = self._wiab_entities(wiab, door_key)
+            release_timeout_sec = self._wiab_int(
+                wiab.get("release_timeout_sec"), default=default_release
+            )
+            hold_timeout_sec = self._wiab_int(wiab.get("hold_timeout_sec"), default=default_hold)
+            for entity_id in sorted(interior_entities | door_entities):
+                routes.append(
+                    (
+                        entity_id,
+                        _WiabRoute(
+                            location_id=location_id,
+                            preset=preset_name,
+                            source_id=f"wiab:{preset_name}:{location_id}",
+                            interior=entity_id in interior_entities,
+                            door=entity_id in door_entities,
+                            release_timeout_sec=release_timeout_sec,
+                            hold_timeout_sec=hold_timeout_sec,
+                        ),
+                    )
+                )
+        return routes
 
     async def async_reconcile_policy_sources(self) -> None:
         """Apply policy mappings against current HA state at startup."""
         if self.occupancy is None:
             return
 
-        for entity_id in self._policy_entity_ids():
+        for entity_id, dispatch in list(self._dispatch_table().items()):
+            if not dispatch.policy:
+                continue
             state = self.hass.states.get(entity_id)
             if state is None:
                 continue
-            actions = self._resolve_policy_actions(entity_id, state.state)
+            actions = self._resolve_policy_actions(dispatch.policy, state.state)
             self._execute_policy_actions(actions)
 
     @callback
@@ -76,11 +547,22 @@ class EventBridge:
         old_state = event.data.get("old_state")
         new_state = event.data.get("new_state")
 
+        if self._recorder is not None:
+            self._recorder.async_record(event)
+
         if not entity_id or new_state is None:
             return
 
-        policy_actions = self._resolve_policy_actions(entity_id, new_state.state)
-        self._execute_policy_actions(policy_actions)
+        dispatch = self._entity_dispatch(entity_id)
+        if dispatch is None:
+            # Not an occupancy, policy, or WIAB source anywhere in the topology.
+            return
+
+        if dispatch.policy:
+            policy_actions = self._resolve_policy_actions(dispatch.policy, new_state.state)
+            self._execute_policy_actions(policy_actions)
+        if not dispatch.sources and not dispatch.wiab:
+            return
 
         # Normalize state
         domain = entity_id.split(".", 1)[0]
@@ -124,12 +606,16 @@ class EventBridge:
             return
 
         event_time = new_state.last_changed or datetime.now(UTC)
-        self._execute_wiab_actions(
-            entity_id=entity_id,
-            signal_type=signal_type,
-            normalized_new=normalized_new,
-            event_time=event_time,
-        )
+        if dispatch.wiab:
+            self._execute_wiab_actions(
+                dispatch.wiab,
+                entity_id=entity_id,
+                signal_type=signal_type,
+                normalized_new=normalized_new,
+                event_time=event_time,
+            )
+        if not dispatch.sources:
+            return
 
         # Get location for entity
         location_id = self.loc_mgr.get_entity_location(entity_id)
@@ -138,17 +624,21 @@ class EventBridge:
             return
 
         occupancy_config = self.loc_mgr.get_module_config(location_id, "occupancy")
+        if occupancy_config is not self._dispatch_configs.get(location_id):
+            # Config was replaced without an invalidation; recompile once.
+            self.invalidate_dispatch()
+            dispatch = self._entity_dispatch(entity_id)
+            if dispatch is None:
+                return
         if not isinstance(occupancy_config, dict):
             return
-        configured_sources = occupancy_config.get("occupancy_sources")
-        if not isinstance(configured_sources, list) or not configured_sources:
-            return
 
         source_events = self._resolve_source_events(
-            configured_sources=configured_sources,
-            entity_id=entity_id,
+            dispatch.sources,
+            location_id=location_id,
             signal_type=signal_type,
             signal_key=signal_key,
+            fired_at=_event_fired_at(event),
         )
         if not source_events:
             return
@@ -217,46 +707,29 @@ class EventBridge:
 
     def _execute_wiab_actions(
         self,
+        routes: list[_WiabRoute],
         *,
         entity_id: str,
         signal_type: str,
         normalized_new: str | None,
         event_time: datetime,
     ) -> None:
-        """Evaluate wasp-in-box presets configured in occupancy module config."""
+        """Evaluate the wasp-in-box presets that reference this entity."""
         if self.occupancy is None:
             return
 
-        for location in self._all_locations():
-            location_id = getattr(location, "id", None)
-            if not isinstance(location_id, str) or not location_id:
-                continue
-
-            occupancy_config = self.loc_mgr.get_module_config(location_id, "occupancy")
-            if not isinstance(occupancy_config, dict):
-                continue
-
-            wiab_raw = occupancy_config.get("wiab")
-            if not isinstance(wiab_raw, dict):
-                continue
-            preset = str(wiab_raw.get("preset", "off")).strip().lower()
-            if preset in {"", "off"}:
-                continue
-
-            if preset in {"enclosed_room", "hybrid"}:
+        for route in routes:
+            if route.preset == "enclosed_room":
                 self._apply_wiab_enclosed_room(
-                    location_id=location_id,
-                    wiab=wiab_raw,
+                    route,
                     entity_id=entity_id,
                     signal_type=signal_type,
                     normalized_new=normalized_new,
                     event_time=event_time,
                 )
-
-            if preset in {"home_containment", "hybrid"}:
+            else:
                 self._apply_wiab_home_containment(
-                    location_id=location_id,
-                    wiab=wiab_raw,
+                    route,
                     entity_id=entity_id,
                     signal_type=signal_type,
                     normalized_new=normalized_new,
@@ -265,29 +738,22 @@ class EventBridge:
 
     def _apply_wiab_enclosed_room(
         self,
+        route: _WiabRoute,
         *,
-        location_id: str,
-        wiab: dict[str, Any],
         entity_id: str,
         signal_type: str,
         normalized_new: str | None,
         event_time: datetime,
     ) -> None:
         """Apply enclosed-room WIAB latch semantics for one location."""
-        interior_entities = self._wiab_entities(wiab, "interior_entities")
-        door_entities = self._wiab_entities(wiab, "door_entities")
-        if not interior_entities and not door_entities:
-            return
-
-        source_id = f"wiab:enclosed_room:{location_id}"
-        release_timeout_sec = self._wiab_int(wiab.get("release_timeout_sec"), default=90)
-        hold_timeout_sec = self._wiab_int(wiab.get("hold_timeout_sec"), default=900)
+        location_id = route.location_id
+        source_id = route.source_id
 
-        if entity_id in interior_entities and signal_type == "trigger":
-            self._safe_trigger(location_id, source_id, hold_timeout_sec)
+        if route.interior and signal_type == "trigger":
+            self._safe_trigger(location_id, source_id, route.hold_timeout_sec)
             return
 
-        if entity_id not in door_entities:
+        if not route.door:
             return
 
         door_state = self._wiab_door_state(normalized_new=normalized_new, signal_type=signal_type)
@@ -305,7 +771,7 @@ class EventBridge:
 
         if door_state == "open":
             self._safe_unlock(location_id, source_id)
-            self._safe_clear(location_id, source_id, release_timeout_sec)
+            self._safe_clear(location_id, source_id, route.release_timeout_sec)
             self._publish_wiab_trace(
                 location_id=location_id,
                 event_time=event_time,
@@ -316,26 +782,19 @@ class EventBridge:
 
     def _apply_wiab_home_containment(
         self,
+        route: _WiabRoute,
         *,
-        location_id: str,
-        wiab: dict[str, Any],
         entity_id: str,
         signal_type: str,
         normalized_new: str | None,
         event_time: datetime,
     ) -> None:
         """Apply home-containment WIAB latch semantics for one location."""
-        interior_entities = self._wiab_entities(wiab, "interior_entities")
-        exterior_door_entities = self._wiab_entities(wiab, "exterior_door_entities")
-        if not interior_entities and not exterior_door_entities:
-            return
-
-        source_id = f"wiab:home_containment:{location_id}"
-        release_timeout_sec = self._wiab_int(wiab.get("release_timeout_sec"), default=120)
-        hold_timeout_sec = self._wiab_int(wiab.get("hold_timeout_sec"), default=3600)
+        location_id = route.location_id
+        source_id = route.source_id
 
-        if entity_id in interior_entities and signal_type == "trigger":
-            self._safe_trigger(location_id, source_id, hold_timeout_sec)
+        if route.interior and signal_type == "trigger":
+            self._safe_trigger(location_id, source_id, route.hold_timeout_sec)
             self._safe_lock(location_id, source_id, mode="block_vacant", scope="self")
             self._publish_wiab_trace(
                 location_id=location_id,
@@ -346,13 +805,13 @@ class EventBridge:
             )
             return
 
-        if entity_id not in exterior_door_entities:
+        if not route.door:
             return
 
         door_state = self._wiab_door_state(normalized_new=normalized_new, signal_type=signal_type)
         if door_state == "open":
             self._safe_unlock(location_id, source_id)
-            self._safe_clear(location_id, source_id, release_timeout_sec)
+            self._safe_clear(location_id, source_id, route.release_timeout_sec)
             self._publish_wiab_trace(
                 location_id=location_id,
                 event_time=event_time,
@@ -514,12 +973,8 @@ class EventBridge:
         if source_event.get("event_type") != "trigger":
             return
 
-        list_edges = getattr(self.loc_mgr, "all_adjacency_edges", None)
-        if not callable(list_edges):
-            return
-
-        raw_edges = list_edges()
-        if not isinstance(raw_edges, list) or not raw_edges:
+        handoffs = self._handoff_index()
+        if not handoffs:
             return
 
         source_id_raw = source_event.get("source_id")
@@ -528,32 +983,20 @@ class EventBridge:
             return
         source_id_base = source_id.split("::", 1)[0]
 
-        for edge in raw_edges:
-            edge_payload = self._serialize_edge(edge)
-            if edge_payload is None:
-                continue
-
-            crossing_sources = {
-                str(source).strip()
-                for source in edge_payload.get("crossing_sources", [])
-                if isinstance(source, str) and str(source).strip()
-            }
-            if not crossing_sources:
-                continue
-            if (
-                entity_id not in crossing_sources
-                and source_id not in crossing_sources
-                and source_id_base not in crossing_sources
-            ):
-                continue
-
-            destination_id = self._handoff_destination(edge_payload, source_location_id)
-            if destination_id is None:
+        routes: dict[int, _HandoffRoute] = {}
+        for crossing_source in (entity_id, source_id, source_id_base):
+            by_location = handoffs.get(crossing_source)
+            if by_location is None:
                 continue
+            for route in by_location.get(source_location_id, ()):
+                routes[route.order] = route
 
-            handoff_window_sec = max(1, int(edge_payload.get("handoff_window_sec", 12)))
+        for order in sorted(routes):
+            route = routes[order]
+            destination_id = route.destination_id
+            handoff_window_sec = route.handoff_window_sec
             synthetic_source_id = (
-                f"__handoff__:{edge_payload['edge_id']}:{source_id.replace('::', '_')}"
+                f"__handoff__:{route.edge_id}:{source_id.replace('::', '_')}"
             )
 
             handoff_signal = Event(
@@ -570,12 +1013,12 @@ class EventBridge:
                     "attributes": state_attributes,
                     "timeout": handoff_window_sec,
                     "handoff": {
-                        "edge_id": edge_payload["edge_id"],
+                        "edge_id": route.edge_id,
                         "from_location_id": source_location_id,
                         "to_location_id": destination_id,
                         "trigger_entity_id": entity_id,
                         "trigger_source_id": source_id,
-                        "boundary_type": edge_payload.get("boundary_type", "virtual"),
+                        "boundary_type": route.boundary_type,
                     },
                 },
                 timestamp=event_time,
@@ -589,12 +1032,12 @@ class EventBridge:
                     entity_id=entity_id,
                     location_id=destination_id,
                     payload={
-                        "edge_id": edge_payload["edge_id"],
+                        "edge_id": route.edge_id,
                         "from_location_id": source_location_id,
                         "to_location_id": destination_id,
                         "trigger_entity_id": entity_id,
                         "trigger_source_id": source_id,
-                        "boundary_type": edge_payload.get("boundary_type", "virtual"),
+                        "boundary_type": route.boundary_type,
                         "handoff_window_sec": handoff_window_sec,
                         "status": "provisional_triggered",
                         "timestamp": event_time.isoformat(),
@@ -603,6 +1046,63 @@ class EventBridge:
                 )
             )
 
+    def _handoff_index(self) -> dict[str, dict[str, list[_HandoffRoute]]]:
+        """Return the adjacency handoff index, building it when invalidated."""
+        if self._handoffs is None:
+            self._handoffs = self._build_handoff_index()
+        return self._handoffs
+
+    def _build_handoff_index(self) -> dict[str, dict[str, list[_HandoffRoute]]]:
+        """Index adjacency edges by crossing source and the location they hand off from."""
+        index: dict[str, dict[str, list[_HandoffRoute]]] = {}
+        list_edges = getattr(self.loc_mgr, "all_adjacency_edges", None)
+        if not callable(list_edges):
+            return index
+
+        raw_edges = list_edges()
+        if not isinstance(raw_edges, list):
+            return index
+
+        for order, edge in enumerate(raw_edges):
+            edge_payload = self._serialize_edge(edge)
+            if edge_payload is None:
+                continue
+
+            crossing_sources = {
+                str(source).strip()
+                for source in edge_payload.get("crossing_sources", [])
+                if isinstance(source, str) and str(source).strip()
+            }
+            if not crossing_sources:
+                continue
+
+            try:
+                handoff_window_sec = max(1, int(edge_payload.get("handoff_window_sec", 12)))
+            except (TypeError, ValueError):
+                handoff_window_sec = 12
+
+            for source_location_id in (
+                edge_payload.get("from_location_id"),
+                edge_payload.get("to_location_id"),
+            ):
+                if not isinstance(source_location_id, str):
+                    continue
+                destination_id = self._handoff_destination(edge_payload, source_location_id)
+                if destination_id is None:
+                    continue
+                route = _HandoffRoute(
+                    order=order,
+                    edge_id=edge_payload["edge_id"],
+                    destination_id=destination_id,
+                    handoff_window_sec=handoff_window_sec,
+                    boundary_type=edge_payload.get("boundary_type", "virtual"),
+                )
+                for crossing_source in crossing_sources:
+                    index.setdefault(crossing_source, {}).setdefault(
+                        source_location_id, []
+                    ).append(route)
+        return index
+
     def _serialize_edge(self, edge: Any) -> dict[str, Any] | None:
         """Normalize edge objects across runtime versions."""
         to_dict = getattr(edge, "to_dict", None)
@@ -794,66 +1294,47 @@ class EventBridge:
 
     def _resolve_source_events(
         self,
-        configured_sources: list[Any],
-        entity_id: str,
+        routes: list[_SourceRoute],
+        *,
+        location_id: str,
         signal_type: str,
         signal_key: str | None,
+        fired_at: float,
     ) -> list[dict[str, Any]]:
-        """Resolve configured source records for an incoming entity signal."""
+        """Resolve compiled source routes of the entity's location for an incoming signal."""
         resolved: list[dict[str, Any]] = []
-
-        for source in configured_sources:
-            if not isinstance(source, dict):
-                continue
-            if source.get("entity_id") != entity_id:
+        for route in routes:
+            if route.location_id != location_id:
                 continue
-
-            configured_signal_key = source.get("signal_key")
-            is_media_entity = entity_id.startswith("media_player.")
-            if is_media_entity:
-                if configured_signal_key not in {"playback", "volume", "mute"}:
-                    continue
-                if configured_signal_key != signal_key:
-                    continue
-            elif configured_signal_key and configured_signal_key != signal_key:
-                continue
-
-            if signal_type == "trigger":
-                if source.get("on_event", "trigger") != "trigger":
-                    continue
-                timeout_set = "on_timeout" in source
-                timeout = source.get("on_timeout") if timeout_set else None
-                event_type = "trigger"
-            elif signal_type == "clear":
-                state_held_until_clear = source.get("on_timeout") is None
-                if source.get("off_event", "none") != "clear" and not state_held_until_clear:
-                    continue
-                off_trailing = source.get("off_trailing", 0)
-                try:
-                    off_trailing = int(off_trailing)
-                except (TypeError, ValueError):
-                    off_trailing = 0
-                timeout_set = True
-                timeout = max(0, off_trailing)
-                event_type = "clear"
-            else:
-                continue
-
-            source_id = source.get("source_id")
-            if not source_id:
-                source_id = entity_id if not configured_signal_key else f"{entity_id}::{configured_signal_key}"
-
-            resolved.append(
-                {
-                    "event_type": event_type,
-                    "source_id": source_id,
-                    "timeout_set": timeout_set,
-                    "timeout": timeout,
-                }
-            )
-
+            source_event = route.resolve(signal_type, signal_key)
+            if source_event is not None and self._admit_source_event(
+                route, source_event, fired_at
+            ):
+                resolved.append(source_event)
         return resolved
 
+    def _admit_source_event(
+        self,
+        route: _SourceRoute,
+        source_event: dict[str, Any],
+        fired_at: float,
+    ) -> bool:
+        """Let the first trigger of a burst through; suppress repeats inside the window."""
+        key = (route.location_id, route.source_id)
+        if source_event["event_type"] != "trigger":
+            # A clear ends the burst so the next trigger is an edge again.
+            self._last_trigger_at.pop(key, None)
+            return True
+        if route.coalesce_window_sec <= 0:
+            return True
+
+        last = self._last_trigger_at.get(key)
+        if last is not None and 0 <= fired_at - last < route.coalesce_window_sec:
+            self._coalesced[route.source_id] += 1
+            return False
+        self._last_trigger_at[key] = fired_at
+        return True
+
     def _normalize_state(self, state: str | None, attributes: dict) -> str | None:
         """Normalize entity state for kernel.
 
@@ -877,86 +1358,29 @@ class EventBridge:
         # Default: return as-is
         return state
 
-    def _policy_entity_ids(self) -> set[str]:
-        """Collect configured policy source entities across all locations."""
-        entity_ids: set[str] = set()
-        for location in self._all_locations():
-            occupancy_config = self.loc_mgr.get_module_config(location.id, "occupancy")
-            if not isinstance(occupancy_config, dict):
-                continue
-            policy_sources = occupancy_config.get("policy_sources")
-            if not isinstance(policy_sources, list):
-                continue
-            for source in policy_sources:
-                if not isinstance(source, dict):
-                    continue
-                entity_id = source.get("entity_id")
-                if isinstance(entity_id, str) and entity_id:
-                    entity_ids.add(entity_id)
-        return entity_ids
-
     def _resolve_policy_actions(
         self,
-        entity_id: str,
+        routes: list[_PolicyRoute],
         new_state: str | None,
     ) -> list[dict[str, Any]]:
-        """Resolve configured policy actions for a state change."""
+        """Resolve compiled policy routes of one entity for a state change."""
         if new_state is None:
             return []
 
-        normalized_state = str(new_state).strip().lower()
         resolved: list[dict[str, Any]] = []
-        for location in self._all_locations():
-            occupancy_config = self.loc_mgr.get_module_config(location.id, "occupancy")
-            if not isinstance(occupancy_config, dict):
-                continue
-
-            policy_sources = occupancy_config.get("policy_sources")
-            if not isinstance(policy_sources, list):
+        for route in routes:
+            include_locked = route.include_locked_for(new_state)
+            if include_locked is None:
                 continue
-
-            for source in policy_sources:
-                if not isinstance(source, dict):
-                    continue
-                if source.get("entity_id") != entity_id:
-                    continue
-
-                state_map = source.get("state_map")
-                if not isinstance(state_map, dict):
-                    continue
-
-                mapping = state_map.get(new_state)
-                if mapping is None:
-                    mapping = state_map.get(normalized_state)
-                if mapping is None:
-                    continue
-
-                mapping_config: dict[str, Any]
-                if isinstance(mapping, str):
-                    mapping_config = {"action": mapping}
-                elif isinstance(mapping, dict):
-                    mapping_config = mapping
-                else:
-                    continue
-
-                action = str(mapping_config.get("action", "")).strip().lower()
-                if action != "vacate_area":
-                    continue
-
-                source_id = source.get("source_id")
-                if not isinstance(source_id, str) or not source_id:
-                    source_id = f"policy::{entity_id}"
-
-                include_locked = bool(mapping_config.get("include_locked", True))
-                for target in self._resolve_policy_targets(source, default_target=location.id):
-                    resolved.append(
-                        {
-                            "action": "vacate_area",
-                            "location_id": target,
-                            "source_id": source_id,
-                            "include_locked": include_locked,
-                        }
-                    )
+            for target in route.targets:
+                resolved.append(
+                    {
+                        "action": "vacate_area",
+                        "location_id": target,
+                        "source_id": route.source_id,
+                        "include_locked": include_locked,
+                    }
+                )
 
         return resolved
 
@@ -965,6 +1389,7 @@ class EventBridge:
         source: dict[str, Any],
         *,
         default_target: str,
+        root_ids: list[str],
     ) -> list[str]:
         """Resolve policy target location IDs from source configuration."""
         targets = source.get("targets")
@@ -972,8 +1397,7 @@ class EventBridge:
             return [default_target]
 
         if any(str(item).strip().lower() == "all_roots" for item in targets):
-            root_targets = self._root_location_ids()
-            return root_targets or [default_target]
+            return list(root_ids) or [default_target]
 
         resolved: list[str] = []
         seen: set[str] = set()
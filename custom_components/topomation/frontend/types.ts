@@ -180,6 +180,7 @@ export interface OccupancySource {
   on_timeout?: number | null;
   off_event?: "clear" | "none";
   off_trailing?: number | null;
+  coalesce_window_sec?: number | null;
 }
 
 // Alias for backward compatibility with entity config dialog
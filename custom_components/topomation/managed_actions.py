@@ -1,7 +1,10 @@
 """Backend managed-action automation lifecycle for Topomation.
 
-Uses Home Assistant's config/automation REST API (POST/GET/DELETE) so HA
-handles validation, file write, and reload. No direct file I/O.
+Single-rule writes use Home Assistant's config/automation REST API
+(POST/GET/DELETE) so HA handles validation, file write, and reload. Batch
+writes (stale-rule rebuild, bulk create) validate each rule with the same
+validator, update ``automations.yaml`` once the way that API does, and reload
+automations once instead of once per rule.
 """
 
 from __future__ import annotations
@@ -10,7 +13,9 @@ import asyncio
 import hashlib
 import json
 import logging
+import os
 import re
+import uuid
 from collections.abc import Mapping
 from dataclasses import dataclass
 from time import monotonic
@@ -25,7 +30,8 @@ from homeassistant.components.automation import (
     DOMAIN as AUTOMATION_DOMAIN,
 )
 from homeassistant.components.automation.config import async_validate_config_item
-from homeassistant.const import CONF_ID
+from homeassistant.config import AUTOMATION_CONFIG_PATH
+from homeassistant.const import CONF_ID, SERVICE_RELOAD
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers import area_registry as ar
 from homeassistant.helpers import category_registry as cr
@@ -33,6 +39,9 @@ from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers import label_registry as lr
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.network import get_url
+from homeassistant.util.file import write_utf8_file_atomic
+from homeassistant.util.yaml import dump as yaml_dump
+from homeassistant.util.yaml import load_yaml
 
 from .const import (
     AMBIENT_BRIGHT_THRESHOLD_DEFAULT,
@@ -63,6 +72,17 @@ _TOPOMATION_SYSTEM_USER_NAME = "Topomation"
 _AUTOMATION_API_REFRESH_TOKEN_KEY = "_automation_api_refresh_token"  # noqa: S105
 _ENTITY_RESOLVE_MAX_ATTEMPTS = 20
 _ENTITY_RESOLVE_WAIT_SECONDS = 0.25
+# Keys written first, in this order, matching HA's automation config editor.
+_AUTOMATION_CONFIG_KEY_ORDER = (
+    "alias",
+    "description",
+    "triggers",
+    "trigger",
+    "conditions",
+    "condition",
+    "actions",
+    "action",
+)
 _VALID_TRIGGER_TYPES = frozenset({"on_occupied", "on_vacant", "on_dark", "on_bright"})
 _TRIGGER_TYPE_ORDER: tuple[ActionTriggerType, ...] = (
     "on_occupied",
@@ -183,6 +203,8 @@ class TopomationManagedActions:
         self._loc_mgr = loc_mgr
         self._token_lock = asyncio.Lock()
         self._recent_rule_snapshots: dict[str, _RecentRuleSnapshot] = {}
+        self._batch_write_lock = asyncio.Lock()
+        self._last_rebuild: dict[str, Any] | None = None
 
     async def _ensure_automation_api_token(self) -> str:
         """Get or create a system user and return an access token for the config API."""
@@ -309,29 +331,8 @@ class TopomationManagedActions:
                 location_id=location_id,
             )
             if recent_snapshot is not None:
-                enabled = self._is_automation_enabled(entity_id)
                 rules.append(
-                    {
-                        "id": automation_id or entity_id,
-                        "entity_id": entity_id,
-                        "name": recent_snapshot.name,
-                        "metadata_version": recent_snapshot.metadata_version,
-                        "trigger_type": recent_snapshot.trigger_type,
-                        "trigger_types": list(recent_snapshot.trigger_types),
-                        "actions": [dict(action) for action in recent_snapshot.actions],
-                        "ambient_condition": recent_snapshot.ambient_condition,
-                        "must_be_occupied": recent_snapshot.must_be_occupied,
-                        "require_property_activity": recent_snapshot.require_property_activity,
-                        "time_condition_enabled": recent_snapshot.time_condition_enabled,
-                        "start_time": recent_snapshot.start_time,
-                        "end_time": recent_snapshot.end_time,
-                        "run_on_startup": recent_snapshot.run_on_startup,
-                        "rule_uuid": recent_snapshot.rule_uuid,
-                        "user_named": recent_snapshot.user_named,
-                        "daily_gating_enabled": recent_snapshot.daily_gating_enabled,
-                        "gen_hash": recent_snapshot.gen_hash,
-                        "enabled": enabled,
-                    }
+                    self._rule_from_snapshot(entity_id, automation_id or "", recent_snapshot)
                 )
                 continue
 
@@ -375,46 +376,90 @@ class TopomationManagedActions:
         for (entity_id, raw_config, automation_id), effective_config in zip(
             pending, effective_configs, strict=True
         ):
-            metadata = self._parse_metadata(effective_config.get("description"))
-            if metadata is None or metadata.location_id != location_id:
-                metadata = self._parse_metadata(raw_config.get("description"))
-                if metadata is None or metadata.location_id != location_id:
-                    continue
-
-            name = self._resolve_rule_name(entity_id, effective_config)
-            actions = self._extract_actions(effective_config)
-            if not actions:
-                actions = self._extract_actions(raw_config)
-            enabled = self._is_automation_enabled(entity_id)
-
-            rules.append(
-                {
-                    "id": automation_id or entity_id,
-                    "entity_id": entity_id,
-                    "name": name,
-                    "metadata_version": metadata.version,
-                    "trigger_type": metadata.trigger_type,
-                    "trigger_types": list(metadata.trigger_types),
-                    "actions": actions,
-                    "ambient_condition": metadata.ambient_condition,
-                    "must_be_occupied": metadata.must_be_occupied,
-                    "require_property_activity": metadata.require_property_activity,
-                    "time_condition_enabled": metadata.time_condition_enabled,
-                    "start_time": metadata.start_time,
-                    "end_time": metadata.end_time,
-                    "run_on_startup": metadata.run_on_startup,
-                    "rule_uuid": metadata.rule_uuid
-                    or self._rule_uuid_from_automation_id(automation_id or entity_id),
-                    "user_named": metadata.user_named,
-                    "daily_gating_enabled": metadata.daily_gating_enabled,
-                    "gen_hash": metadata.gen_hash,
-                    "enabled": enabled,
-                }
+            rule = self._rule_from_config(
+                entity_id,
+                automation_id,
+                location_id,
+                effective_config=effective_config,
+                raw_config=raw_config,
             )
+            if rule is not None:
+                rules.append(rule)
 
         rules.sort(key=lambda r: str(r.get("name", "")))
         return rules
 
+    def _rule_from_snapshot(
+        self,
+        entity_id: str,
+        automation_id: str,
+        snapshot: _RecentRuleSnapshot,
+    ) -> dict[str, Any]:
+        """Build a listed rule from a just-written snapshot."""
+        return {
+            "id": automation_id or entity_id,
+            "entity_id": entity_id,
+            "name": snapshot.name,
+            "metadata_version": snapshot.metadata_version,
+            "trigger_type": snapshot.trigger_type,
+            "trigger_types": list(snapshot.trigger_types),
+            "actions": [dict(action) for action in snapshot.actions],
+            "ambient_condition": snapshot.ambient_condition,
+            "must_be_occupied": snapshot.must_be_occupied,
+            "require_property_activity": snapshot.require_property_activity,
+            "time_condition_enabled": snapshot.time_condition_enabled,
+            "start_time": snapshot.start_time,
+            "end_time": snapshot.end_time,
+            "run_on_startup": snapshot.run_on_startup,
+            "rule_uuid": snapshot.rule_uuid,
+            "user_named": snapshot.user_named,
+            "daily_gating_enabled": snapshot.daily_gating_enabled,
+            "gen_hash": snapshot.gen_hash,
+            "enabled": self._is_automation_enabled(entity_id),
+        }
+
+    def _rule_from_config(
+        self,
+        entity_id: str,
+        automation_id: str,
+        location_id: str,
+        *,
+        effective_config: Mapping[str, Any],
+        raw_config: Mapping[str, Any],
+    ) -> dict[str, Any] | None:
+        """Build a listed rule from its stored config, falling back to runtime ``raw_config``."""
+        metadata = self._parse_metadata(effective_config.get("description"))
+        if metadata is None or metadata.location_id != location_id:
+            metadata = self._parse_metadata(raw_config.get("description"))
+            if metadata is None or metadata.location_id != location_id:
+                return None
+
+        actions = self._extract_actions(effective_config)
+        if not actions:
+            actions = self._extract_actions(raw_config)
+        return {
+            "id": automation_id or entity_id,
+            "entity_id": entity_id,
+            "name": self._resolve_rule_name(entity_id, effective_config),
+            "metadata_version": metadata.version,
+            "trigger_type": metadata.trigger_type,
+            "trigger_types": list(metadata.trigger_types),
+            "actions": actions,
+            "ambient_condition": metadata.ambient_condition,
+            "must_be_occupied": metadata.must_be_occupied,
+            "require_property_activity": metadata.require_property_activity,
+            "time_condition_enabled": metadata.time_condition_enabled,
+            "start_time": metadata.start_time,
+            "end_time": metadata.end_time,
+            "run_on_startup": metadata.run_on_startup,
+            "rule_uuid": metadata.rule_uuid
+            or self._rule_uuid_from_automation_id(automation_id or entity_id),
+            "user_named": metadata.user_named,
+            "daily_gating_enabled": metadata.daily_gating_enabled,
+            "gen_hash": metadata.gen_hash,
+            "enabled": self._is_automation_enabled(entity_id),
+        }
+
     async def async_create_rule(
         self,
         *,
@@ -709,25 +754,37 @@ class TopomationManagedActions:
         )
         return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
 
+    async def async_create_rules(
+        self,
+        rules: list[Mapping[str, Any]],
+    ) -> list[dict[str, Any] | Exception]:
+        """Create or replace many managed rules with one file write and one reload.
+
+        Each item holds the keyword arguments of :meth:`async_create_rule`. Results
+        are returned in input order: the created rule, or the exception that kept
+        that rule from being written.
+        """
+        results: list[dict[str, Any] | Exception | None] = []
+        composed_rules: list[_ComposedRuleConfig] = []
+        composed_indexes: list[int] = []
+        for rule in rules:
+            try:
+                composed_rules.append(self._compose_rule_config(**rule))
+            except Exception as err:
+                results.append(err)
+                continue
+            composed_indexes.append(len(results))
+            results.append(None)
+        written = await self._write_composed_rules(composed_rules)
+        for index, result in zip(composed_indexes, written, strict=True):
+            results[index] = result
+        return cast(list[dict[str, Any] | Exception], results)
+
     async def _write_composed_rule(self, composed: _ComposedRuleConfig) -> dict[str, Any]:
         """Validate, POST, and register a composed managed automation config."""
         automation_id = composed.automation_id
         location_id = composed.location_id
-        name = composed.name
         config_payload = composed.config_payload
-        normalized_trigger = composed.trigger_type
-        normalized_trigger_types = composed.trigger_types
-        normalized_ambient_condition = composed.ambient_condition
-        must_be_occupied = composed.must_be_occupied
-        normalized_actions = composed.actions
-        time_condition_enabled = composed.time_condition_enabled
-        normalized_start_time = composed.start_time
-        normalized_end_time = composed.end_time
-        run_on_startup = composed.run_on_startup
-        normalized_rule_uuid = composed.rule_uuid
-        user_named = composed.user_named
-        effective_daily_gating = composed.effective_daily_gating
-        compiled_rule = composed.compiled_rule
 
         _LOGGER.info(
             "[managed_actions] Creating rule via REST API automation_id=%s location=%s",
@@ -741,61 +798,20 @@ class TopomationManagedActions:
                 automation_id,
             )
             raise ValueError("Automation config validation returned no result")
-        await self._call_automation_config_api("POST", automation_id, config_payload)
-        self._remember_recent_rule_snapshot(
-            automation_id=automation_id,
-            location_id=location_id,
-            name=name,
-            trigger_type=normalized_trigger,
-            trigger_types=normalized_trigger_types,
-            ambient_condition=normalized_ambient_condition,
-            must_be_occupied=must_be_occupied,
-            require_property_activity=compiled_rule.require_property_activity,
-            time_condition_enabled=bool(time_condition_enabled),
-            start_time=normalized_start_time,
-            end_time=normalized_end_time,
-            run_on_startup=run_on_startup if isinstance(run_on_startup, bool) else None,
-            rule_uuid=normalized_rule_uuid,
-            actions=normalized_actions,
-            user_named=bool(user_named),
-            daily_gating_enabled=effective_daily_gating,
-            gen_hash=composed.gen_hash,
-        )
+        # Serialize with batch writes so neither rewrite of automations.yaml drops the other.
+        async with self._batch_write_lock:
+            await self._call_automation_config_api("POST", automation_id, config_payload)
+        self._remember_composed_rule(composed)
 
         entity_id = await self._resolve_created_entity_id(
             automation_id,
             max_attempts=_ENTITY_RESOLVE_MAX_ATTEMPTS,
             wait_seconds=_ENTITY_RESOLVE_WAIT_SECONDS,
         )
-        if entity_id:
-            _LOGGER.info(
-                "[managed_actions] Rule created automation_id=%s entity_id=%s",
-                automation_id,
-                entity_id,
-            )
-            self._apply_topomation_grouping(
-                entity_id,
-                normalized_trigger,
-                area_id=compiled_rule.ha_area_id,
-                icon=compiled_rule.icon,
-            )
-        else:
-            timeout_seconds = _ENTITY_RESOLVE_MAX_ATTEMPTS * _ENTITY_RESOLVE_WAIT_SECONDS
+        if not entity_id:
             self._recent_rule_snapshots.pop(automation_id, None)
-            _LOGGER.warning(
-                "[managed_actions] Rule written via config API but entity did not appear after %.1fs. "
-                "Rolling back attempted write. "
-                "The integration uses the same REST API as the HA automation UI (writes to automations.yaml). "
-                "Ensure configuration.yaml includes that file (e.g. automation: !include automations.yaml). "
-                "automation_id=%s",
-                timeout_seconds,
-                automation_id,
-            )
-            error_message = (
-                "Managed action rule was written but Home Assistant did not register it after "
-                f"{timeout_seconds:.1f}s. Ensure configuration.yaml includes automations.yaml "
-                "(for example: automation: !include automations.yaml)."
-            )
+            self._log_unregistered_rule(automation_id)
+            error_message = self._unregistered_rule_message()
             try:
                 await self.async_delete_rule(automation_id=automation_id)
             except Exception as err:
@@ -810,27 +826,194 @@ class TopomationManagedActions:
                 ) from err
             raise ValueError(error_message + " Topomation rolled back the attempted write.")
 
+        return self._registered_rule_result(composed, entity_id)
+
+    async def _write_composed_rules(
+        self,
+        composed_rules: list[_ComposedRuleConfig],
+    ) -> list[dict[str, Any] | Exception]:
+        """Validate many composed rules, write them in one file update, reload once.
+
+        Entity resolution then waits for the whole batch at once, and rules HA
+        never registers are removed again in a single rollback write.
+        """
+        results: list[dict[str, Any] | Exception | None] = [None] * len(composed_rules)
+        valid: dict[int, _ComposedRuleConfig] = {}
+        for index, composed in enumerate(composed_rules):
+            try:
+                validated = await async_validate_config_item(
+                    self.hass, composed.automation_id, composed.config_payload
+                )
+            except Exception as err:
+                results[index] = err
+                continue
+            if validated is None:
+                results[index] = ValueError("Automation config validation returned no result")
+                continue
+            valid[index] = composed
+        if not valid:
+            return cast(list[dict[str, Any] | Exception], results)
+
+        _LOGGER.info(
+            "[managed_actions] Writing %d rules in one batch (%d rejected by validation)",
+            len(valid),
+            len(composed_rules) - len(valid),
+        )
+        try:
+            await self._async_update_automation_config(
+                {composed.automation_id: composed.config_payload for composed in valid.values()}
+            )
+        except Exception as err:
+            _LOGGER.error("[managed_actions] Batch rule write failed: %s", err, exc_info=True)
+            for index in valid:
+                results[index] = err
+            return cast(list[dict[str, Any] | Exception], results)
+        for composed in valid.values():
+            self._remember_composed_rule(composed)
+
+        entity_ids = await self._resolve_created_entity_ids(
+            [composed.automation_id for composed in valid.values()],
+            max_attempts=_ENTITY_RESOLVE_MAX_ATTEMPTS,
+            wait_seconds=_ENTITY_RESOLVE_WAIT_SECONDS,
+        )
+        unregistered: list[str] = []
+        for index, composed in valid.items():
+            entity_id = entity_ids.get(composed.automation_id)
+            if entity_id:
+                results[index] = self._registered_rule_result(composed, entity_id)
+                continue
+            self._recent_rule_snapshots.pop(composed.automation_id, None)
+            self._log_unregistered_rule(composed.automation_id)
+            unregistered.append(composed.automation_id)
+            results[index] = ValueError(self._unregistered_rule_message())
+
+        if unregistered:
+            try:
+                await self._async_update_automation_config(
+                    dict.fromkeys(unregistered)
+                )
+            except Exception:
+                _LOGGER.warning(
+                    "Failed rollback after managed rule registration timeout for %s",
+                    ", ".join(unregistered),
+                    exc_info=True,
+                )
+        return cast(list[dict[str, Any] | Exception], results)
+
+    async def _async_update_automation_config(
+        self,
+        updates: Mapping[str, dict[str, Any] | None],
+    ) -> None:
+        """Apply config upserts (or removals, for ``None``) to automations.yaml and reload once.
+
+        Raises ``ValueError`` when the file read back after the reload does not hold
+        the update, for example because HA's automation editor saved concurrently.
+        """
+        path = self.hass.config.path(AUTOMATION_CONFIG_PATH)
+        async with self._batch_write_lock:
+            await self.hass.async_add_executor_job(_update_automation_config_file, path, updates)
+            await self.hass.services.async_call(
+                AUTOMATION_DOMAIN, SERVICE_RELOAD, {}, blocking=True
+            )
+            current = await self.hass.async_add_executor_job(_read_automation_config_file, path)
+        stored_ids = {
+            entry.get(CONF_ID) for entry in current if isinstance(entry, Mapping)
+        }
+        lost = sorted(
+            automation_id
+            for automation_id, new_value in updates.items()
+            if (automation_id in stored_ids) != (new_value is not None)
+        )
+        if lost:
+            raise ValueError(
+                f"{AUTOMATION_CONFIG_PATH} was changed while Topomation was writing it; "
+                f"the update was lost for: {', '.join(lost)}"
+            )
+
+    def _remember_composed_rule(self, composed: _ComposedRuleConfig) -> None:
+        """Record a just-written rule so list calls see it before HA reloads."""
+        run_on_startup = composed.run_on_startup
+        self._remember_recent_rule_snapshot(
+            automation_id=composed.automation_id,
+            location_id=composed.location_id,
+            name=composed.name,
+            trigger_type=composed.trigger_type,
+            trigger_types=composed.trigger_types,
+            ambient_condition=composed.ambient_condition,
+            must_be_occupied=composed.must_be_occupied,
+            require_property_activity=composed.compiled_rule.require_property_activity,
+            time_condition_enabled=bool(composed.time_condition_enabled),
+            start_time=composed.start_time,
+            end_time=composed.end_time,
+            run_on_startup=run_on_startup if isinstance(run_on_startup, bool) else None,
+            rule_uuid=composed.rule_uuid,
+            actions=composed.actions,
+            user_named=bool(composed.user_named),
+            daily_gating_enabled=composed.effective_daily_gating,
+            gen_hash=composed.gen_hash,
+        )
+
+    def _registered_rule_result(
+        self,
+        composed: _ComposedRuleConfig,
+        entity_id: str,
+    ) -> dict[str, Any]:
+        """Group a registered rule's entity and return the rule as the API reports it."""
+        compiled_rule = composed.compiled_rule
+        _LOGGER.info(
+            "[managed_actions] Rule created automation_id=%s entity_id=%s",
+            composed.automation_id,
+            entity_id,
+        )
+        self._apply_topomation_grouping(
+            entity_id,
+            composed.trigger_type,
+            area_id=compiled_rule.ha_area_id,
+            icon=compiled_rule.icon,
+        )
+        run_on_startup = composed.run_on_startup
         return {
-            "id": automation_id,
-            "entity_id": entity_id or f"automation.{automation_id}",
-            "name": name,
-            "trigger_type": normalized_trigger,
-            "trigger_types": list(normalized_trigger_types),
-            "actions": normalized_actions,
-            "ambient_condition": normalized_ambient_condition,
-            "must_be_occupied": must_be_occupied,
+            "id": composed.automation_id,
+            "entity_id": entity_id,
+            "name": composed.name,
+            "trigger_type": composed.trigger_type,
+            "trigger_types": list(composed.trigger_types),
+            "actions": composed.actions,
+            "ambient_condition": composed.ambient_condition,
+            "must_be_occupied": composed.must_be_occupied,
             "require_property_activity": compiled_rule.require_property_activity,
-            "time_condition_enabled": bool(time_condition_enabled),
-            "start_time": normalized_start_time,
-            "end_time": normalized_end_time,
+            "time_condition_enabled": bool(composed.time_condition_enabled),
+            "start_time": composed.start_time,
+            "end_time": composed.end_time,
             "run_on_startup": run_on_startup if isinstance(run_on_startup, bool) else None,
-            "rule_uuid": normalized_rule_uuid,
+            "rule_uuid": composed.rule_uuid,
             "ha_area_id": compiled_rule.ha_area_id,
             "icon": compiled_rule.icon,
-            "daily_gating_enabled": effective_daily_gating,
+            "daily_gating_enabled": composed.effective_daily_gating,
             "enabled": True,
         }
 
+    @staticmethod
+    def _unregistered_rule_message() -> str:
+        timeout_seconds = _ENTITY_RESOLVE_MAX_ATTEMPTS * _ENTITY_RESOLVE_WAIT_SECONDS
+        return (
+            "Managed action rule was written but Home Assistant did not register it after "
+            f"{timeout_seconds:.1f}s. Ensure configuration.yaml includes automations.yaml "
+            "(for example: automation: !include automations.yaml)."
+        )
+
+    @staticmethod
+    def _log_unregistered_rule(automation_id: str) -> None:
+        _LOGGER.warning(
+            "[managed_actions] Rule written via config API but entity did not appear after %.1fs. "
+            "Rolling back attempted write. "
+            "The integration uses the same REST API as the HA automation UI (writes to automations.yaml). "
+            "Ensure configuration.yaml includes that file (e.g. automation: !include automations.yaml). "
+            "automation_id=%s",
+            _ENTITY_RESOLVE_MAX_ATTEMPTS * _ENTITY_RESOLVE_WAIT_SECONDS,
+            automation_id,
+        )
+
     async def async_delete_rule(
         self,
         *,
@@ -845,7 +1028,8 @@ class TopomationManagedActions:
         if not config_id:
             raise ValueError("Automation id is required")
 
-        await self._call_automation_config_api("DELETE", config_id)
+        async with self._batch_write_lock:
+            await self._call_automation_config_api("DELETE", config_id)
         self._recent_rule_snapshots.pop(config_id, None)
 
     async def async_set_rule_enabled(self, *, entity_id: str, enabled: bool) -> None:
@@ -925,7 +1109,13 @@ class TopomationManagedActions:
         override that additionally forces any rule below that metadata version to
         rebuild — a sledgehammer for cases the hash cannot see (e.g. a change in how
         inputs are reconstructed). Untouched rules are never rewritten, so their
-        ``last_triggered`` (and thus daily gating) is preserved.
+        ``last_triggered`` (and thus daily gating) is preserved. Drifted rules
+        from every location are written as one batch with a single reload.
+
+        All managed rules are indexed by location in one pass over the runtime
+        ``raw_config``. Only rules that look drifted there are re-read, from
+        ``automations.yaml`` in one read, before being rewritten. Per-phase
+        timings are logged and kept for diagnostics.
         """
         if self._loc_mgr is None:
             return {"checked": 0, "rebuilt": 0, "failed": 0}
@@ -939,37 +1129,29 @@ class TopomationManagedActions:
             _LOGGER.debug("Unable to enumerate locations for managed rule rebuild", exc_info=True)
             return {"checked": 0, "rebuilt": 0, "failed": 0}
 
+        phases_ms: dict[str, float] = {}
+        started = lap_started = monotonic()
+
+        def _lap(phase: str) -> None:
+            nonlocal lap_started
+            now = monotonic()
+            phases_ms[phase] = round((now - lap_started) * 1000, 1)
+            lap_started = now
+
+        rules_by_location = self._managed_rules_by_location()
+        _lap("index")
+
+        # (location_id, location, rule, runtime raw_config or None for snapshots)
+        drifted: list[tuple[str, Any, dict[str, Any], Mapping[str, Any] | None]] = []
         for location in locations:
             location_id = str(getattr(location, "id", "") or "").strip()
             if not location_id:
                 continue
-            try:
-                rules = await self.async_list_rules(location_id)
-            except Exception:
-                failed += 1
-                _LOGGER.warning(
-                    "Failed to list managed rules during rebuild for location %s",
-                    location_id,
-                    exc_info=True,
-                )
-                continue
-
-            for rule in rules:
+            for rule, raw_config in rules_by_location.get(location_id, ()):
                 checked += 1
                 try:
-                    compose_kwargs = self._rebuild_compose_kwargs(location, rule)
-                    composed = self._compose_rule_config(**compose_kwargs)
-                    stored_hash = str(rule.get("gen_hash") or "")
-                    raw_version = rule.get("metadata_version")
-                    metadata_version = raw_version if isinstance(raw_version, int) else 0
-                    if composed.gen_hash == stored_hash and metadata_version >= min_version:
-                        continue
-                    rebuilt_rule = await self._write_composed_rule(composed)
-                    if rule.get("enabled") is False:
-                        entity_id = rebuilt_rule.get("entity_id")
-                        if isinstance(entity_id, str) and entity_id:
-                            await self.async_set_rule_enabled(entity_id=entity_id, enabled=False)
-                    rebuilt += 1
+                    if self._rule_needs_rebuild(location, rule, min_version=min_version):
+                        drifted.append((location_id, location, rule, raw_config))
                 except Exception:
                     failed += 1
                     _LOGGER.warning(
@@ -978,17 +1160,183 @@ class TopomationManagedActions:
                         location_id,
                         exc_info=True,
                     )
+        _lap("compare")
+
+        # Runtime raw_config reflects the last reload; re-read drifted rules from
+        # automations.yaml (the file the config API serves) before rewriting.
+        stored_configs = (
+            await self._async_read_automation_configs() if drifted else {}
+        )
+        stale: list[tuple[str, Mapping[str, Any], _ComposedRuleConfig]] = []
+        for location_id, location, rule, raw_config in drifted:
+            try:
+                stored_config = stored_configs.get(str(rule.get("id") or ""))
+                if raw_config is not None and isinstance(stored_config, Mapping):
+                    latest_rule = self._rule_from_config(
+                        str(rule.get("entity_id") or ""),
+                        str(rule.get("id") or ""),
+                        location_id,
+                        effective_config=stored_config,
+                        raw_config=raw_config,
+                    )
+                    if latest_rule is not None:
+                        rule = latest_rule
+                composed = self._compose_rule_config(
+                    **self._rebuild_compose_kwargs(location, rule)
+                )
+                if not self._is_rule_stale(rule, composed, min_version=min_version):
+                    continue
+                stale.append((location_id, rule, composed))
+            except Exception:
+                failed += 1
+                _LOGGER.warning(
+                    "Failed to rebuild managed rule %s for location %s",
+                    rule.get("id"),
+                    location_id,
+                    exc_info=True,
+                )
+        _lap("reread")
 
+        # All drifted rules share one automations.yaml write and one reload.
+        written = (
+            await self._write_composed_rules([composed for _, _, composed in stale])
+            if stale
+            else []
+        )
+        for (location_id, stale_rule, _composed), result in zip(stale, written, strict=True):
+            try:
+                if isinstance(result, Exception):
+                    raise result
+                if stale_rule.get("enabled") is False:
+                    entity_id = result.get("entity_id")
+                    if isinstance(entity_id, str) and entity_id:
+                        await self.async_set_rule_enabled(entity_id=entity_id, enabled=False)
+                rebuilt += 1
+            except Exception:
+                failed += 1
+                _LOGGER.warning(
+                    "Failed to rebuild managed rule %s for location %s",
+                    stale_rule.get("id"),
+                    location_id,
+                    exc_info=True,
+                )
+        _lap("write")
+
+        total_ms = round((monotonic() - started) * 1000, 1)
+        self._last_rebuild = {
+            "checked": checked,
+            "drifted": len(drifted),
+            "rebuilt": rebuilt,
+            "failed": failed,
+            "total_ms": total_ms,
+            "phases_ms": phases_ms,
+        }
         if checked:
             _LOGGER.info(
-                "Managed rule stale-rebuild checked=%d rebuilt=%d failed=%d min_version=%d",
+                "Managed rule stale-rebuild checked=%d rebuilt=%d failed=%d min_version=%d "
+                "total_ms=%.1f phases_ms=%s",
                 checked,
                 rebuilt,
                 failed,
                 min_version,
+                total_ms,
+                phases_ms,
             )
         return {"checked": checked, "rebuilt": rebuilt, "failed": failed}
 
+    def rebuild_diagnostics(self) -> dict[str, Any] | None:
+        """Return counts and per-phase timings of the latest stale-rule rebuild."""
+        return dict(self._last_rebuild) if self._last_rebuild else None
+
+    def _rule_needs_rebuild(
+        self,
+        location: Any,
+        rule: Mapping[str, Any],
+        *,
+        min_version: int,
+    ) -> bool:
+        """Recompose ``rule`` from its listed inputs and compare fingerprints."""
+        composed = self._compose_rule_config(**self._rebuild_compose_kwargs(location, rule))
+        return self._is_rule_stale(rule, composed, min_version=min_version)
+
+    @staticmethod
+    def _is_rule_stale(
+        rule: Mapping[str, Any],
+        composed: _ComposedRuleConfig,
+        *,
+        min_version: int,
+    ) -> bool:
+        stored_hash = str(rule.get("gen_hash") or "")
+        raw_version = rule.get("metadata_version")
+        metadata_version = raw_version if isinstance(raw_version, int) else 0
+        return composed.gen_hash != stored_hash or metadata_version < min_version
+
+    def _managed_rules_by_location(
+        self,
+    ) -> dict[str, list[tuple[dict[str, Any], Mapping[str, Any] | None]]]:
+        """List every managed rule in one pass over the automation entities.
+
+        Rules are built from runtime ``raw_config`` (or a just-written snapshot,
+        paired with ``None``) and keyed by location, without config API calls.
+        """
+        entity_registry = er.async_get(self.hass)
+        component = self.hass.data.get(AUTOMATION_DATA_COMPONENT)
+        self._prune_recent_rule_snapshots()
+        rules_by_location: dict[str, list[tuple[dict[str, Any], Mapping[str, Any] | None]]] = {}
+        for automation_entity in self._snapshot_automation_entities(component):
+            entity_id = getattr(automation_entity, "entity_id", None)
+            raw_config = getattr(automation_entity, "raw_config", None)
+            unique_id = getattr(automation_entity, "unique_id", None)
+            if not isinstance(entity_id, str) or not entity_id:
+                continue
+            if not isinstance(raw_config, Mapping):
+                continue
+
+            automation_id = (
+                self._resolve_automation_id(entity_registry, entity_id, raw_config, unique_id)
+                or ""
+            )
+            snapshot = self._recent_rule_snapshots.get(automation_id) if automation_id else None
+            if snapshot is not None:
+                rules_by_location.setdefault(snapshot.location_id, []).append(
+                    (self._rule_from_snapshot(entity_id, automation_id, snapshot), None)
+                )
+                continue
+
+            metadata = self._parse_metadata(raw_config.get("description"))
+            if metadata is None:
+                continue
+            rule = self._rule_from_config(
+                entity_id,
+                automation_id,
+                metadata.location_id,
+                effective_config=raw_config,
+                raw_config=raw_config,
+            )
+            if rule is not None:
+                rules_by_location.setdefault(metadata.location_id, []).append((rule, raw_config))
+
+        for rules in rules_by_location.values():
+            rules.sort(key=lambda item: str(item[0].get("name", "")))
+        return rules_by_location
+
+    async def _async_read_automation_configs(self) -> dict[str, Mapping[str, Any]]:
+        """Read automations.yaml once and index its entries by id."""
+        path = self.hass.config.path(AUTOMATION_CONFIG_PATH)
+        try:
+            async with self._batch_write_lock:
+                current = await self.hass.async_add_executor_job(_read_automation_config_file, path)
+        except Exception:
+            _LOGGER.debug(
+                "Falling back to runtime raw_config for managed rule rebuild", exc_info=True
+            )
+            return {}
+        return {
+            str(entry[CONF_ID]): entry
+            for entry in current
+            if isinstance(entry, Mapping) and entry.get(CONF_ID)
+        }
+
     @staticmethod
     def _rebuild_compose_kwargs(location: Any, rule: Mapping[str, Any]) -> dict[str, Any]:
         """Map a listed rule dict back to _compose_rule_config kwargs for rebuild."""
@@ -2489,6 +2837,46 @@ class TopomationManagedActions:
                 await asyncio.sleep(wait_seconds)
         return None
 
+    async def _resolve_created_entity_ids(
+        self,
+        automation_ids: list[str],
+        *,
+        max_attempts: int,
+        wait_seconds: float,
+    ) -> dict[str, str]:
+        """Resolve entity_ids for a batch of written automations, waiting once for all."""
+        entity_registry = er.async_get(self.hass)
+        resolved: dict[str, str] = {}
+        for attempt in range(max_attempts):
+            unresolved = [
+                automation_id for automation_id in automation_ids if automation_id not in resolved
+            ]
+            for automation_id in unresolved:
+                entity_id = entity_registry.async_get_entity_id(
+                    AUTOMATION_DOMAIN, AUTOMATION_DOMAIN, automation_id
+                )
+                if isinstance(entity_id, str) and entity_id:
+                    resolved[automation_id] = entity_id
+
+            if len(resolved) < len(automation_ids):
+                component = self.hass.data.get(AUTOMATION_DATA_COMPONENT)
+                for automation_entity in self._snapshot_automation_entities(component):
+                    unique_id = getattr(automation_entity, "unique_id", None)
+                    candidate = getattr(automation_entity, "entity_id", None)
+                    if (
+                        unique_id in automation_ids
+                        and unique_id not in resolved
+                        and isinstance(candidate, str)
+                        and candidate
+                    ):
+                        resolved[unique_id] = candidate
+
+            if len(resolved) == len(automation_ids):
+                break
+            if attempt < max_attempts - 1:
+                await asyncio.sleep(wait_seconds)
+        return resolved
+
     def _apply_topomation_grouping(
         self,
         entity_id: str,
@@ -2641,3 +3029,52 @@ class TopomationManagedActions:
         if entry is not None and entry.unique_id:
             return str(entry.unique_id)
         return ""
+
+
+def _read_automation_config_file(path: str) -> list[Any]:
+    """Return the automation list stored in ``path`` (empty when the file is missing)."""
+    current = load_yaml(path) if os.path.isfile(path) else None
+    if current is None:
+        return []
+    if not isinstance(current, list):
+        raise ValueError(f"{AUTOMATION_CONFIG_PATH} does not contain a list of automations")
+    return current
+
+
+def _update_automation_config_file(
+    path: str,
+    updates: Mapping[str, dict[str, Any] | None],
+) -> None:
+    """Upsert (or remove, for ``None``) automation configs by id in one atomic write.
+
+    Entries are written like HA's automation config editor writes them: ``id``
+    first, then the editor's key order, and ids are added to entries lacking one.
+    """
+    current = _read_automation_config_file(path)
+    pending = dict(updates)
+    data: list[Any] = []
+    for entry in current:
+        if isinstance(entry, dict) and CONF_ID not in entry:
+            entry[CONF_ID] = uuid.uuid4().hex
+        config_id = entry.get(CONF_ID) if isinstance(entry, dict) else None
+        if config_id not in pending:
+            data.append(entry)
+            continue
+        new_value = pending.pop(config_id)
+        if new_value is not None:
+            data.append(_ordered_automation_config(config_id, new_value))
+    data.extend(
+        _ordered_automation_config(config_id, new_value)
+        for config_id, new_value in pending.items()
+        if new_value is not None
+    )
+    write_utf8_file_atomic(path, yaml_dump(data))
+
+
+def _ordered_automation_config(config_id: str, new_value: Mapping[str, Any]) -> dict[str, Any]:
+    ordered: dict[str, Any] = {CONF_ID: config_id}
+    for key in _AUTOMATION_CONFIG_KEY_ORDER:
+        if key in new_value:
+            ordered[key] = new_value[key]
+    ordered.update(new_value)
+    return ordered
@@ -0,0 +1,490 @@
+"""Debounced, dirty-tracked writers for the topology config and runtime-state stores.
+
+Topology config (locations, hierarchy, module configs, adjacency) changes rarely;
+runtime state (occupancy, recent activity) changes constantly. Each store gets
+its own dirty flag and debounce timer so an occupancy change never re-serializes
+the topology, and a payload identical to the last write is skipped entirely.
+
+With the optional state journal, occupancy and recent-activity changes are not
+written to ``topomation.state`` at all. Each change appends one small record per
+changed location to an append-only JSONL file::
+
+    {"g": 3}
+    {"m": "occupancy", "l": "kitchen", "s": {"is_occupied": true, ...}}
+    {"m": "occupancy", "l": "pantry", "s": null}
+
+``s`` is the location's entry from the module's ``dump_state()`` (``null`` once
+the module no longer holds state for it), so replay is an ordered upsert on top
+of the snapshot. Runtime events name the location that changed, and only those
+locations are serialized: through the module's ``dump_location_state()`` when it
+has one, otherwise from a single ``dump_state()`` per flush. Compaction folds the journal into the snapshot when the file
+grows past a size threshold, when the last compaction is older than a time
+threshold, and on startup, shutdown and unload. The snapshot records the
+generation it was written at and the journal header repeats it; a journal whose
+generation does not match was already folded in and is ignored on replay.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from collections import deque
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.json import json_bytes, json_dumps
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    AUTOSAVE_DEBOUNCE_SECONDS,
+    STORAGE_KEY_CONFIG,
+    STORAGE_KEY_STATE,
+    STORAGE_VERSION,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+_BYTES_WINDOW_SECONDS = 3600.0
+
+# Modules whose runtime state is journaled instead of rewritten as a snapshot.
+JOURNAL_MODULE_IDS = ("occupancy", "recent_activity")
+JOURNAL_GENERATION_KEY = "journal_generation"
+JOURNAL_FILENAME = f"{STORAGE_KEY_STATE}.journal"
+JOURNAL_COMPACT_BYTES = 256 * 1024
+JOURNAL_COMPACT_INTERVAL_SECONDS = 3600.0
+
+
+@dataclass(slots=True)
+class _WriteStats:
+    """Write counters for one store; bytes are the serialized payload size."""
+
+    writes: int = 0
+    skipped_unchanged: int = 0
+    bytes_total: int = 0
+    # (monotonic time, bytes) per write inside the rolling one-hour window.
+    recent: deque[tuple[float, int]] = field(default_factory=deque)
+
+    def record(self, size: int) -> None:
+        """Count one write of ``size`` bytes."""
+        self.writes += 1
+        self.bytes_total += size
+        self.recent.append((time.monotonic(), size))
+
+    def bytes_last_hour(self) -> int:
+        """Return bytes written in the last hour."""
+        cutoff = time.monotonic() - _BYTES_WINDOW_SECONDS
+        while self.recent and self.recent[0][0] < cutoff:
+            self.recent.popleft()
+        return sum(size for _, size in self.recent)
+
+    def as_dict(self) -> dict[str, int]:
+        """Return counters for diagnostics."""
+        return {
+            "writes": self.writes,
+            "skipped_unchanged": self.skipped_unchanged,
+            "bytes_total": self.bytes_total,
+            "bytes_last_hour": self.bytes_last_hour(),
+        }
+
+
+class _DebouncedStoreWriter:
+    """Write one Store after a debounce window, only when marked dirty and changed."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        name: str,
+        store: Store,
+        build_payload: Callable[[], dict[str, Any]],
+        delay: float,
+    ) -> None:
+        self.hass = hass
+        self.name = name
+        self.stats = _WriteStats()
+        self._store = store
+        self._build_payload = build_payload
+        self._delay = delay
+        self._dirty = False
+        self._unsub: CALLBACK_TYPE | None = None
+        self._running = False
+        self._again = False
+        self._last_digest: bytes | None = None
+
+    @callback
+    def mark_dirty(self, reason: str) -> None:
+        """Mark the store dirty and schedule a debounced write."""
+        self._dirty = True
+        if self._unsub is not None:
+            return
+
+        _LOGGER.debug("Scheduling Topomation %s autosave (%s)", self.name, reason)
+
+        @callback
+        def _handle_autosave(_: Any) -> None:
+            self._unsub = None
+            self.hass.async_create_task(self._async_run())
+
+        self._unsub = async_call_later(self.hass, self._delay, _handle_autosave)
+
+    @callback
+    def cancel(self) -> None:
+        """Cancel a pending debounced write (the dirty flag is kept)."""
+        if self._unsub is None:
+            return
+        self._unsub()
+        self._unsub = None
+
+    async def _async_run(self) -> None:
+        if self._running:
+            self._again = True
+            return
+
+        self._running = True
+        try:
+            await self.async_flush()
+        except Exception:  # pragma: no cover - defensive logging
+            _LOGGER.exception("Debounced %s autosave failed", self.name)
+        finally:
+            self._running = False
+            if self._again:
+                self._again = False
+                self.mark_dirty("coalesced")
+
+    def build_payload(self) -> dict[str, Any]:
+        """Return the payload this writer would store now."""
+        return self._build_payload()
+
+    async def async_flush(self, *, force: bool = False) -> None:
+        """Write now when dirty (or ``force``), skipping payloads identical to the last write."""
+        if not (self._dirty or force):
+            return
+        self._dirty = False
+        await self.async_write(self._build_payload())
+
+    async def async_write(self, payload: dict[str, Any]) -> None:
+        """Write ``payload`` now unless it is identical to the last write."""
+        encoded = json_bytes(payload)
+        digest = hashlib.blake2b(encoded, digest_size=16).digest()
+        if digest == self._last_digest:
+            self.stats.skipped_unchanged += 1
+            return
+
+        await self._store.async_save(payload)
+        self._last_digest = digest
+        self.stats.record(len(encoded))
+
+
+class StateJournal:
+    """Append per-location runtime-state deltas and fold them into the state snapshot."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        path: Path,
+        state_writer: _DebouncedStoreWriter,
+        modules: Mapping[str, Any],
+        *,
+        compact_bytes: int = JOURNAL_COMPACT_BYTES,
+        compact_interval: float = JOURNAL_COMPACT_INTERVAL_SECONDS,
+    ) -> None:
+        """Initialize the journal; call ``async_replay`` then ``async_compact`` on startup."""
+        self.hass = hass
+        self.path = path
+        self.generation = 0
+        self.stats = _WriteStats()
+        self.records_appended = 0
+        self.compactions = 0
+        self._state_writer = state_writer
+        self._modules = modules
+        self._compact_bytes = compact_bytes
+        self._compact_interval = compact_interval
+        # Last journaled state per module and location; unchanged entries are skipped.
+        self._view: dict[str, dict[str, Any]] = {}
+        # Dirty locations per module; ``None`` means the whole module is dirty.
+        self._dirty: dict[str, set[str] | None] = {}
+        self._buffer: list[str] = []
+        self._size = 0
+        self._lock = asyncio.Lock()
+        self._flush_scheduled = False
+        self._compacted_at = time.monotonic()
+
+    async def async_replay(self, snapshot: Mapping[str, Any] | None) -> dict[str, Any]:
+        """Return ``snapshot`` with journal records of the same generation applied."""
+        data = dict(snapshot or {})
+        generation = data.pop(JOURNAL_GENERATION_KEY, 0)
+        self.generation = generation if isinstance(generation, int) else 0
+
+        header, records = await self.hass.async_add_executor_job(self._read)
+        if not records:
+            return data
+        if header.get("g") != self.generation:
+            _LOGGER.debug(
+                "Ignoring state journal generation %s (snapshot generation %s)",
+                header.get("g"),
+                self.generation,
+            )
+            return data
+
+        for record in records:
+            module_id = record.get("m")
+            location_id = record.get("l")
+            if not isinstance(module_id, str) or not isinstance(location_id, str):
+                continue
+            module_state = data.get(module_id)
+            module_state = dict(module_state) if isinstance(module_state, Mapping) else {}
+            if record.get("s") is None:
+                module_state.pop(location_id, None)
+            else:
+                module_state[location_id] = record["s"]
+            data[module_id] = module_state
+        _LOGGER.info("Replayed %d state journal record(s)", len(records))
+        return data
+
+    def _read(self) -> tuple[dict[str, Any], list[dict[str, Any]]]:
+        """Read the journal file (runs in the executor)."""
+        header: dict[str, Any] = {}
+        records: list[dict[str, Any]] = []
+        try:
+            handle = self.path.open(encoding="utf-8")
+        except FileNotFoundError:
+            return header, records
+        with handle:
+            for line in handle:
+                try:
+                    payload = json.loads(line)
+                except ValueError:
+                    # A torn trailing line from a crash mid-append.
+                    _LOGGER.debug("Skipping unreadable state journal line in %s", self.path)
+                    continue
+                if not isinstance(payload, dict):
+                    continue
+                if "g" in payload:
+                    header = payload
+                else:
+                    records.append(payload)
+        return header, records
+
+    @callback
+    def async_record(self, module_id: str, location_id: str | None = None) -> None:
+        """Mark ``location_id`` (or all of ``module_id``) dirty for the deferred flush."""
+        if module_id not in self._modules:
+            return
+        # Bursts of occupancy/recent-activity events collapse into one record per location.
+        if location_id is None:
+            self._dirty[module_id] = None
+        else:
+            dirty = self._dirty.setdefault(module_id, set())
+            if dirty is not None:
+                dirty.add(location_id)
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            self.hass.async_create_task(self._async_flush())
+
+    def _collect_dirty(self) -> None:
+        """Buffer a record for every dirty location whose state changed."""
+        dirty, self._dirty = self._dirty, {}
+        for module_id, location_ids in sorted(dirty.items()):
+            module = self._modules.get(module_id)
+            if module is None:
+                continue
+            try:
+                states = self._dirty_states(module_id, module, location_ids)
+            except Exception:  # pragma: no cover - defensive adapter boundary
+                _LOGGER.exception("Failed to dump %s state for the journal", module_id)
+                continue
+            if states is None:
+                continue
+
+            view = self._view.setdefault(module_id, {})
+            lines: list[str] = []
+            for location_id, state in states.items():
+                if state is None:
+                    if view.pop(location_id, None) is None:
+                        continue
+                elif view.get(location_id) == state:
+                    continue
+                else:
+                    view[location_id] = state
+                lines.append(json_dumps({"m": module_id, "l": location_id, "s": state}))
+            self._buffer.extend(lines)
+            self.records_appended += len(lines)
+
+    def _dirty_states(
+        self, module_id: str, module: Any, location_ids: set[str] | None
+    ) -> dict[str, Any] | None:
+        """Return the current state (``None`` when absent) of each dirty location."""
+        dump_location_state = getattr(module, "dump_location_state", None)
+        if location_ids is not None and callable(dump_location_state):
+            return {
+                location_id: dump_location_state(location_id)
+                for location_id in sorted(location_ids)
+            }
+
+        current = module.dump_state()
+        if not isinstance(current, dict):
+            return None
+        if location_ids is None:
+            previous = self._view.get(module_id, {})
+            return {**current, **dict.fromkeys(sorted(previous.keys() - current.keys()))}
+        return {location_id: current.get(location_id) for location_id in sorted(location_ids)}
+
+    async def _async_flush(self) -> None:
+        """Append records for dirty modules, then compact when a threshold is crossed."""
+        # Tasks may start eagerly; yield once so a same-tick burst shares one dump.
+        await asyncio.sleep(0)
+        async with self._lock:
+            self._flush_scheduled = False
+            self._collect_dirty()
+            if not self._buffer:
+                return
+            lines, self._buffer = self._buffer, []
+            try:
+                written = await self.hass.async_add_executor_job(self._write, lines, "a")
+            except OSError as err:
+                _LOGGER.error("Failed to append state journal %s: %s", self.path, err)
+                self._buffer[:0] = lines
+                return
+            self._size += written
+            self.stats.record(written)
+
+        if (
+            self._size >= self._compact_bytes
+            or time.monotonic() - self._compacted_at >= self._compact_interval
+        ):
+            await self.async_compact()
+
+    async def async_compact(self) -> None:
+        """Fold the journal into a new ``topomation.state`` snapshot and truncate it."""
+        async with self._lock:
+            payload = self._state_writer.build_payload()
+            self._view = {
+                module_id: dict(payload[module_id])
+                for module_id in JOURNAL_MODULE_IDS
+                if isinstance(payload.get(module_id), dict)
+            }
+            # Records already buffered, and dirty locations, are covered by this snapshot.
+            pending, self._buffer = self._buffer, []
+            self._dirty.clear()
+            payload[JOURNAL_GENERATION_KEY] = self.generation + 1
+            try:
+                await self._state_writer.async_write(payload)
+                header = json_dumps({"g": self.generation + 1})
+                self._size = await self.hass.async_add_executor_job(self._write, [header], "w")
+            except Exception:
+                _LOGGER.exception("State journal compaction failed")
+                self._buffer[:0] = pending
+                return
+            self.generation += 1
+            self.compactions += 1
+            self._compacted_at = time.monotonic()
+            # Records buffered while the snapshot was saved belong to the new generation.
+            if self._buffer and not self._flush_scheduled:
+                self._flush_scheduled = True
+                self.hass.async_create_task(self._async_flush())
+
+    def _write(self, lines: list[str], mode: str) -> int:
+        """Write lines to the journal file and return bytes written (runs in the executor)."""
+        data = ("\n".join(lines) + "\n").encode("utf-8")
+        with self.path.open(f"{mode}b") as handle:
+            handle.write(data)
+        return len(data)
+
+    def diagnostics(self) -> dict[str, Any]:
+        """Return journal counters."""
+        return {
+            **self.stats.as_dict(),
+            "generation": self.generation,
+            "records_appended": self.records_appended,
+            "compactions": self.compactions,
+            "size_bytes": self._size,
+        }
+
+
+class TopomationPersistence:
+    """Separate debounced writers for ``topomation.config`` and ``topomation.state``."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        *,
+        config_payload: Callable[[], dict[str, Any]],
+        state_payload: Callable[[], dict[str, Any]],
+        delay: float = AUTOSAVE_DEBOUNCE_SECONDS,
+    ) -> None:
+        """Initialize writers around payload builders for each store."""
+        self.hass = hass
+        self.config = _DebouncedStoreWriter(
+            hass,
+            "config",
+            Store(hass, STORAGE_VERSION, STORAGE_KEY_CONFIG),
+            config_payload,
+            delay,
+        )
+        self.state = _DebouncedStoreWriter(
+            hass,
+            "state",
+            Store(hass, STORAGE_VERSION, STORAGE_KEY_STATE),
+            state_payload,
+            delay,
+        )
+        self.journal: StateJournal | None = None
+
+    def enable_journal(self, modules: Mapping[str, Any], path: Path | None = None) -> StateJournal:
+        """Journal occupancy/recent-activity changes instead of rewriting the snapshot."""
+        self.journal = StateJournal(
+            self.hass,
+            path or Path(self.hass.config.path(".storage", JOURNAL_FILENAME)),
+            self.state,
+            modules,
+        )
+        return self.journal
+
+    @callback
+    def schedule_config(self, reason: str = "unspecified") -> None:
+        """Persist topology config after a topology or module-config mutation."""
+        self.config.mark_dirty(reason)
+
+    @callback
+    def schedule_state(
+        self,
+        reason: str = "unspecified",
+        module_id: str | None = None,
+        location_id: str | None = None,
+    ) -> None:
+        """Persist module runtime state after a runtime change in ``module_id``."""
+        if self.journal is not None and module_id in JOURNAL_MODULE_IDS:
+            self.journal.async_record(module_id, location_id)
+            return
+        self.state.mark_dirty(reason)
+
+    @callback
+    def cancel(self) -> None:
+        """Cancel pending debounced writes."""
+        self.config.cancel()
+        self.state.cancel()
+
+    async def async_save_all(self) -> None:
+        """Write both stores now (shutdown/unload); unchanged payloads are still skipped."""
+        self.cancel()
+        await self.config.async_flush(force=True)
+        if self.journal is not None:
+            await self.journal.async_compact()
+        else:
+            await self.state.async_flush(force=True)
+
+    def diagnostics(self) -> dict[str, Any]:
+        """Return per-store write counters."""
+        diagnostics = {
+            "config": self.config.stats.as_dict(),
+            "state": self.state.stats.as_dict(),
+        }
+        if self.journal is not None:
+            diagnostics["journal"] = self.journal.diagnostics()
+        return diagnostics
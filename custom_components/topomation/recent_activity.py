@@ -2,8 +2,10 @@
 
 from __future__ import annotations
 
+import heapq
 import logging
-from collections.abc import Mapping
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
 from typing import Any
 
@@ -15,6 +17,44 @@ MODULE_ID = "recent_activity"
 EVENT_RECENT_ACTIVITY_CHANGED = "recent_activity.changed"
 DEFAULT_ACTIVITY_WINDOW_HOURS = 48
 
+# Sentinel: derive a pushed deadline from the stored property state.
+_FROM_STATE: Any = object()
+# Topology events that can change which properties sit above a location.
+_ANCESTOR_CACHE_EVENT_TYPES = (
+    "location.created",
+    "location.deleted",
+    "location.parent_changed",
+)
+# Rebuild the expiry heap once stale entries outnumber live records by this factor.
+_EXPIRY_HEAP_COMPACT_FACTOR = 4
+
+
+def _isoformat(value: datetime | None) -> str | None:
+    return value.isoformat() if value is not None else None
+
+
+@dataclass(slots=True)
+class _ActivityRecord:
+    """Runtime recent-activity state for one property, with UTC datetimes."""
+
+    active: bool = False
+    last_activity_at: datetime | None = None
+    active_until: datetime | None = None
+    reason: str | None = None
+    source_location_id: str | None = None
+    source_id: str | None = None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the persisted/event form, with ISO timestamps."""
+        return {
+            "active": self.active,
+            "last_activity_at": _isoformat(self.last_activity_at),
+            "active_until": _isoformat(self.active_until),
+            "reason": self.reason,
+            "source_location_id": self.source_location_id,
+            "source_id": self.source_id,
+        }
+
 
 class TopomationRecentActivityModule:
     """Track property-level recent human/use activity.
@@ -22,6 +62,15 @@ class TopomationRecentActivityModule:
     This is deliberately separate from occupancy. Occupancy answers "probably
     occupied now"; recent activity answers "this property has qualifying use
     evidence within the configured window".
+
+    Runtime state is one ``_ActivityRecord`` per property plus a min-heap of
+    ``(active_until, property_id)`` expiries with lazy invalidation; timestamps
+    are converted to ISO strings only for persistence and event payloads.
+
+    The occupancy hot path reads two caches: location -> ancestor property ids,
+    cleared on topology events and ``_meta`` edits (``invalidate_ancestor_cache``),
+    and property -> resolved activity config, keyed on the identity of the
+    stored config dict so any ``set_module_config`` replacement is picked up.
     """
 
     CURRENT_CONFIG_VERSION = 1
@@ -30,13 +79,24 @@ class TopomationRecentActivityModule:
         """Initialize recent-activity state."""
         self._bus: EventBus | None = None
         self._loc_mgr: Any | None = None
-        self._state: dict[str, dict[str, Any]] = {}
+        self._state: dict[str, _ActivityRecord] = {}
+        self._expiries: list[tuple[datetime, str]] = []
+        self._deadline_callback: Callable[[str, datetime | None], None] | None = None
+        self._ancestor_properties: dict[str, tuple[str, ...]] = {}
+        self._resolved_configs: dict[str, tuple[Any, dict[str, Any]]] = {}
 
     def attach(self, bus: EventBus, loc_mgr: Any) -> None:
         """Attach to the kernel event bus and location manager."""
         self._bus = bus
         self._loc_mgr = loc_mgr
         bus.subscribe(self._on_occupancy_changed, EventFilter(event_type="occupancy.changed"))
+        for event_type in _ANCESTOR_CACHE_EVENT_TYPES:
+            bus.subscribe(self._on_topology_changed, EventFilter(event_type=event_type))
+        self.invalidate_ancestor_cache()
+
+    def invalidate_ancestor_cache(self) -> None:
+        """Forget cached ancestor properties, e.g. after a ``_meta`` type edit."""
+        self._ancestor_properties.clear()
 
     def default_config(self) -> dict[str, Any]:
         """Return default recent-activity config."""
@@ -46,77 +106,80 @@ class TopomationRecentActivityModule:
             "include_descendant_occupancy": True,
         }
 
+    def set_deadline_callback(
+        self, deadline_callback: Callable[[str, datetime | None], None] | None
+    ) -> None:
+        """Push per-property expiry deadlines to the coordinator instead of being polled."""
+        self._deadline_callback = deadline_callback
+        for property_id in self._state:
+            self._push_deadline(property_id)
+
     def dump_state(self) -> dict[str, Any]:
         """Persist recent-activity runtime state."""
-        return {location_id: dict(state) for location_id, state in self._state.items()}
+        return {location_id: record.as_dict() for location_id, record in self._state.items()}
+
+    def dump_location_state(self, location_id: str) -> dict[str, Any] | None:
+        """Persist one property's runtime state, or None when it holds none."""
+        record = self._state.get(location_id)
+        return record.as_dict() if record is not None else None
 
     def restore_state(self, payload: Any) -> None:
         """Restore persisted recent-activity runtime state."""
         if not isinstance(payload, Mapping):
             return
 
-        restored: dict[str, dict[str, Any]] = {}
+        restored: dict[str, _ActivityRecord] = {}
         for location_id, raw_state in payload.items():
             if not isinstance(location_id, str) or not isinstance(raw_state, Mapping):
                 continue
-            normalized = self._normalize_state(raw_state)
-            if normalized:
-                restored[location_id] = normalized
+            restored[location_id] = self._record_from_payload(raw_state)
+        for location_id in self._state.keys() - restored.keys():
+            self._push_deadline(location_id, None)
         self._state = restored
+        self._rebuild_expiries()
+        for location_id in restored:
+            self._push_deadline(location_id)
 
     def get_next_timeout(self) -> datetime | None:
         """Return the next activity expiry that should wake the coordinator."""
-        next_timeout: datetime | None = None
-        now = datetime.now(UTC)
-        for property_id, state in self._state.items():
-            if not self._property_activity_config(property_id).get("enabled", False):
-                continue
-            if not bool(state.get("active", False)):
-                continue
-            active_until = self._parse_datetime(state.get("active_until"))
-            if active_until is None or active_until <= now:
-                return now
-            if next_timeout is None or active_until < next_timeout:
-                next_timeout = active_until
-        return next_timeout
+        self._drop_stale_expiries()
+        return self._expiries[0][0] if self._expiries else None
 
     def check_timeouts(self, now: datetime) -> None:
         """Expire active properties whose activity window elapsed."""
         now_utc = now.astimezone(UTC) if now.tzinfo else now.replace(tzinfo=UTC)
-        for property_id, state in list(self._state.items()):
-            if not bool(state.get("active", False)):
+        while self._expiries and self._expiries[0][0] <= now_utc:
+            expiry = heapq.heappop(self._expiries)
+            if not self._expiry_is_live(expiry):
                 continue
-            active_until = self._parse_datetime(state.get("active_until"))
-            if active_until is None or active_until > now_utc:
-                continue
-            next_state = dict(state)
-            next_state["active"] = False
-            self._state[property_id] = next_state
+            property_id = expiry[1]
+            self._state[property_id].active = False
+            self._push_deadline(property_id, None)
             self._publish_changed(property_id, previous_active=True, reason="expired")
 
     def on_location_config_changed(self, location_id: str, config: Mapping[str, Any]) -> None:
         """React to recent-activity config edits."""
         del config
+        self._resolved_configs.pop(location_id, None)
         if self._location_type_by_id(location_id) != "property":
-            self._state.pop(location_id, None)
+            if self._state.pop(location_id, None) is not None:
+                self._push_deadline(location_id, None)
             return
 
-        state = self._state.get(location_id)
-        if state is None:
-            self._state[location_id] = self._empty_state()
+        if location_id not in self._state:
+            self._state[location_id] = _ActivityRecord()
+        self._push_deadline(location_id)
         self._publish_changed(location_id, previous_active=None, reason="config_changed")
 
     def get_state(self, property_id: str) -> dict[str, Any]:
         """Return normalized recent-activity state for one property."""
-        state = self._normalize_state(self._state.get(property_id, {})) or self._empty_state()
+        record = self._state.get(property_id) or _ActivityRecord()
         config = self._property_activity_config(property_id)
         enabled = bool(config.get("enabled", False))
-        active_until = self._parse_datetime(state.get("active_until"))
-        now = datetime.now(UTC)
-        active = enabled and bool(state.get("active", False)) and active_until is not None and active_until > now
+        active = enabled and self._record_is_active(record, datetime.now(UTC))
 
         return {
-            **state,
+            **record.as_dict(),
             "enabled": enabled,
             "active": active,
             "recently_active": active,
@@ -145,16 +208,21 @@ class TopomationRecentActivityModule:
             return
 
         now_utc = (now or datetime.now(UTC)).astimezone(UTC)
-        previous_active = bool(self.get_state(property_id).get("active", False))
+        record = self._state.get(property_id)
+        previous_active = record is not None and self._record_is_active(
+            record, datetime.now(UTC)
+        )
         active_until = now_utc + timedelta(hours=self._activity_window_hours(config))
-        self._state[property_id] = {
-            "active": True,
-            "last_activity_at": now_utc.isoformat(),
-            "active_until": active_until.isoformat(),
-            "reason": reason,
-            "source_location_id": source_location_id,
-            "source_id": source_id,
-        }
+        self._state[property_id] = _ActivityRecord(
+            active=True,
+            last_activity_at=now_utc,
+            active_until=active_until,
+            reason=reason,
+            source_location_id=source_location_id,
+            source_id=source_id,
+        )
+        self._push_expiry(active_until, property_id)
+        self._push_deadline(property_id, active_until)
         self._publish_changed(property_id, previous_active=previous_active, reason=reason)
 
     def _on_occupancy_changed(self, event: Event) -> None:
@@ -179,33 +247,48 @@ class TopomationRecentActivityModule:
                 now=event.timestamp,
             )
 
-    def _ancestor_property_ids(self, location_id: str) -> list[str]:
+    def _on_topology_changed(self, event: Event) -> None:
+        self.invalidate_ancestor_cache()
+        if event.type == "location.deleted" and event.location_id:
+            self._resolved_configs.pop(event.location_id, None)
+
+    def _ancestor_property_ids(self, location_id: str) -> tuple[str, ...]:
+        cached = self._ancestor_properties.get(location_id)
+        if cached is not None:
+            return cached
         if self._loc_mgr is None:
-            return []
+            return ()
         try:
             ancestors = list(self._loc_mgr.ancestors_of(location_id))
         except Exception:  # pragma: no cover - defensive adapter boundary
             _LOGGER.debug("Failed to read ancestors for %s", location_id, exc_info=True)
-            return []
+            return ()
 
-        return [
+        property_ids = tuple(
             str(getattr(ancestor, "id", ""))
             for ancestor in ancestors
             if self._location_type(ancestor) == "property"
-        ]
+        )
+        self._ancestor_properties[location_id] = property_ids
+        return property_ids
 
     def _property_activity_config(self, property_id: str) -> dict[str, Any]:
+        """Return merged activity config; treat the result as read-only."""
         if self._loc_mgr is None:
             return self.default_config()
         location = self._loc_mgr.get_location(property_id)
         if location is None:
             return self.default_config()
         modules = getattr(location, "modules", {}) or {}
-        config = modules.get(MODULE_ID, {}) if isinstance(modules, Mapping) else {}
-        if not isinstance(config, Mapping):
-            config = {}
+        raw_config = modules.get(MODULE_ID) if isinstance(modules, Mapping) else None
+        cached = self._resolved_configs.get(property_id)
+        if cached is not None and cached[0] is raw_config:
+            return cached[1]
+
         merged = self.default_config()
-        merged.update(dict(config))
+        if isinstance(raw_config, Mapping):
+            merged.update(dict(raw_config))
+        self._resolved_configs[property_id] = (raw_config, merged)
         return merged
 
     def _location_type_by_id(self, location_id: str) -> str:
@@ -243,29 +326,56 @@ class TopomationRecentActivityModule:
         return parsed.astimezone(UTC) if parsed.tzinfo else parsed.replace(tzinfo=UTC)
 
     @classmethod
-    def _normalize_state(cls, raw_state: Mapping[str, Any]) -> dict[str, Any]:
-        last_activity_at = cls._parse_datetime(raw_state.get("last_activity_at"))
+    def _record_from_payload(cls, raw_state: Mapping[str, Any]) -> _ActivityRecord:
+        """Build a record from persisted state (ISO strings or datetimes)."""
         active_until = cls._parse_datetime(raw_state.get("active_until"))
-        state: dict[str, Any] = {
-            "active": bool(raw_state.get("active", False)),
-            "last_activity_at": last_activity_at.isoformat() if last_activity_at else None,
-            "active_until": active_until.isoformat() if active_until else None,
-        }
+        optional: dict[str, str | None] = {}
         for key in ("reason", "source_location_id", "source_id"):
             value = raw_state.get(key)
-            state[key] = str(value).strip() if isinstance(value, str) and value.strip() else None
-        return state
+            optional[key] = value.strip() if isinstance(value, str) and value.strip() else None
+        return _ActivityRecord(
+            # Without an expiry an "active" record could never lapse; get_state
+            # already reported it inactive.
+            active=bool(raw_state.get("active", False)) and active_until is not None,
+            last_activity_at=cls._parse_datetime(raw_state.get("last_activity_at")),
+            active_until=active_until,
+            **optional,
+        )
 
     @staticmethod
-    def _empty_state() -> dict[str, Any]:
-        return {
-            "active": False,
-            "last_activity_at": None,
-            "active_until": None,
-            "reason": None,
-            "source_location_id": None,
-            "source_id": None,
-        }
+    def _record_is_active(record: _ActivityRecord, now: datetime) -> bool:
+        return record.active and record.active_until is not None and record.active_until > now
+
+    def _push_expiry(self, active_until: datetime, property_id: str) -> None:
+        heapq.heappush(self._expiries, (active_until, property_id))
+        if len(self._expiries) > _EXPIRY_HEAP_COMPACT_FACTOR * len(self._state) + 64:
+            self._rebuild_expiries()
+
+    def _rebuild_expiries(self) -> None:
+        self._expiries = [
+            (record.active_until, property_id)
+            for property_id, record in self._state.items()
+            if record.active and record.active_until is not None
+        ]
+        heapq.heapify(self._expiries)
+
+    def _expiry_is_live(self, expiry: tuple[datetime, str]) -> bool:
+        active_until, property_id = expiry
+        record = self._state.get(property_id)
+        return record is not None and record.active and record.active_until == active_until
+
+    def _drop_stale_expiries(self) -> None:
+        while self._expiries and not self._expiry_is_live(self._expiries[0]):
+            heapq.heappop(self._expiries)
+
+    def _push_deadline(self, property_id: str, deadline: Any = _FROM_STATE) -> None:
+        """Report one property's expiry (``None`` clears it); derived from state if omitted."""
+        if self._deadline_callback is None:
+            return
+        if deadline is _FROM_STATE:
+            record = self._state.get(property_id)
+            deadline = record.active_until if record is not None and record.active else None
+        self._deadline_callback(property_id, deadline)
 
     def _publish_changed(
         self,
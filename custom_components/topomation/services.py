@@ -3,18 +3,29 @@
 from __future__ import annotations
 
 import logging
+from pathlib import Path
 from typing import TYPE_CHECKING
 
 import voluptuous as vol
 from homeassistant.core import HomeAssistant, ServiceCall, callback
 
 from .const import DOMAIN
+from .state_capture import CAPTURE_DIRECTORY, DEFAULT_CAPTURE_FILENAME
 
 if TYPE_CHECKING:
     pass
 
 _LOGGER = logging.getLogger(__name__)
-SERVICE_NAMES = ("trigger", "clear", "vacate", "lock", "unlock", "unlock_all", "vacate_area")
+SERVICE_NAMES = (
+    "trigger",
+    "clear",
+    "vacate",
+    "lock",
+    "unlock",
+    "unlock_all",
+    "vacate_area",
+    "capture_state_stream",
+)
 LOCK_MODES = ("freeze", "block_occupied", "block_vacant")
 LOCK_SCOPES = ("self", "subtree")
 
@@ -78,6 +89,17 @@ SERVICE_VACATE_AREA_SCHEMA = vol.Schema(
     }
 )
 
+SERVICE_CAPTURE_STATE_STREAM_SCHEMA = vol.Schema(
+    {
+        vol.Required("enabled"): bool,
+        # Plain .jsonl file name only; captures are written under <config>/topomation_captures.
+        vol.Optional("filename", default=DEFAULT_CAPTURE_FILENAME): vol.Match(
+            r"^[\w-][\w.-]*\.jsonl$"
+        ),
+        vol.Optional("entry_id"): str,
+    }
+)
+
 
 def _resolve_kernel(hass: HomeAssistant, call: ServiceCall) -> dict[str, object] | None:
     """Resolve integration runtime data for a service call."""
@@ -338,6 +360,26 @@ def async_register_services(hass: HomeAssistant) -> None:
         except Exception as err:
             _LOGGER.error("Failed to vacate area: %s", err, exc_info=True)
 
+    async def handle_capture_state_stream(call: ServiceCall) -> None:
+        """Handle capture_state_stream service call."""
+        kernel = _resolve_kernel(hass, call)
+        if kernel is None:
+            return
+
+        event_bridge = kernel.get("event_bridge")
+        if event_bridge is None:
+            _LOGGER.warning("Event bridge not loaded")
+            return
+
+        if call.data["enabled"]:
+            path = Path(hass.config.path(CAPTURE_DIRECTORY, call.data["filename"]))
+            try:
+                await event_bridge.async_start_capture(path)
+            except FileExistsError as err:
+                _LOGGER.error("Refusing to start state capture: %s", err)
+        else:
+            await event_bridge.async_stop_capture()
+
     # Register services
     hass.services.async_register(
         DOMAIN,
@@ -388,10 +430,15 @@ def async_register_services(hass: HomeAssistant) -> None:
         schema=SERVICE_VACATE_AREA_SCHEMA,
     )
 
-    _LOGGER.info(
-        "Services registered: trigger, clear, vacate, lock, unlock, unlock_all, vacate_area"
+    hass.services.async_register(
+        DOMAIN,
+        "capture_state_stream",
+        handle_capture_state_stream,
+        schema=SERVICE_CAPTURE_STATE_STREAM_SCHEMA,
     )
 
+    _LOGGER.info("Services registered: %s", ", ".join(SERVICE_NAMES))
+
 
 def async_unregister_services(hass: HomeAssistant) -> None:
     """Unregister Topomation services."""
@@ -0,0 +1,75 @@
+"""Per-phase timing for ``async_setup_entry``."""
+
+from __future__ import annotations
+
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+from .const import DEFAULT_STARTUP_BUDGET_SECONDS
+
+_LOGGER = logging.getLogger(__name__)
+
+# Phases listed in the over-budget warning.
+_SLOWEST_PHASES_LOGGED = 3
+
+
+@dataclass(slots=True)
+class StartupTimer:
+    """Record setup phases as consecutive laps of a monotonic clock."""
+
+    budget_seconds: float = DEFAULT_STARTUP_BUDGET_SECONDS
+    phases: dict[str, float] = field(default_factory=dict)
+    total_seconds: float | None = None
+    _started: float = field(init=False)
+    _lap_started: float | None = field(init=False, default=None)
+
+    def __post_init__(self) -> None:
+        self._started = time.monotonic()
+
+    def lap(self, phase: str) -> None:
+        """Close ``phase``: it covers the time since the previous lap (or start)."""
+        now = time.monotonic()
+        started = self._started if self._lap_started is None else self._lap_started
+        self.phases[phase] = self.phases.get(phase, 0.0) + (now - started)
+        self._lap_started = now
+
+    def finish(self, entry_id: str) -> float:
+        """Stop the clock and warn when setup exceeded the budget."""
+        self.total_seconds = time.monotonic() - self._started
+        if self.total_seconds > self.budget_seconds:
+            slowest = sorted(self.phases.items(), key=lambda item: item[1], reverse=True)
+            _LOGGER.warning(
+                "Topomation setup for entry %s took %.2fs (budget %.2fs); slowest phases: %s",
+                entry_id,
+                self.total_seconds,
+                self.budget_seconds,
+                ", ".join(
+                    f"{phase}={seconds * 1000:.0f}ms"
+                    for phase, seconds in slowest[:_SLOWEST_PHASES_LOGGED]
+                ),
+            )
+        else:
+            _LOGGER.debug(
+                "Topomation setup for entry %s took %.2fs", entry_id, self.total_seconds
+            )
+        return self.total_seconds
+
+    @property
+    def over_budget(self) -> bool:
+        """Return True when the finished setup exceeded the budget."""
+        return self.total_seconds is not None and self.total_seconds > self.budget_seconds
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return phase timings in milliseconds, in phase order."""
+        return {
+            "total_ms": (
+                round(self.total_seconds * 1000, 1) if self.total_seconds is not None else None
+            ),
+            "budget_ms": round(self.budget_seconds * 1000, 1),
+            "over_budget": self.over_budget,
+            "phases_ms": {
+                phase: round(seconds * 1000, 1) for phase, seconds in self.phases.items()
+            },
+        }
@@ -0,0 +1,190 @@
+"""Record EventBridge state_changed streams for offline replay.
+
+A capture is a JSONL file: one header line holding the topology config the
+stream was recorded against (same shape as the persisted config store), then
+one compact line per state change that reached the bridge::
+
+    {"t": 1.25, "e": "binary_sensor.kitchen_motion", "o": ["off", {}], "n": ["on", {}]}
+
+``t`` is seconds since the capture started; ``o``/``n`` are ``[state, attributes]``
+or ``null``. ``scripts/replay-state-stream.py`` feeds a capture back through the
+bridge, kernel EventBus and OccupancyModule, firing each record with a
+``time_fired`` derived from ``t`` so time-based bridge logic sees recorded time.
+
+Captures are written to ``<config>/topomation_captures/<name>.jsonl``; an existing
+file is only replaced when it is itself a capture.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import HomeAssistant, State, callback
+from homeassistant.helpers.json import json_dumps
+
+if TYPE_CHECKING:
+    from homeassistant.core import Event as HAEvent
+
+_LOGGER = logging.getLogger(__name__)
+
+CAPTURE_FORMAT_VERSION = 1
+# Captures live in their own config subdirectory so they can never overwrite
+# configuration.yaml, secrets.yaml or the recorder database.
+CAPTURE_DIRECTORY = "topomation_captures"
+DEFAULT_CAPTURE_FILENAME = "topomation_state_capture.jsonl"
+# Buffered lines per executor write; keeps file I/O off the event loop.
+_FLUSH_EVERY = 500
+
+
+def _is_capture_file(path: Path) -> bool:
+    """Return True when ``path`` starts with a capture header line."""
+    try:
+        with path.open(encoding="utf-8") as handle:
+            payload = json.loads(handle.readline())
+    except (OSError, UnicodeDecodeError, ValueError):
+        return False
+    return isinstance(payload, dict) and payload.get("kind") == "header"
+
+
+def prepare_capture_path(path: Path) -> None:
+    """Create the capture directory; refuse a target that is not a previous capture.
+
+    Runs in the executor. Raises ``FileExistsError`` when ``path`` exists and its
+    first line is not a capture header.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.exists() and not _is_capture_file(path):
+        raise FileExistsError(f"{path} exists and is not a state capture")
+
+
+def _state_record(state: State | None) -> list[Any] | None:
+    """Return the compact ``[state, attributes]`` form of an HA state."""
+    if state is None:
+        return None
+    return [state.state, dict(state.attributes)]
+
+
+class StateStreamRecorder:
+    """Append state_changed events to a capture file in buffered executor writes."""
+
+    def __init__(self, hass: HomeAssistant, path: Path, config: dict[str, Any]) -> None:
+        """Initialize the recorder; the header is written with the first flush."""
+        self.hass = hass
+        self.path = path
+        self.recorded_count = 0
+        self._started = time.monotonic()
+        self._lock = asyncio.Lock()
+        self._closed = False
+        self._truncate = True
+        header = {
+            "v": CAPTURE_FORMAT_VERSION,
+            "kind": "header",
+            "started": datetime.now(UTC).isoformat(),
+            "config": config,
+        }
+        self._buffer: list[str] = [json_dumps(header)]
+
+    @callback
+    def async_record(self, event: HAEvent) -> None:
+        """Buffer one state_changed event."""
+        if self._closed:
+            return
+        data = event.data
+        self._buffer.append(
+            json_dumps(
+                {
+                    "t": round(time.monotonic() - self._started, 6),
+                    "e": data.get("entity_id"),
+                    "o": _state_record(data.get("old_state")),
+                    "n": _state_record(data.get("new_state")),
+                }
+            )
+        )
+        self.recorded_count += 1
+        if len(self._buffer) >= _FLUSH_EVERY:
+            self.hass.async_create_task(self._async_flush())
+
+    async def async_close(self) -> None:
+        """Flush buffered lines and stop recording."""
+        self._closed = True
+        await self._async_flush()
+
+    async def _async_flush(self) -> None:
+        """Write buffered lines in arrival order."""
+        async with self._lock:
+            if not self._buffer:
+                return
+            lines, self._buffer = self._buffer, []
+            mode = "w" if self._truncate else "a"
+            self._truncate = False
+            try:
+                await self.hass.async_add_executor_job(self._write, lines, mode)
+            except FileExistsError as err:
+                # Never append to a file that turned out not to be a capture.
+                self._closed = True
+                _LOGGER.error("Stopped state capture: %s", err)
+            except OSError as err:
+                _LOGGER.error("Failed to write state capture %s: %s", self.path, err)
+
+    def _write(self, lines: list[str], mode: str) -> None:
+        """Write lines to the capture file (runs in the executor)."""
+        if mode == "w":
+            # Re-check right before truncating: only a previous capture may be replaced.
+            prepare_capture_path(self.path)
+        with self.path.open(mode, encoding="utf-8") as handle:
+            handle.write("\n".join(lines))
+            handle.write("\n")
+
+
+def load_state_stream(path: Path) -> tuple[dict[str, Any], list[dict[str, Any]]]:
+    """Read a capture file and return ``(header, records)``."""
+    header: dict[str, Any] = {}
+    records: list[dict[str, Any]] = []
+    with path.open(encoding="utf-8") as handle:
+        for line in handle:
+            line = line.strip()
+            if not line:
+                continue
+            payload = json.loads(line)
+            if payload.get("kind") == "header":
+                header = payload
+                continue
+            records.append(payload)
+    return header, records
+
+
+def state_changed_data(record: dict[str, Any]) -> dict[str, Any]:
+    """Rebuild ``state_changed`` event data from one capture record."""
+    entity_id = record["e"]
+
+    def _state(raw: list[Any] | None) -> State | None:
+        if not raw:
+            return None
+        return State(entity_id, raw[0], raw[1] if len(raw) > 1 else None)
+
+    return {
+        "entity_id": entity_id,
+        "old_state": _state(record.get("o")),
+        "new_state": _state(record.get("n")),
+    }
+
+
+@callback
+def async_fire_recorded_state_change(
+    hass: HomeAssistant,
+    record: dict[str, Any],
+    replay_started: float,
+) -> None:
+    """Fire one capture record as ``state_changed`` at its recorded ``time_fired``."""
+    hass.bus.async_fire(
+        EVENT_STATE_CHANGED,
+        state_changed_data(record),
+        time_fired=replay_started + float(record.get("t", 0.0)),
+    )
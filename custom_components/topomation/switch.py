@@ -14,6 +14,7 @@ from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .const import DOMAIN
+from .entity_dispatcher import LocationEventDispatcher
 from .sync_manager import _is_shadow_host
 
 if TYPE_CHECKING:
@@ -76,6 +77,7 @@ async def async_setup_entry(
     bus = kernel["event_bus"]
     modules = kernel["modules"]
     occupancy_module = modules.get("occupancy")
+    dispatcher = kernel.get("entity_dispatcher")
 
     entities: list[LocationLockSwitch] = []
     switches_by_location_id: dict[str, LocationLockSwitch] = {}
@@ -89,6 +91,7 @@ async def async_setup_entry(
             bus,
             occupancy_module=occupancy_module,
             ha_area_id=_location_ha_area_id(location),
+            dispatcher=dispatcher,
         )
         switches_by_location_id[location.id] = switch
         entities.append(switch)
@@ -118,6 +121,7 @@ async def async_setup_entry(
             bus,
             occupancy_module=occupancy_module,
             ha_area_id=_location_ha_area_id(location),
+            dispatcher=dispatcher,
         )
         switches_by_location_id[location_id] = switch
         async_add_entities([switch])
@@ -164,12 +168,14 @@ class LocationLockSwitch(SwitchEntity):
         bus: EventBus,
         occupancy_module: OccupancyModule | None = None,
         ha_area_id: str | None = None,
+        dispatcher: LocationEventDispatcher | None = None,
     ) -> None:
         """Initialize the switch."""
         self._entry_id = entry_id
         self._location_id = location_id
         self._location_name = location_name
         self._bus = bus
+        self._dispatcher = dispatcher or LocationEventDispatcher(bus)
         self._occupancy_module = occupancy_module
         self._ha_area_id = ha_area_id
 
@@ -258,8 +264,6 @@ class LocationLockSwitch(SwitchEntity):
         @callback
         def on_occupancy_changed(event: Event) -> None:
             """Update lock state when occupancy events fire (lock state is in the payload)."""
-            if event.location_id != self._location_id:
-                return
             payload = event.payload
             if not isinstance(payload, Mapping):
                 return
@@ -269,17 +273,17 @@ class LocationLockSwitch(SwitchEntity):
         @callback
         def on_occupancy_signal(event: Event) -> None:
             """Refresh lock state on source-level occupancy activity."""
-            if event.location_id != self._location_id:
-                return
             self._hydrate_from_module_state()
 
-        self._bus.subscribe(
-            on_occupancy_changed,
-            EventFilter(event_type="occupancy.changed"),
+        self.async_on_remove(
+            self._dispatcher.async_subscribe(
+                "occupancy.changed", self._location_id, on_occupancy_changed
+            )
         )
-        self._bus.subscribe(
-            on_occupancy_signal,
-            EventFilter(event_type="occupancy.signal"),
+        self.async_on_remove(
+            self._dispatcher.async_subscribe(
+                "occupancy.signal", self._location_id, on_occupancy_signal
+            )
         )
 
     async def async_turn_on(self, **kwargs: Any) -> None:
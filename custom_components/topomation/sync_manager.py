@@ -12,6 +12,7 @@ HA areas are recreated by reconciliation when removed.
 from __future__ import annotations
 
 import logging
+from collections.abc import Callable
 from datetime import UTC, datetime
 from typing import TYPE_CHECKING, Any
 
@@ -126,6 +127,7 @@ class SyncManager:
         hass: HomeAssistant,
         loc_mgr: LocationManager,
         event_bus: EventBus,
+        on_topology_changed: Callable[[str], None] | None = None,
     ) -> None:
         """Initialize the sync manager.
 
@@ -133,10 +135,14 @@ class SyncManager:
             hass: Home Assistant instance
             loc_mgr: Location manager from home-topology kernel
             event_bus: Event bus from home-topology kernel
+            on_topology_changed: Called with a reason after registry sync may have
+                changed topology config (module configs and entity mapping do not
+                emit kernel events, so persistence cannot observe them otherwise)
         """
         self.hass = hass
         self.loc_mgr = loc_mgr
         self.event_bus = event_bus
+        self._on_topology_changed = on_topology_changed
         self.loc_mgr.set_event_bus(event_bus)
 
         # Registries
@@ -191,6 +197,7 @@ class SyncManager:
         self.reconcile_missing_ha_area_wrappers(run_shadow_reconcile=False)
         self._reconcile_managed_shadow_areas()
         self.reconcile_location_icons()
+        self._notify_topology_changed("sync/import")
 
         _LOGGER.info(
             "Import complete: %d locations created",
@@ -483,6 +490,7 @@ class SyncManager:
                 e,
                 exc_info=True,
             )
+        self._notify_topology_changed(f"sync/area_{action}")
 
     def _handle_area_created(self, area_id: str) -> None:
         """Handle new area created in HA."""
@@ -495,6 +503,7 @@ class SyncManager:
         async def _import_and_reconcile() -> None:
             await self._import_area(area)
             self._reconcile_managed_shadow_areas()
+            self._notify_topology_changed("sync/area_import")
 
         self.hass.async_create_task(_import_and_reconcile())
 
@@ -612,6 +621,7 @@ class SyncManager:
                 e,
                 exc_info=True,
             )
+        self._notify_topology_changed(f"sync/floor_{action}")
 
     def _handle_floor_created(self, floor_id: str) -> None:
         """Handle new floor created in HA."""
@@ -721,6 +731,7 @@ class SyncManager:
             try:
                 _LOGGER.debug("Reconcile entity mapping after registry change (%s)", reason)
                 await self._map_entities()
+                self._notify_topology_changed("sync/entity_map")
             except Exception as err:  # pragma: no cover - defensive logging
                 _LOGGER.error("Failed to reconcile entity mapping: %s", err, exc_info=True)
             finally:
@@ -728,6 +739,11 @@ class SyncManager:
 
         self.hass.async_create_task(_run())
 
+    def _notify_topology_changed(self, reason: str) -> None:
+        """Tell the owner that registry sync may have mutated topology config."""
+        if self._on_topology_changed is not None:
+            self._on_topology_changed(reason)
+
     def _can_sync_from_ha(self, location: Location) -> bool:
         """Return True if Home Assistant changes may update this topology location."""
         meta = location.modules.get("_meta", {})
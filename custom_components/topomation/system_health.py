@@ -9,7 +9,7 @@ from home_topology import __version__ as home_topology_runtime_version
 from homeassistant.components import system_health
 from homeassistant.core import HomeAssistant, callback
 
-from .const import VERSION
+from .const import DOMAIN, VERSION
 
 
 @callback
@@ -18,7 +18,7 @@ def async_register(hass: HomeAssistant, register: system_health.SystemHealthRegi
     register.async_register_info(system_health_info)
 
 
-async def system_health_info(_hass: HomeAssistant) -> dict[str, Any]:
+async def system_health_info(hass: HomeAssistant) -> dict[str, Any]:
     """Return diagnostics surfaced in the integration info window."""
     installed_home_topology_version = "unknown"
     try:
@@ -26,8 +26,31 @@ async def system_health_info(_hass: HomeAssistant) -> dict[str, Any]:
     except metadata.PackageNotFoundError:
         pass
 
-    return {
+    info: dict[str, Any] = {
         "integration_version": VERSION,
         "home_topology_runtime_version": home_topology_runtime_version,
         "home_topology_installed_version": installed_home_topology_version,
     }
+    info.update(_startup_timing_info(hass))
+    return info
+
+
+def _startup_timing_info(hass: HomeAssistant) -> dict[str, Any]:
+    """Return startup timing of the first loaded entry as display-ready values."""
+    for kernel in hass.data.get(DOMAIN, {}).values():
+        timing_dict = getattr(
+            kernel.get("startup_timing") if isinstance(kernel, dict) else None,
+            "as_dict",
+            None,
+        )
+        if not callable(timing_dict):
+            continue
+        timing = timing_dict()
+        return {
+            "startup_total_ms": timing["total_ms"],
+            "startup_budget_ms": timing["budget_ms"],
+            "startup_phases_ms": ", ".join(
+                f"{phase}={milliseconds:g}" for phase, milliseconds in timing["phases_ms"].items()
+            ),
+        }
+    return {}
@@ -5,11 +5,13 @@ from __future__ import annotations
 import logging
 import re
 from collections.abc import Mapping
+from dataclasses import dataclass
 from datetime import UTC, datetime
 from typing import Any
 from weakref import WeakKeyDictionary
 
 import voluptuous as vol
+from home_topology import EventFilter
 from homeassistant.components import websocket_api
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import area_registry as ar
@@ -20,6 +22,7 @@ try:  # Floor registry is optional on older HA builds.
 except Exception:  # pragma: no cover - compatibility import
     fr = None  # type: ignore[assignment]
 
+from .binary_sensor import async_get_occupancy_entity_id
 from .const import (
     DOMAIN,
     EVENT_TOPOMATION_UPDATED,
@@ -75,6 +78,13 @@ _OCCUPANCY_GROUP_ID_KEY = "occupancy_group_id"
 _DUSK_DAWN_TIME_PATTERN = re.compile(r"^([01]\d|2[0-3]):([0-5]\d)$")
 _ACTION_TRIGGER_TYPES = frozenset({"on_occupied", "on_vacant", "on_dark", "on_bright"})
 _ACTION_AMBIENT_CONDITIONS = frozenset({"any", "dark", "bright"})
+_PROJECTION_TOPOLOGY_EVENT_TYPES = (
+    "location.created",
+    "location.deleted",
+    "location.renamed",
+    "location.parent_changed",
+    "location.reordered",
+)
 
 
 def _fire_topomation_updated(
@@ -90,9 +100,22 @@ def _fire_topomation_updated(
     if isinstance(entry_id, str) and entry_id:
         event_payload["entry_id"] = entry_id
     event_payload.update(payload)
+    projection = kernel.get("occupancy_projection")
+    if isinstance(projection, OccupancyProjectionStore):
+        projection.invalidate()
+    invalidate_dispatch = getattr(kernel.get("event_bridge"), "invalidate_dispatch", None)
+    if callable(invalidate_dispatch):
+        invalidate_dispatch()
     hass.bus.async_fire(EVENT_TOPOMATION_UPDATED, event_payload)
 
 
+def _invalidate_handoff_index(kernel: dict[str, Any]) -> None:
+    """Drop the event bridge adjacency handoff index after an edge mutation."""
+    invalidate = getattr(kernel.get("event_bridge"), "invalidate_handoff_index", None)
+    if callable(invalidate):
+        invalidate()
+
+
 def _normalize_action_trigger_type(raw_value: Any) -> str:
     """Validate an action trigger type."""
     normalized = str(raw_value or "").strip().lower()
@@ -401,13 +424,8 @@ def _state_timestamp_iso(state_obj: object | None) -> str | None:
 
 def _ha_occupancy_state_for_location(hass: HomeAssistant, location_id: str) -> object | None:
     """Find the HA occupancy entity state backing a runtime topology id."""
-    for state_obj in hass.states.async_all("binary_sensor"):
-        attrs = getattr(state_obj, "attributes", {}) or {}
-        if attrs.get("device_class") != "occupancy":
-            continue
-        if str(attrs.get("location_id", "")) == location_id:
-            return state_obj
-    return None
+    entity_id = async_get_occupancy_entity_id(hass, location_id)
+    return hass.states.get(entity_id) if entity_id else None
 
 
 def _serialize_projection_state_like(
@@ -482,6 +500,263 @@ def _projection_recent_changes(
     return sorted(rows, key=lambda row: str(row.get("changed_at") or ""), reverse=True)
 
 
+@dataclass(slots=True)
+class _ProjectionTopology:
+    """Location snapshot shared by full and incremental occupancy projection."""
+
+    locations: list[object]
+    locations_by_id: dict[str, object]
+    positions: dict[str, int]
+    by_parent: dict[str, list[object]]
+    group_members: dict[str, list[str]]
+    config_refs: dict[str, tuple[Any, Any, Any]]
+
+
+def _location_config_refs(location: object) -> tuple[Any, Any, Any]:
+    """Return the parent id plus config objects that shape a location projection."""
+    modules = getattr(location, "modules", {}) or {}
+    if not isinstance(modules, dict):
+        modules = {}
+    return getattr(location, "parent_id", None), modules.get("_meta"), modules.get("occupancy")
+
+
+def _config_refs_match(current: tuple[Any, Any, Any], cached: tuple[Any, Any, Any]) -> bool:
+    """Return True when a location still has the parent/config it was projected with."""
+    return current[0] == cached[0] and current[1] is cached[1] and current[2] is cached[2]
+
+
+def _projection_topology(location_manager: object) -> _ProjectionTopology:
+    """Snapshot list-ordered locations and the indexes projection needs."""
+    all_locations = list(_ordered_locations_for_list(location_manager))
+    by_parent: dict[str, list[object]] = {}
+    for loc in all_locations:
+        parent_id = getattr(loc, "parent_id", None)
+        if isinstance(parent_id, str) and parent_id:
+            by_parent.setdefault(parent_id, []).append(loc)
+
+    locations = [loc for loc in all_locations if _location_id(loc)]
+    group_members: dict[str, list[str]] = {}
+    for loc in locations:
+        group_id = _occupancy_group_id(loc)
+        if group_id:
+            group_members.setdefault(group_id, []).append(_location_id(loc))
+
+    return _ProjectionTopology(
+        locations=locations,
+        locations_by_id={_location_id(loc): loc for loc in locations},
+        positions={_location_id(loc): index for index, loc in enumerate(locations)},
+        by_parent=by_parent,
+        group_members=group_members,
+        config_refs={_location_id(loc): _location_config_refs(loc) for loc in locations},
+    )
+
+
+def _occupancy_runtime_state(occupancy_module: Any, location_id: str) -> dict[str, Any] | None:
+    """Read one location's runtime occupancy payload from the kernel module."""
+    try:
+        raw = occupancy_module.get_location_state(location_id) if occupancy_module else None
+    except Exception:  # pragma: no cover - defensive against runtime errors
+        _LOGGER.debug("Failed to read occupancy runtime state for %s", location_id, exc_info=True)
+        raw = None
+    return raw if isinstance(raw, dict) else None
+
+
+@dataclass(slots=True)
+class _SubtreeRollup:
+    """Occupancy summary of a location's non-shadow descendants."""
+
+    first_occupied_id: str | None = None
+    vacant_count: int = 0
+
+
+def _subtree_rollup(
+    topology: _ProjectionTopology,
+    raw_states: Mapping[str, dict[str, Any] | None],
+    rollups: Mapping[str, _SubtreeRollup],
+    location_id: str,
+) -> _SubtreeRollup:
+    """Fold direct children and their rollups into one location's rollup.
+
+    Children are visited in list order and each child precedes its own subtree,
+    so ``first_occupied_id`` is the first occupied descendant in depth-first
+    list order. Managed shadow areas are skipped but their subtrees still count.
+    """
+    rollup = _SubtreeRollup()
+    for child in topology.by_parent.get(location_id, []):
+        child_id = _location_id(child)
+        if not child_id:
+            continue
+        if not _is_managed_shadow_area(child):
+            child_payload = raw_states.get(child_id)
+            child_occupied = (
+                child_payload.get("occupied") if isinstance(child_payload, dict) else None
+            )
+            if child_occupied is True and rollup.first_occupied_id is None:
+                rollup.first_occupied_id = child_id
+            elif child_occupied is False:
+                rollup.vacant_count += 1
+        child_rollup = rollups.get(child_id)
+        if child_rollup is None:
+            continue
+        if rollup.first_occupied_id is None:
+            rollup.first_occupied_id = child_rollup.first_occupied_id
+        rollup.vacant_count += child_rollup.vacant_count
+    return rollup
+
+
+def _subtree_rollups(
+    topology: _ProjectionTopology,
+    raw_states: Mapping[str, dict[str, Any] | None],
+) -> dict[str, _SubtreeRollup]:
+    """Compute every location's descendant rollup in one post-order pass."""
+    rollups: dict[str, _SubtreeRollup] = {}
+    # List order is depth-first pre-order, so walking it backwards reaches every
+    # child before its parent.
+    for location in reversed(topology.locations):
+        location_id = _location_id(location)
+        rollups[location_id] = _subtree_rollup(topology, raw_states, rollups, location_id)
+    return rollups
+
+
+def _child_rollup_payload(
+    topology: _ProjectionTopology,
+    payload: dict[str, Any],
+    *,
+    child_id: str,
+) -> dict[str, Any]:
+    """Replace stale direct-vacancy evidence with descendant rollup evidence."""
+    child_location = topology.locations_by_id.get(child_id)
+    child_name = str(getattr(child_location, "name", child_id) or child_id)
+    next_payload = dict(payload)
+    contribution = {
+        "source_id": f"__child__:{child_id}",
+        "state": "active",
+        "origin_location_id": child_id,
+        "origin_source_id": f"__child__:{child_id}",
+        "expires_at": None,
+    }
+    next_payload["contributions"] = [contribution]
+    next_payload["explanation"] = {
+        "version": 1,
+        "basis": "child_rollup",
+        "projected_from": {
+            "kind": "child_rollup",
+            "location_id": child_id,
+            "location_name": child_name,
+        },
+        "held_by": [contribution],
+    }
+    next_payload["reason"] = "event:inherit"
+    return next_payload
+
+
+def _projected_occupied(
+    location: object,
+    payload: dict[str, Any],
+    rollup: _SubtreeRollup,
+) -> tuple[bool, str | None]:
+    """Resolve projected occupancy and the descendant that holds a rollup, if any."""
+    own = payload.get("occupied")
+    if own is True:
+        return True, None
+    if own is not False and own is not True:
+        # The occupancy engine may not allocate a runtime record until the
+        # first signal/lock touches a location. That does not make the
+        # location unknowable: Topomation occupancy is binary, and the HA
+        # entity surface initializes absence of active evidence as vacant.
+        own = False
+
+    if rollup.first_occupied_id:
+        return True, rollup.first_occupied_id
+
+    if _is_shadow_host_location(location) or bool(getattr(location, "is_explicit_root", False)):
+        if own is False:
+            return False, None
+        if rollup.vacant_count:
+            return False, None
+
+    return own if isinstance(own, bool) else False, None
+
+
+def _project_location_state(
+    hass: HomeAssistant,
+    location_manager: object,
+    topology: _ProjectionTopology,
+    raw_states: Mapping[str, dict[str, Any] | None],
+    recent_by_location: Any,
+    location: object,
+    rollup: _SubtreeRollup,
+    now: datetime,
+) -> dict[str, Any]:
+    """Build one C-023 projection row from the topology snapshot and runtime states."""
+    location_id = _location_id(location)
+    shadow_id = _managed_shadow_area_id(location_manager, location)
+    # Managed shadow areas expose HA entities for structural hosts, but their
+    # occupancy is a follow-parent mirror. The panel projection must stay
+    # anchored on the structural host rollup so a stale shadow mirror cannot
+    # make an otherwise vacant floor/building look occupied.
+    effective_id = location_id
+    group_id = _occupancy_group_id(location)
+    loc_type = _location_type(location)
+    if shadow_id:
+        projection_kind = "managed_shadow_host"
+    elif bool(getattr(location, "is_explicit_root", False)) or loc_type in _SHADOW_HOST_TYPES:
+        projection_kind = "structural_rollup"
+    elif group_id:
+        projection_kind = "occupancy_group_member"
+    else:
+        projection_kind = "direct"
+
+    raw_payload = raw_states.get(effective_id)
+    payload = dict(raw_payload) if isinstance(raw_payload, dict) else {}
+    occupied, occupied_child_id = _projected_occupied(location, payload, rollup)
+    if occupied is True and occupied_child_id:
+        payload = _child_rollup_payload(topology, payload, child_id=occupied_child_id)
+    payload["occupied"] = occupied
+
+    ha_state = _ha_occupancy_state_for_location(hass, effective_id)
+    changed_at = _state_timestamp_iso(ha_state) or now.isoformat()
+    previous_occupied = payload.get("previous_occupied")
+    reason = payload.get("reason")
+    timeout_at = payload.get("effective_timeout_at") or payload.get("vacant_at")
+    recent_changes = _projection_recent_changes(recent_by_location, location_id, effective_id)
+
+    state_like = _serialize_projection_state_like(
+        location_id=location_id,
+        location_name=str(getattr(location, "name", location_id) or location_id),
+        occupied=occupied,
+        payload=payload,
+        changed_at=changed_at,
+        recent_changes=recent_changes,
+    )
+
+    return {
+        "location_id": location_id,
+        "effective_location_id": effective_id,
+        "projection": projection_kind,
+        "occupied": occupied,
+        "previous_occupied": previous_occupied if isinstance(previous_occupied, bool) else None,
+        "reason": reason if isinstance(reason, str) and reason else None,
+        "changed_at": changed_at,
+        "is_locked": bool(payload.get("is_locked", False)),
+        "locked_by": payload.get("locked_by", []),
+        "lock_modes": payload.get("lock_modes", []),
+        "direct_locks": payload.get("direct_locks", []),
+        "vacant_at": timeout_at,
+        "effective_timeout_at": timeout_at,
+        "seconds_until_vacant": payload.get("seconds_until_vacant"),
+        "occupancy_group_id": group_id or payload.get("occupancy_group_id"),
+        "explanation": payload.get("explanation"),
+        "summary": (
+            "Occupied" if occupied is True else "Vacant" if occupied is False else "Occupancy unknown"
+        ),
+        "contributors": payload.get("contributions", []),
+        "contributions": payload.get("contributions", []),
+        "recent_changes": recent_changes,
+        "state": state_like,
+    }
+
+
 def build_occupancy_projection_states(
     hass: HomeAssistant,
     kernel: dict[str, Any],
@@ -491,196 +766,309 @@ def build_occupancy_projection_states(
     occupancy_module = kernel.get("modules", {}).get("occupancy")
     recent_by_location = kernel.get("occupancy_recent_changes", {})
 
-    locations = list(_ordered_locations_for_list(loc_mgr))
-    locations_by_id = {_location_id(loc): loc for loc in locations if _location_id(loc)}
-    by_parent: dict[str, list[object]] = {}
-    for loc in locations:
-        parent_id = getattr(loc, "parent_id", None)
-        if isinstance(parent_id, str) and parent_id:
-            by_parent.setdefault(parent_id, []).append(loc)
-
-    raw_states: dict[str, dict[str, Any] | None] = {}
-    for loc in locations:
-        location_id = _location_id(loc)
-        if not location_id:
-            continue
-        try:
-            raw = occupancy_module.get_location_state(location_id) if occupancy_module else None
-        except Exception:  # pragma: no cover - defensive against runtime errors
-            _LOGGER.debug("Failed to read occupancy runtime state for %s", location_id, exc_info=True)
-            raw = None
-        raw_states[location_id] = raw if isinstance(raw, dict) else None
-
-    def descendant_ids(location_id: str) -> list[str]:
-        result: list[str] = []
-        stack = list(by_parent.get(location_id, []))
-        while stack:
-            child = stack.pop(0)
-            child_id = _location_id(child)
-            if child_id:
-                result.append(child_id)
-            stack[0:0] = by_parent.get(child_id, [])
-        return result
-
-    def effective_payload(location: object, effective_id: str) -> dict[str, Any]:
-        payload = raw_states.get(effective_id)
-        if isinstance(payload, dict):
-            return dict(payload)
-        own_payload = raw_states.get(_location_id(location))
-        return dict(own_payload) if isinstance(own_payload, dict) else {}
+    topology = _projection_topology(loc_mgr)
+    raw_states = {
+        location_id: _occupancy_runtime_state(occupancy_module, location_id)
+        for location_id in topology.locations_by_id
+    }
+    rollups = _subtree_rollups(topology, raw_states)
+    now = datetime.now(UTC)
+    return [
+        _project_location_state(
+            hass,
+            loc_mgr,
+            topology,
+            raw_states,
+            recent_by_location,
+            location,
+            rollups[_location_id(location)],
+            now,
+        )
+        for location in topology.locations
+    ]
 
-    def first_occupied_descendant_id(location_id: str) -> str | None:
-        for child_id in descendant_ids(location_id):
-            child_location = locations_by_id.get(child_id)
-            if child_location is not None and _is_managed_shadow_area(child_location):
-                continue
-            child_payload = raw_states.get(child_id)
-            child_occupied = child_payload.get("occupied") if isinstance(child_payload, dict) else None
-            if child_occupied is True:
-                return child_id
-        return None
 
-    def child_rollup_payload(
-        payload: dict[str, Any],
-        *,
-        child_id: str,
-    ) -> dict[str, Any]:
-        """Replace stale direct-vacancy evidence with descendant rollup evidence."""
-        child_location = locations_by_id.get(child_id)
-        child_name = str(getattr(child_location, "name", child_id) or child_id)
-        next_payload = dict(payload)
-        contribution = {
-            "source_id": f"__child__:{child_id}",
-            "state": "active",
-            "origin_location_id": child_id,
-            "origin_source_id": f"__child__:{child_id}",
-            "expires_at": None,
-        }
-        next_payload["contributions"] = [contribution]
-        next_payload["explanation"] = {
-            "version": 1,
-            "basis": "child_rollup",
-            "projected_from": {
-                "kind": "child_rollup",
-                "location_id": child_id,
-                "location_name": child_name,
-            },
-            "held_by": [contribution],
+def _occupancy_projection_states(
+    hass: HomeAssistant,
+    kernel: dict[str, Any],
+) -> list[dict[str, Any]]:
+    """Serve projection rows from the kernel store, falling back to a full build."""
+    projection = kernel.get("occupancy_projection")
+    if isinstance(projection, OccupancyProjectionStore):
+        return projection.states()
+    return build_occupancy_projection_states(hass, kernel)
+
+
+def _comparable_projection_state(row: Mapping[str, Any]) -> dict[str, Any]:
+    """Drop wall-clock derived fields before comparing two projection rows."""
+    comparable = {key: value for key, value in row.items() if key != "changed_at"}
+    state_like = row.get("state")
+    if isinstance(state_like, Mapping):
+        comparable["state"] = {
+            key: value
+            for key, value in state_like.items()
+            if key not in ("last_changed", "last_updated")
         }
-        next_payload["reason"] = "event:inherit"
-        return next_payload
-
-    def projected_occupied(
-        location: object,
-        effective_id: str,
-        payload: dict[str, Any],
-    ) -> tuple[bool, str | None]:
-        own = payload.get("occupied")
-        if own is True:
-            return True, None
-        if own is not False and own is not True:
-            # The occupancy engine may not allocate a runtime record until the
-            # first signal/lock touches a location. That does not make the
-            # location unknowable: Topomation occupancy is binary, and the HA
-            # entity surface initializes absence of active evidence as vacant.
-            own = False
-
-        occupied_child_id = first_occupied_descendant_id(_location_id(location))
-        if occupied_child_id:
-            return True, occupied_child_id
-
-        if _is_shadow_host_location(location) or bool(getattr(location, "is_explicit_root", False)):
-            child_states: list[bool] = []
-            for child_id in descendant_ids(_location_id(location)):
-                child_location = locations_by_id.get(child_id)
-                if child_location is not None and _is_managed_shadow_area(child_location):
-                    continue
-                child_payload = raw_states.get(child_id)
-                child_occupied = child_payload.get("occupied") if isinstance(child_payload, dict) else None
-                if child_occupied is False:
-                    child_states.append(False)
-            if own is False:
-                return False, None
-            if child_states and all(state is False for state in child_states):
-                return False, None
-
-        return own if isinstance(own, bool) else False, None
-
-    projections: list[dict[str, Any]] = []
-    now = datetime.now(UTC)
-    for location in locations:
-        location_id = _location_id(location)
-        if not location_id:
-            continue
+    return comparable
+
 
-        shadow_id = _managed_shadow_area_id(loc_mgr, location)
-        # Managed shadow areas expose HA entities for structural hosts, but their
-        # occupancy is a follow-parent mirror. The panel projection must stay
-        # anchored on the structural host rollup so a stale shadow mirror cannot
-        # make an otherwise vacant floor/building look occupied.
-        effective_id = location_id
+class OccupancyProjectionStore:
+    """Incrementally maintained C-023 occupancy projection for one kernel.
+
+    Keeps the last projected row per location so an ``occupancy.changed`` event
+    only recomputes the changed location, its occupancy-group peers, and the
+    ancestors whose rollups depend on them. Topology mutations drop the snapshot
+    and the next read falls back to a full rebuild.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        location_manager: object,
+        occupancy_module: Any,
+        recent_by_location: Any,
+        *,
+        consistency_check: bool = False,
+    ) -> None:
+        """Initialize an empty store; the first read builds the full projection."""
+        self._hass = hass
+        self._location_manager = location_manager
+        self._occupancy_module = occupancy_module
+        self._recent_by_location = recent_by_location
+        self.consistency_check = consistency_check
+        self._topology: _ProjectionTopology | None = None
+        self._raw_states: dict[str, dict[str, Any] | None] = {}
+        self._rollups: dict[str, _SubtreeRollup] = {}
+        self._rows: dict[str, dict[str, Any]] = {}
+        self._stale: set[str] = set()
+
+    def attach(self, bus: Any) -> None:
+        """Subscribe to kernel events that change the projection outside occupancy."""
+        for event_type in _PROJECTION_TOPOLOGY_EVENT_TYPES:
+            bus.subscribe(self._handle_topology_event, EventFilter(event_type=event_type))
+        bus.subscribe(self._handle_occupancy_signal, EventFilter(event_type="occupancy.signal"))
+
+    @callback
+    def invalidate(self) -> None:
+        """Drop the snapshot so the next read rebuilds every row."""
+        self._topology = None
+        self._raw_states = {}
+        self._rollups = {}
+        self._rows = {}
+        self._stale.clear()
+
+    @callback
+    def mark_stale(self, location_id: str) -> None:
+        """Recompute a location's row on the next read (for example new recent_changes)."""
+        if self._topology is not None and location_id in self._topology.locations_by_id:
+            self._stale.add(location_id)
+
+    @callback
+    def states(self) -> list[dict[str, Any]]:
+        """Return projection rows for every location in list order."""
+        topology = self._current_topology()
+        if not self._topology_is_current(topology):
+            self.invalidate()
+            topology = self._current_topology()
+        # occupancy.signal only marks rows stale, so a re-trigger that extends a
+        # timeout without a transition must re-read the runtime state here.
+        stale = {location_id for location_id in self._stale if location_id in topology.positions}
+        for location_id in stale:
+            self._raw_states[location_id] = _occupancy_runtime_state(
+                self._occupancy_module, location_id
+            )
+        dependents = set(stale)
+        for location_id in stale:
+            dependents.update(self._ancestor_ids(topology, location_id))
+        for dependent_id in sorted(dependents, key=topology.positions.__getitem__, reverse=True):
+            self._rollups[dependent_id] = _subtree_rollup(
+                topology, self._raw_states, self._rollups, dependent_id
+            )
+        now = datetime.now(UTC)
+        for location_id in sorted(dependents, key=topology.positions.__getitem__):
+            self._project(topology, location_id, now)
+        self._stale.clear()
+        return [self._rows[_location_id(location)] for location in topology.locations]
+
+    @callback
+    def refresh_location(self, location_id: str) -> list[dict[str, Any]]:
+        """Refresh after ``occupancy.changed``; return rows for the location and its group peers."""
+        topology = self._current_topology()
+        location = topology.locations_by_id.get(location_id)
+        if location is None:
+            return []
+
+        affected = [location_id]
         group_id = _occupancy_group_id(location)
-        loc_type = _location_type(location)
-        if shadow_id:
-            projection_kind = "managed_shadow_host"
-        elif bool(getattr(location, "is_explicit_root", False)) or loc_type in _SHADOW_HOST_TYPES:
-            projection_kind = "structural_rollup"
-        elif group_id:
-            projection_kind = "occupancy_group_member"
+        if group_id:
+            affected = list(topology.group_members.get(group_id, affected))
+            if location_id not in affected:
+                affected.append(location_id)
+        dependents = set(affected)
+        for member_id in affected:
+            dependents.update(self._ancestor_ids(topology, member_id))
+
+        if all(
+            _config_refs_match(
+                _location_config_refs(topology.locations_by_id[dependent_id]),
+                topology.config_refs[dependent_id],
+            )
+            for dependent_id in dependents
+        ):
+            for member_id in affected:
+                self._raw_states[member_id] = _occupancy_runtime_state(
+                    self._occupancy_module, member_id
+                )
+            # Children sit after their ancestors in list order, so refreshing
+            # rollups from the deepest dependent up keeps each fold current.
+            for dependent_id in sorted(
+                dependents, key=topology.positions.__getitem__, reverse=True
+            ):
+                self._rollups[dependent_id] = _subtree_rollup(
+                    topology, self._raw_states, self._rollups, dependent_id
+                )
         else:
-            projection_kind = "direct"
-
-        payload = effective_payload(location, effective_id)
-        occupied, occupied_child_id = projected_occupied(location, effective_id, payload)
-        if occupied is True and occupied_child_id:
-            payload = child_rollup_payload(payload, child_id=occupied_child_id)
-        payload["occupied"] = occupied
-
-        ha_state = _ha_occupancy_state_for_location(hass, effective_id)
-        changed_at = _state_timestamp_iso(ha_state) or now.isoformat()
-        previous_occupied = payload.get("previous_occupied")
-        reason = payload.get("reason")
-        timeout_at = payload.get("effective_timeout_at") or payload.get("vacant_at")
-        recent_changes = _projection_recent_changes(recent_by_location, location_id, effective_id)
-
-        state_like = _serialize_projection_state_like(
-            location_id=location_id,
-            location_name=str(getattr(location, "name", location_id) or location_id),
-            occupied=occupied,
-            payload=payload,
-            changed_at=changed_at,
-            recent_changes=recent_changes,
+            self.invalidate()
+            topology = self._current_topology()
+            if location_id not in topology.locations_by_id:
+                return []
+
+        now = datetime.now(UTC)
+        rows = [
+            self._project(topology, member_id, now)
+            for member_id in sorted(affected, key=topology.positions.__getitem__)
+            if member_id in topology.locations_by_id
+        ]
+        # Rows stay stale after the live event: the occupancy entities write their
+        # HA state after this handler, so the next read picks up their timestamps.
+        self._stale.update(
+            dependent_id for dependent_id in dependents if dependent_id in topology.locations_by_id
+        )
+        if self.consistency_check:
+            # Only the rows served to the live event are compared: other rows may
+            # be mid-cascade until their own occupancy.changed arrives.
+            mismatched = self._mismatched_rows({row["location_id"]: row for row in rows})
+            if mismatched:
+                _LOGGER.warning(
+                    "Incremental occupancy projection drifted from full rebuild for: %s",
+                    ", ".join(mismatched),
+                )
+        return rows
+
+    def verify(self) -> list[str]:
+        """Return location ids whose current stored row differs from a full rebuild."""
+        if self._topology is None:
+            return []
+        current_rows = {
+            location_id: row
+            for location_id, row in self._rows.items()
+            if location_id not in self._stale
+        }
+        mismatched = set(self._mismatched_rows(current_rows))
+        live_ids = {
+            _location_id(location) for location in self._location_manager.all_locations()
+        }
+        mismatched.update(set(self._topology.locations_by_id) ^ (live_ids - {""}))
+        return sorted(mismatched)
+
+    def _mismatched_rows(self, rows: Mapping[str, dict[str, Any]]) -> list[str]:
+        """Return ids of the given rows that differ from a full rebuild."""
+        rebuilt = {
+            row["location_id"]: _comparable_projection_state(row)
+            for row in build_occupancy_projection_states(
+                self._hass,
+                {
+                    "location_manager": self._location_manager,
+                    "modules": {"occupancy": self._occupancy_module},
+                    "occupancy_recent_changes": self._recent_by_location,
+                },
+            )
+        }
+        return sorted(
+            location_id
+            for location_id, row in rows.items()
+            if rebuilt.get(location_id) != _comparable_projection_state(row)
         )
 
-        projections.append(
-            {
-                "location_id": location_id,
-                "effective_location_id": effective_id,
-                "projection": projection_kind,
-                "occupied": occupied,
-                "previous_occupied": previous_occupied if isinstance(previous_occupied, bool) else None,
-                "reason": reason if isinstance(reason, str) and reason else None,
-                "changed_at": changed_at,
-                "is_locked": bool(payload.get("is_locked", False)),
-                "locked_by": payload.get("locked_by", []),
-                "lock_modes": payload.get("lock_modes", []),
-                "direct_locks": payload.get("direct_locks", []),
-                "vacant_at": timeout_at,
-                "effective_timeout_at": timeout_at,
-                "seconds_until_vacant": payload.get("seconds_until_vacant"),
-                "occupancy_group_id": group_id or payload.get("occupancy_group_id"),
-                "explanation": payload.get("explanation"),
-                "summary": (
-                    "Occupied" if occupied is True else "Vacant" if occupied is False else "Occupancy unknown"
-                ),
-                "contributors": payload.get("contributions", []),
-                "contributions": payload.get("contributions", []),
-                "recent_changes": recent_changes,
-                "state": state_like,
-            }
+    def _current_topology(self) -> _ProjectionTopology:
+        """Return the snapshot, rebuilding topology, runtime states, and rows if needed."""
+        if self._topology is not None:
+            return self._topology
+        topology = _projection_topology(self._location_manager)
+        self._raw_states = {
+            location_id: _occupancy_runtime_state(self._occupancy_module, location_id)
+            for location_id in topology.locations_by_id
+        }
+        self._rollups = _subtree_rollups(topology, self._raw_states)
+        self._rows = {}
+        self._stale.clear()
+        now = datetime.now(UTC)
+        for location in topology.locations:
+            self._project(topology, _location_id(location), now)
+        self._topology = topology
+        return topology
+
+    def _topology_is_current(self, topology: _ProjectionTopology) -> bool:
+        """Check every location still matches the snapshot (catches silent config writes)."""
+        current = {
+            _location_id(location): location
+            for location in self._location_manager.all_locations()
+            if _location_id(location)
+        }
+        if current.keys() != topology.locations_by_id.keys():
+            return False
+        return all(
+            _config_refs_match(_location_config_refs(location), topology.config_refs[location_id])
+            for location_id, location in current.items()
         )
 
-    return projections
+    def _project(
+        self,
+        topology: _ProjectionTopology,
+        location_id: str,
+        now: datetime,
+    ) -> dict[str, Any]:
+        """Recompute and store one location's row."""
+        row = _project_location_state(
+            self._hass,
+            self._location_manager,
+            topology,
+            self._raw_states,
+            self._recent_by_location,
+            topology.locations_by_id[location_id],
+            self._rollups[location_id],
+            now,
+        )
+        self._rows[location_id] = row
+        return row
+
+    @staticmethod
+    def _ancestor_ids(topology: _ProjectionTopology, location_id: str) -> list[str]:
+        """Return snapshot ancestors nearest-first, guarding against cycles."""
+        ancestors: list[str] = []
+        seen = {location_id}
+        current = topology.locations_by_id.get(location_id)
+        while current is not None:
+            parent_id = getattr(current, "parent_id", None)
+            if not isinstance(parent_id, str) or not parent_id or parent_id in seen:
+                break
+            seen.add(parent_id)
+            current = topology.locations_by_id.get(parent_id)
+            if current is not None:
+                ancestors.append(parent_id)
+        return ancestors
+
+    @callback
+    def _handle_topology_event(self, _event: Any) -> None:
+        """Drop the snapshot after location create/delete/rename/reparent/reorder."""
+        self.invalidate()
+
+    @callback
+    def _handle_occupancy_signal(self, event: Any) -> None:
+        """Source-level signals add recent_changes rows without an occupancy transition."""
+        location_id = getattr(event, "location_id", None)
+        if isinstance(location_id, str) and location_id:
+            self.mark_stale(location_id)
 
 
 def _validate_managed_shadow_area_candidate(
@@ -1219,7 +1607,7 @@ def handle_locations_list(
         {
             "locations": locations,
             "adjacency_edges": _list_adjacency_edges(loc_mgr),
-            "occupancy_states": build_occupancy_projection_states(hass, kernel),
+            "occupancy_states": _occupancy_projection_states(hass, kernel),
         },
     )
 
@@ -1243,7 +1631,7 @@ def handle_occupancy_states_list(
 
     connection.send_result(
         msg["id"],
-        {"states": build_occupancy_projection_states(hass, kernel)},
+        {"states": _occupancy_projection_states(hass, kernel)},
     )
 
 
@@ -1359,6 +1747,7 @@ def handle_adjacency_create(
         if callable(schedule_persist):
             schedule_persist("adjacency/create")
 
+        _invalidate_handoff_index(kernel)
         _fire_topomation_updated(
             hass,
             kernel,
@@ -1443,6 +1832,7 @@ def handle_adjacency_update(
         if callable(schedule_persist):
             schedule_persist("adjacency/update")
 
+        _invalidate_handoff_index(kernel)
         _fire_topomation_updated(hass, kernel, "adjacency_update", edge_id=edge_id)
         connection.send_result(msg["id"], {"success": True, "adjacency_edge": payload})
     except (TypeError, ValueError) as err:
@@ -1489,6 +1879,7 @@ def handle_adjacency_delete(
         if callable(schedule_persist):
             schedule_persist("adjacency/delete")
 
+        _invalidate_handoff_index(kernel)
         _fire_topomation_updated(hass, kernel, "adjacency_delete", edge_id=edge_id)
         connection.send_result(msg["id"], {"success": True, "edge_id": edge_id, "adjacency_edge": payload})
     except ValueError as err:
@@ -2117,6 +2508,12 @@ def handle_locations_set_module_config(
         loc_mgr.set_module_config(location_id, module_id, config)
         if module_id == "_meta":
             _reconcile_managed_shadow_areas(kernel)
+            # A type change can add or remove a property above other locations.
+            invalidate_ancestors = getattr(
+                modules.get("recent_activity"), "invalidate_ancestor_cache", None
+            )
+            if callable(invalidate_ancestors):
+                invalidate_ancestors()
 
         # Notify module of config change
         if module_id in modules:
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""Benchmark restoring saved topology config on synthetic topologies.
+
+Builds 1k/5k-location configs (wide house-shaped and 100-deep chains), shuffles
+the saved location order so children often precede their parents, and reports:
+
+- ``legacy_ms``: the pre-change ``while pending`` restore loop (re-sorts every
+  pass, bus attached so each create publishes ``location.created``)
+- ``plan_ms``: the single-pass ``_location_restore_plan`` ordering plus creates
+  with no bus attached
+- ``order_ms``: the ordering alone; the rest of ``plan_ms`` is the kernel's
+  ``create_location`` (which scans existing siblings on every call)
+- ``load_ms``: end-to-end ``_load_configuration`` (Store load, creates, entity
+  mappings, module configs) on a throwaway hass
+
+Usage:
+  python scripts/bench-config-load.py [--sizes 1000 5000] [--repeat 3]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import sys
+import tempfile
+import time
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from home_topology import EventBus, EventFilter, LocationManager  # noqa: E402
+from homeassistant.core import HomeAssistant  # noqa: E402
+from homeassistant.helpers.storage import Store  # noqa: E402
+
+from custom_components.topomation import (  # noqa: E402
+    _configuration_payload,
+    _load_configuration,
+    _location_restore_plan,
+    _pending_restore_key,
+)
+from custom_components.topomation.const import (  # noqa: E402
+    STORAGE_KEY_CONFIG,
+    STORAGE_VERSION,
+)
+
+
+def _wide_config(size: int) -> dict[str, Any]:
+    """Property → buildings → floors → areas, one motion entity per area."""
+    loc_mgr = LocationManager()
+    loc_mgr.create_location(id="home", name="Home", is_explicit_root=True)
+    count = 1
+    building = floor = area = 0
+    while count < size:
+        building_id = f"building_{building}"
+        loc_mgr.create_location(id=building_id, name=building_id, parent_id="home")
+        count += 1
+        building += 1
+        for _ in range(4):
+            if count >= size:
+                break
+            floor_id = f"floor_{floor}"
+            loc_mgr.create_location(id=floor_id, name=floor_id, parent_id=building_id)
+            count += 1
+            floor += 1
+            for _ in range(12):
+                if count >= size:
+                    break
+                area_id = f"area_{area}"
+                loc_mgr.create_location(id=area_id, name=area_id, parent_id=floor_id)
+                loc_mgr.add_entity_to_location(f"binary_sensor.{area_id}_motion", area_id)
+                loc_mgr.set_module_config(area_id, "_meta", {"type": "area"})
+                count += 1
+                area += 1
+    return _configuration_payload(loc_mgr)
+
+
+def _deep_config(size: int, depth: int = 100) -> dict[str, Any]:
+    """Chains of nested areas under one floor.
+
+    Ids count down with depth, so a child's restore key sorts before its
+    parent's and the legacy loop restores only one level per pass.
+    """
+    loc_mgr = LocationManager()
+    loc_mgr.create_location(id="floor_deep", name="Deep Floor", is_explicit_root=True)
+    parent_id = "floor_deep"
+    for index in range(size - 1):
+        location_id = f"area_{size - index:06d}"
+        loc_mgr.create_location(id=location_id, name=location_id, parent_id=parent_id)
+        parent_id = location_id if (index + 1) % depth else "floor_deep"
+    return _configuration_payload(loc_mgr)
+
+
+def _legacy_create(pending: dict[str, Mapping[str, Any]], loc_mgr: LocationManager) -> int:
+    """Pre-change restore loop: re-sort pending and retry until every parent exists."""
+    pending = dict(pending)
+    created: set[str] = set()
+    while pending:
+        progressed = False
+        for location_id, item in sorted(
+            pending.items(), key=lambda entry: _pending_restore_key(entry[0], entry[1])
+        ):
+            parent_id = item.get("parent_id")
+            if parent_id and parent_id not in created and loc_mgr.get_location(parent_id) is None:
+                continue
+            if loc_mgr.get_location(location_id) is None:
+                loc_mgr.create_location(
+                    id=location_id,
+                    name=item.get("name", location_id),
+                    parent_id=parent_id,
+                    is_explicit_root=bool(item.get("is_explicit_root", False)),
+                    order=item.get("order"),
+                )
+            created.add(location_id)
+            pending.pop(location_id)
+            progressed = True
+        if not progressed:
+            raise RuntimeError("benchmark configs have no cycles")
+    return len(created)
+
+
+def _plan_create(pending: dict[str, Mapping[str, Any]], loc_mgr: LocationManager) -> int:
+    """Single-pass restore ordering plus creates, as ``_load_configuration`` does."""
+    for location_id, item, _orphaned in _location_restore_plan(pending, loc_mgr):
+        loc_mgr.create_location(
+            id=location_id,
+            name=item.get("name", location_id),
+            parent_id=item.get("parent_id"),
+            is_explicit_root=bool(item.get("is_explicit_root", False)),
+            order=item.get("order"),
+        )
+    return len(pending)
+
+
+def _attached_manager() -> LocationManager:
+    """Manager wired to a bus with one subscriber, as at setup before this change."""
+    loc_mgr = LocationManager()
+    bus = EventBus()
+    bus.set_location_manager(loc_mgr)
+    bus.subscribe(lambda _event: None, EventFilter())
+    loc_mgr.set_event_bus(bus)
+    return loc_mgr
+
+
+async def _load_ms(config: dict[str, Any], repeat: int) -> float:
+    best = float("inf")
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        await Store(hass, STORAGE_VERSION, STORAGE_KEY_CONFIG).async_save(config)
+        for _ in range(repeat):
+            loc_mgr = LocationManager()
+            started = time.perf_counter()
+            await _load_configuration(hass, loc_mgr)
+            best = min(best, time.perf_counter() - started)
+        await hass.async_stop(force=True)
+    return best * 1000
+
+
+def _best_ms(repeat: int, func: Any, pending: dict[str, Any], factory: Any) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        loc_mgr = factory()
+        started = time.perf_counter()
+        func(pending, loc_mgr)
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 5000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    print(
+        f"{'shape':<6} {'size':>6} {'legacy_ms':>10} {'plan_ms':>10} {'speedup':>8} "
+        f"{'order_ms':>9} {'load_ms':>9}"
+    )
+    for shape, factory in (("wide", _wide_config), ("deep", _deep_config)):
+        for size in args.sizes:
+            config = factory(size)
+            random.Random(args.seed).shuffle(config["locations"])  # noqa: S311
+            pending = {item["id"]: item for item in config["locations"]}
+
+            legacy_ms = _best_ms(args.repeat, _legacy_create, pending, _attached_manager)
+            plan_ms = _best_ms(args.repeat, _plan_create, pending, LocationManager)
+            order_ms = _best_ms(args.repeat, _location_restore_plan, pending, LocationManager)
+            load_ms = asyncio.run(_load_ms(config, args.repeat))
+            print(
+                f"{shape:<6} {size:>6} {legacy_ms:>10.1f} {plan_ms:>10.1f} "
+                f"{legacy_ms / plan_ms:>7.1f}x {order_ms:>9.1f} {load_ms:>9.1f}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""Microbenchmark EventBridge dispatch on a synthetic state_changed stream.
+
+Builds a topology whose areas reference a small share of a large entity
+population as occupancy sources, then feeds a shuffled stream of on/off state
+changes for every entity straight into ``EventBridge._state_changed_listener``
+and reports events per second.
+
+With ``--hass`` the same stream is also fired on a real Home Assistant bus,
+once with a raw ``state_changed`` listener and once with the bridge's filtered
+subscriptions, and the number of callbacks avoided is reported (scaled to
+``--writes-per-minute``).
+
+Usage:
+  python scripts/bench-event-bridge.py [--entities 20000] [--areas 250] [--events 200000]
+  python scripts/bench-event-bridge.py --hass [--writes-per-minute 30000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from home_topology import EventBus, EventFilter, LocationManager  # noqa: E402
+from home_topology.modules.occupancy import OccupancyModule  # noqa: E402
+from homeassistant.const import EVENT_STATE_CHANGED  # noqa: E402
+from homeassistant.core import HomeAssistant, State, callback  # noqa: E402
+
+from custom_components.topomation.event_bridge import EventBridge  # noqa: E402
+
+SOURCES_PER_AREA = 4
+
+
+def _build_topology(areas: int) -> tuple[LocationManager, EventBus, list[str]]:
+    """Create ``areas`` rooms under one floor, each with motion/door/light/presence sources."""
+    bus = EventBus()
+    loc_mgr = LocationManager()
+    bus.set_location_manager(loc_mgr)
+    loc_mgr.set_event_bus(bus)
+    loc_mgr.create_location(id="floor_main", name="Main Floor")
+
+    source_entities: list[str] = []
+    for index in range(areas):
+        area_id = f"area_{index}"
+        loc_mgr.create_location(id=area_id, name=area_id, parent_id="floor_main")
+        entity_ids = [
+            f"binary_sensor.area_{index}_motion",
+            f"binary_sensor.area_{index}_door",
+            f"light.area_{index}",
+            f"binary_sensor.area_{index}_presence",
+        ][:SOURCES_PER_AREA]
+        sources = []
+        for entity_id in entity_ids:
+            loc_mgr.add_entity_to_location(entity_id, area_id)
+            sources.append(
+                {
+                    "entity_id": entity_id,
+                    "mode": "specific_states",
+                    "on_event": "trigger",
+                    "on_timeout": 300,
+                    "off_event": "clear",
+                    "off_trailing": 0,
+                }
+            )
+        loc_mgr.set_module_config(
+            area_id,
+            "occupancy",
+            {"enabled": True, "default_timeout": 300, "occupancy_sources": sources},
+        )
+        source_entities.extend(entity_ids)
+    return loc_mgr, bus, source_entities
+
+
+def _build_stream(
+    source_entities: list[str], total_entities: int, events: int, seed: int
+) -> list[SimpleNamespace]:
+    """Pre-build state_changed events so the timed loop measures only the bridge."""
+    rng = random.Random(seed)  # noqa: S311 - reproducible fixture data
+    unrelated = [
+        f"sensor.power_meter_{index}"
+        for index in range(max(0, total_entities - len(source_entities)))
+    ]
+    population = source_entities + unrelated
+    transitions: dict[str, tuple[SimpleNamespace, SimpleNamespace]] = {}
+    stream: list[SimpleNamespace] = []
+    for _ in range(events):
+        entity_id = population[rng.randrange(len(population))]
+        pair = transitions.get(entity_id)
+        if pair is None:
+            off_state = State(entity_id, "off")
+            on_state = State(entity_id, "on")
+            pair = (
+                SimpleNamespace(
+                    data={"entity_id": entity_id, "old_state": off_state, "new_state": on_state}
+                ),
+                SimpleNamespace(
+                    data={"entity_id": entity_id, "old_state": on_state, "new_state": off_state}
+                ),
+            )
+            transitions[entity_id] = pair
+        stream.append(pair[len(stream) % 2])
+    return stream
+
+
+async def _measure_subscriptions(
+    loc_mgr: LocationManager,
+    bus: EventBus,
+    occupancy: OccupancyModule,
+    stream: list[SimpleNamespace],
+    writes_per_minute: int,
+) -> None:
+    """Fire the stream on a real HA bus with raw vs filtered bridge subscriptions."""
+    hass = HomeAssistant(tempfile.mkdtemp())
+    results: dict[str, tuple[int, float]] = {}
+    for mode in ("raw", "filtered"):
+        bridge = EventBridge(hass, bus, loc_mgr, occupancy_module=occupancy)
+        listener = bridge._state_changed_listener
+        calls = 0
+
+        @callback
+        def _counting_listener(event: object, listener: object = listener) -> None:
+            nonlocal calls
+            calls += 1
+            listener(event)
+
+        bridge._state_changed_listener = _counting_listener
+        unsub_raw = None
+        if mode == "raw":
+            unsub_raw = hass.bus.async_listen(EVENT_STATE_CHANGED, _counting_listener)
+        else:
+            await bridge.async_setup()
+
+        started = time.perf_counter()
+        for event in stream:
+            hass.bus.async_fire(EVENT_STATE_CHANGED, event.data)
+        await hass.async_block_till_done()
+        results[mode] = (calls, time.perf_counter() - started)
+
+        if unsub_raw is not None:
+            unsub_raw()
+        else:
+            await bridge.async_teardown()
+    await hass.async_stop(force=True)
+
+    raw_calls, raw_s = results["raw"]
+    filtered_calls, filtered_s = results["filtered"]
+    avoided = raw_calls - filtered_calls
+    print(
+        f"hass raw_callbacks={raw_calls} filtered_callbacks={filtered_calls} "
+        f"avoided={avoided} ({avoided / max(1, raw_calls):.1%})"
+    )
+    print(f"hass raw_s={raw_s:.3f} filtered_s={filtered_s:.3f}")
+    print(
+        f"callbacks_avoided_per_min={avoided / max(1, raw_calls) * writes_per_minute:,.0f} "
+        f"at writes_per_minute={writes_per_minute:,}"
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entities", type=int, default=20_000)
+    parser.add_argument("--areas", type=int, default=250)
+    parser.add_argument("--events", type=int, default=200_000)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--hass", action="store_true")
+    parser.add_argument("--writes-per-minute", type=int, default=30_000)
+    args = parser.parse_args()
+
+    loc_mgr, bus, source_entities = _build_topology(args.areas)
+    occupancy = OccupancyModule()
+    occupancy.attach(bus, loc_mgr)
+    published = 0
+
+    def _count(_event: object) -> None:
+        nonlocal published
+        published += 1
+
+    bus.subscribe(_count, EventFilter(event_type="occupancy.signal"))
+    bridge = EventBridge(SimpleNamespace(), bus, loc_mgr, occupancy_module=occupancy)
+    stream = _build_stream(source_entities, args.entities, args.events, args.seed)
+
+    listener = bridge._state_changed_listener
+    started = time.perf_counter()
+    for event in stream:
+        listener(event)
+    elapsed = time.perf_counter() - started
+
+    print(
+        f"entities={args.entities} source_entities={len(source_entities)} "
+        f"events={len(stream)} signals={published}"
+    )
+    print(f"elapsed_s={elapsed:.3f} events_per_s={len(stream) / elapsed:,.0f}")
+
+    if args.hass:
+        asyncio.run(
+            _measure_subscriptions(loc_mgr, bus, occupancy, stream, args.writes_per_minute)
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
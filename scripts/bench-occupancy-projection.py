@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""Benchmark occupancy projection rollups on synthetic topologies.
+
+Builds 1k/5k-location trees (wide house-shaped and 100-deep chains), checks
+that the post-order subtree rollup matches the legacy per-location descendant
+walk, and reports timings for both plus a full projection pass.
+
+Usage:
+  python scripts/bench-occupancy-projection.py [--sizes 1000 5000] [--repeat 3]
+"""
+
+from __future__ import annotations
+
+import argparse
+import functools
+import random
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from home_topology import LocationManager  # noqa: E402
+
+from custom_components.topomation.websocket_api import (  # noqa: E402
+    _is_managed_shadow_area,
+    _location_id,
+    _projection_topology,
+    _subtree_rollups,
+    build_occupancy_projection_states,
+)
+
+
+class _FakeOccupancy:
+    """Occupancy module stand-in that serves precomputed runtime payloads."""
+
+    def __init__(self, states: dict[str, dict[str, Any] | None]) -> None:
+        self._states = states
+
+    def get_location_state(self, location_id: str) -> dict[str, Any] | None:
+        return self._states.get(location_id)
+
+
+def _wide_topology(size: int) -> LocationManager:
+    """Property → buildings → floors (with shadows) → areas → subareas."""
+    loc_mgr = LocationManager()
+    loc_mgr.create_location(id="home", name="Home")
+    loc_mgr.set_module_config("home", "_meta", {"type": "property"})
+    count = 1
+    building = floor = area = 0
+    while count < size:
+        building_id = f"building_{building}"
+        loc_mgr.create_location(id=building_id, name=building_id, parent_id="home")
+        loc_mgr.set_module_config(building_id, "_meta", {"type": "building"})
+        count += 1
+        building += 1
+        for _ in range(4):
+            if count >= size:
+                break
+            floor_id = f"floor_{floor}"
+            shadow_id = f"area_shadow_{floor}"
+            loc_mgr.create_location(id=floor_id, name=floor_id, parent_id=building_id)
+            loc_mgr.set_module_config(
+                floor_id, "_meta", {"type": "floor", "shadow_area_id": shadow_id}
+            )
+            loc_mgr.create_location(id=shadow_id, name=shadow_id, parent_id=floor_id)
+            loc_mgr.set_module_config(
+                shadow_id,
+                "_meta",
+                {"type": "area", "role": "managed_shadow", "shadow_for_location_id": floor_id},
+            )
+            count += 2
+            floor += 1
+            for _ in range(12):
+                if count >= size:
+                    break
+                area_id = f"area_{area}"
+                loc_mgr.create_location(id=area_id, name=area_id, parent_id=floor_id)
+                loc_mgr.set_module_config(area_id, "_meta", {"type": "area"})
+                count += 1
+                area += 1
+                if area % 3 == 0 and count < size:
+                    subarea_id = f"subarea_{area}"
+                    loc_mgr.create_location(id=subarea_id, name=subarea_id, parent_id=area_id)
+                    loc_mgr.set_module_config(subarea_id, "_meta", {"type": "subarea"})
+                    count += 1
+    return loc_mgr
+
+
+def _deep_topology(size: int, depth: int = 100) -> LocationManager:
+    """Chains of nested areas under one floor (worst case for per-location subtree walks)."""
+    loc_mgr = LocationManager()
+    loc_mgr.create_location(id="floor_deep", name="Deep Floor")
+    loc_mgr.set_module_config("floor_deep", "_meta", {"type": "floor"})
+    parent_id = "floor_deep"
+    for index in range(size - 1):
+        location_id = f"area_{index}"
+        loc_mgr.create_location(id=location_id, name=location_id, parent_id=parent_id)
+        loc_mgr.set_module_config(location_id, "_meta", {"type": "area"})
+        parent_id = location_id if (index + 1) % depth else "floor_deep"
+    return loc_mgr
+
+
+def _runtime_states(loc_mgr: LocationManager, seed: int) -> dict[str, dict[str, Any] | None]:
+    """Mostly vacant house with a few occupied rooms and some missing records."""
+    rng = random.Random(seed)  # noqa: S311 - reproducible fixture data
+    states: dict[str, dict[str, Any] | None] = {}
+    for location in loc_mgr.all_locations():
+        roll = rng.random()
+        if roll < 0.05:
+            states[location.id] = {"occupied": True, "contributions": []}
+        elif roll < 0.85:
+            states[location.id] = {"occupied": False, "contributions": []}
+        else:
+            states[location.id] = None
+    return states
+
+
+def _legacy_rollups(
+    topology: Any, raw_states: dict[str, Any]
+) -> dict[str, tuple[str | None, int]]:
+    """Pre-change rollup: re-walk every location's descendants with list.pop(0)."""
+
+    def descendant_ids(location_id: str) -> list[str]:
+        result: list[str] = []
+        stack = list(topology.by_parent.get(location_id, []))
+        while stack:
+            child = stack.pop(0)
+            child_id = _location_id(child)
+            if child_id:
+                result.append(child_id)
+            stack[0:0] = topology.by_parent.get(child_id, [])
+        return result
+
+    def occupied_of(location_id: str) -> Any:
+        payload = raw_states.get(location_id)
+        return payload.get("occupied") if isinstance(payload, dict) else None
+
+    rollups: dict[str, tuple[str | None, int]] = {}
+    for location in topology.locations:
+        location_id = _location_id(location)
+        first: str | None = None
+        for child_id in descendant_ids(location_id):
+            if _is_managed_shadow_area(topology.locations_by_id[child_id]):
+                continue
+            if occupied_of(child_id) is True:
+                first = child_id
+                break
+        vacant = 0
+        for child_id in descendant_ids(location_id):
+            if _is_managed_shadow_area(topology.locations_by_id[child_id]):
+                continue
+            if occupied_of(child_id) is False:
+                vacant += 1
+        rollups[location_id] = (first, vacant)
+    return rollups
+
+
+def _best_of(repeat: int, func: Any) -> tuple[float, Any]:
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 5000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    hass = SimpleNamespace(states=SimpleNamespace(async_all=lambda _domain=None: []))
+    print(
+        f"{'shape':<6} {'size':>6} {'legacy_ms':>10} {'rollup_ms':>10} "
+        f"{'speedup':>8} {'projection_ms':>14}"
+    )
+    for shape, factory in (("wide", _wide_topology), ("deep", _deep_topology)):
+        for size in args.sizes:
+            loc_mgr = factory(size)
+            raw_states = _runtime_states(loc_mgr, args.seed)
+            topology = _projection_topology(loc_mgr)
+
+            legacy_s, legacy = _best_of(
+                args.repeat, functools.partial(_legacy_rollups, topology, raw_states)
+            )
+            rollup_s, rollups = _best_of(
+                args.repeat, functools.partial(_subtree_rollups, topology, raw_states)
+            )
+            current = {
+                location_id: (rollup.first_occupied_id, rollup.vacant_count)
+                for location_id, rollup in rollups.items()
+            }
+            if current != legacy:
+                print(f"{shape} {size}: rollup mismatch against legacy walk", file=sys.stderr)
+                return 1
+
+            kernel = {
+                "location_manager": loc_mgr,
+                "modules": {"occupancy": _FakeOccupancy(raw_states)},
+                "occupancy_recent_changes": {},
+            }
+            projection_s, _ = _best_of(
+                args.repeat, functools.partial(build_occupancy_projection_states, hass, kernel)
+            )
+            print(
+                f"{shape:<6} {len(topology.locations):>6} {legacy_s * 1000:>10.1f} "
+                f"{rollup_s * 1000:>10.1f} {legacy_s / rollup_s:>7.0f}x "
+                f"{projection_s * 1000:>14.1f}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
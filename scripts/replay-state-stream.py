@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""Replay a recorded EventBridge state stream on a local Home Assistant.
+
+Restores the topology from the capture header through the integration's
+config-restore path, wires EventBridge -> kernel EventBus -> OccupancyModule on
+a throwaway hass, and fires every recorded state change on the HA bus, either
+at full speed or paced by the recorded timestamps (``--speed 10`` = 10x faster
+than real time). Each event's ``time_fired`` is the recorded time, so trigger
+coalescing suppresses the same events at any speed. Occupancy timeouts are not
+expired during replay.
+
+Reports events per second, per-stage latency percentiles (HA dispatch, bridge,
+kernel publish including OccupancyModule) and the kernel events produced.
+Record a stream with the ``topomation.capture_state_stream`` service.
+
+Usage:
+  python scripts/replay-state-stream.py CAPTURE.jsonl [--speed 0] [--repeat 1]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from home_topology import EventBus, EventFilter, LocationManager  # noqa: E402
+from home_topology.modules.occupancy import OccupancyModule  # noqa: E402
+from homeassistant.core import HomeAssistant, callback  # noqa: E402
+from homeassistant.helpers.storage import Store  # noqa: E402
+
+from custom_components.topomation import (  # noqa: E402
+    _load_configuration,
+    _setup_default_configs,
+)
+from custom_components.topomation.const import (  # noqa: E402
+    STORAGE_KEY_CONFIG,
+    STORAGE_VERSION,
+)
+from custom_components.topomation.event_bridge import EventBridge  # noqa: E402
+from custom_components.topomation.state_capture import (  # noqa: E402
+    async_fire_recorded_state_change,
+    load_state_stream,
+)
+
+STAGES = ("ha_dispatch", "bridge", "kernel")
+
+
+def _percentiles(samples: list[float]) -> str:
+    """Format p50/p95/p99/max of ``samples`` (seconds) in microseconds."""
+    if not samples:
+        return "n/a"
+    ordered = sorted(samples)
+
+    def _at(fraction: float) -> float:
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] * 1e6
+
+    return (
+        f"p50={_at(0.50):.1f}us p95={_at(0.95):.1f}us "
+        f"p99={_at(0.99):.1f}us max={ordered[-1] * 1e6:.1f}us"
+    )
+
+
+async def _replay(
+    config: dict[str, Any], records: list[dict[str, Any]], speed: float
+) -> tuple[float, int, dict[str, list[float]], Counter[str]]:
+    """Replay one pass; return (elapsed, events reaching the bridge, stage samples, kernel events)."""
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        await Store(hass, STORAGE_VERSION, STORAGE_KEY_CONFIG).async_save(config)
+
+        loc_mgr = LocationManager()
+        bus = EventBus()
+        bus.set_location_manager(loc_mgr)
+        await _load_configuration(hass, loc_mgr)
+        loc_mgr.set_event_bus(bus)
+        occupancy = OccupancyModule()
+        occupancy.attach(bus, loc_mgr)
+        _setup_default_configs(loc_mgr, {"occupancy": occupancy})
+
+        kernel_events: Counter[str] = Counter()
+        bus.subscribe(lambda event: kernel_events.update((event.type,)), EventFilter())
+
+        stages: dict[str, list[float]] = {stage: [] for stage in STAGES}
+        kernel_s = 0.0
+        # time_fired carries recorded time, so dispatch latency uses the real fire time.
+        fired_at = 0.0
+        publish = bus.publish
+
+        def _timed_publish(event: Any) -> None:
+            nonlocal kernel_s
+            started = time.perf_counter()
+            try:
+                publish(event)
+            finally:
+                kernel_s += time.perf_counter() - started
+
+        bus.publish = _timed_publish
+        bridge = EventBridge(hass, bus, loc_mgr, occupancy_module=occupancy)
+        listener = bridge._state_changed_listener
+
+        @callback
+        def _timed_listener(event: Any) -> None:
+            nonlocal kernel_s
+            stages["ha_dispatch"].append(max(0.0, time.perf_counter() - fired_at))
+            kernel_s = 0.0
+            started = time.perf_counter()
+            listener(event)
+            total = time.perf_counter() - started
+            stages["bridge"].append(total - kernel_s)
+            stages["kernel"].append(kernel_s)
+
+        bridge._state_changed_listener = _timed_listener
+        await bridge.async_setup()
+        kernel_events.clear()
+
+        started = time.perf_counter()
+        replay_started = time.time()
+        for record in records:
+            if speed > 0:
+                delay = record.get("t", 0.0) / speed - (time.perf_counter() - started)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            fired_at = time.perf_counter()
+            async_fire_recorded_state_change(hass, record, replay_started)
+            # Let the listener run before the next event so dispatch latency is per event.
+            await asyncio.sleep(0)
+        await hass.async_block_till_done()
+        elapsed = time.perf_counter() - started
+
+        await bridge.async_teardown()
+        await hass.async_stop(force=True)
+    return elapsed, len(stages["bridge"]), stages, kernel_events
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("capture", type=Path)
+    parser.add_argument(
+        "--speed", type=float, default=0.0, help="time multiplier; 0 replays at full speed"
+    )
+    parser.add_argument("--repeat", type=int, default=1)
+    args = parser.parse_args()
+
+    header, records = load_state_stream(args.capture)
+    config = header.get("config")
+    if not isinstance(config, dict):
+        print(f"{args.capture}: missing capture header", file=sys.stderr)
+        return 1
+
+    print(
+        f"capture={args.capture} events={len(records)} "
+        f"locations={len(config.get('locations', []))} speed={args.speed or 'full'}"
+    )
+    for run in range(1, args.repeat + 1):
+        elapsed, reached, stages, kernel_events = asyncio.run(
+            _replay(config, records, args.speed)
+        )
+        print(
+            f"run={run} elapsed_s={elapsed:.3f} events_per_s={len(records) / elapsed:,.0f} "
+            f"reached_bridge={reached}"
+        )
+        for stage in STAGES:
+            print(f"  {stage:<12} {_percentiles(stages[stage])}")
+        produced = ", ".join(f"{kind}={count}" for kind, count in sorted(kernel_events.items()))
+        print(f"  kernel_events {produced or 'none'}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
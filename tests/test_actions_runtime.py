@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
 from dataclasses import dataclass
 from types import SimpleNamespace
@@ -10,10 +11,12 @@ from unittest.mock import AsyncMock, Mock, patch
 from home_topology import Event, EventBus
 from homeassistant.components.automation import DATA_COMPONENT as AUTOMATION_DATA_COMPONENT
 from homeassistant.core import CoreState, HomeAssistant
+from homeassistant.helpers import entity_registry as er
 from pytest_homeassistant_custom_component.common import async_capture_events
 
 from custom_components.topomation.actions_runtime import TopomationActionsRuntime
 from custom_components.topomation.const import (
+    DOMAIN,
     EVENT_TOPOMATION_ACTIONS_SUMMARY,
     TOPOMATION_AUTOMATION_METADATA_PREFIX,
 )
@@ -24,6 +27,16 @@ class _Location:
     id: str
 
 
+def _register_occupancy_entity(hass: HomeAssistant, location_id: str, object_id: str) -> None:
+    """Register a Topomation occupancy sensor so runtime lookups can resolve it."""
+    er.async_get(hass).async_get_or_create(
+        "binary_sensor",
+        DOMAIN,
+        f"occupancy_{location_id}",
+        suggested_object_id=object_id,
+    )
+
+
 class _LocationManager:
     """Minimal location manager surface needed by TopomationActionsRuntime tests."""
 
@@ -172,6 +185,7 @@ async def test_startup_reapply_reports_failures(hass: HomeAssistant) -> None:
     )
     hass.states.async_set("automation.kitchen_primary", "on")
     hass.states.async_set("automation.kitchen_secondary", "on")
+    _register_occupancy_entity(hass, location_id, "kitchen_occupancy")
     hass.states.async_set(
         "binary_sensor.kitchen_occupancy",
         "on",
@@ -278,7 +292,7 @@ async def test_startup_reapply_runs_ambient_rules_without_occupancy_sensor(
 async def test_startup_reapply_waits_for_lux_before_ambient_rule(
     hass: HomeAssistant,
 ) -> None:
-    """Ambient startup replay should wait for lux sensors during the reconcile window."""
+    """Ambient startup replay waits for lux and fires once the lux sensor reports."""
     location_id = "area_porch"
     location_manager = _LocationManager({location_id: {}})
     event_bus = EventBus()
@@ -322,9 +336,15 @@ async def test_startup_reapply_waits_for_lux_before_ambient_rule(
         await runtime.async_reapply_startup_actions()
         await hass.async_block_till_done()
         mock_async_call.assert_not_awaited()
+        assert runtime.startup_reapply_diagnostics()["watched_entities"] == 1
+
+        # Unrelated entities and still-unknown lux do not re-evaluate anything.
+        hass.states.async_set("sensor.hallway_lux", "3")
+        hass.states.async_set("sensor.porch_lux", "unavailable")
+        await hass.async_block_till_done()
+        assert len(events) == 1
 
         hass.states.async_set("sensor.porch_lux", "3")
-        await runtime.async_reapply_startup_actions()
         await hass.async_block_till_done()
 
     mock_async_call.assert_awaited_once_with(
@@ -335,7 +355,149 @@ async def test_startup_reapply_waits_for_lux_before_ambient_rule(
     )
     assert events[0].data["pending_automations"] == 1
     assert events[0].data["pending_details"][0]["reason"] == "waiting_for_lux_state"
+    assert len(events) == 2
     assert events[-1].data["triggered_automations"] == 1
+    diagnostics = runtime.startup_reapply_diagnostics()
+    assert diagnostics["waiting_locations"] == 0
+    assert diagnostics["watched_entities"] == 0
+    await runtime.async_teardown()
+
+
+async def test_startup_reapply_fires_when_occupancy_state_becomes_known(
+    hass: HomeAssistant,
+) -> None:
+    """Rules waiting on occupancy re-evaluate on the sensor's state change, not a poll."""
+    location_id = "area_kitchen"
+    location_manager = _LocationManager({location_id: {}})
+    runtime = TopomationActionsRuntime(
+        hass,
+        location_manager,
+        EventBus(),
+        startup_delay_seconds=0,
+        startup_reconcile_interval_seconds=30,
+        startup_reconcile_timeout_seconds=60,
+    )
+    hass.data[AUTOMATION_DATA_COMPONENT] = SimpleNamespace(
+        entities=[
+            _AutomationEntity(
+                entity_id="automation.kitchen_occupied",
+                raw_config={
+                    "description": _metadata_line(
+                        location_id, "on_occupied", run_on_startup=True
+                    )
+                },
+            ),
+        ]
+    )
+    hass.states.async_set("automation.kitchen_occupied", "on")
+    _register_occupancy_entity(hass, location_id, "kitchen_occupancy")
+    hass.states.async_set(
+        "binary_sensor.kitchen_occupancy",
+        "unknown",
+        {"device_class": "occupancy", "location_id": location_id},
+    )
+
+    mock_async_call = AsyncMock(return_value=None)
+    with patch("homeassistant.core.ServiceRegistry.async_call", new=mock_async_call):
+        events = async_capture_events(hass, EVENT_TOPOMATION_ACTIONS_SUMMARY)
+        await runtime.async_reapply_startup_actions()
+        await hass.async_block_till_done()
+        mock_async_call.assert_not_awaited()
+        assert events[-1].data["pending_details"][0]["reason"] == (
+            "waiting_for_occupancy_state"
+        )
+        assert runtime._startup_reconcile_retry_unsub is None
+
+        hass.states.async_set(
+            "binary_sensor.kitchen_occupancy",
+            "on",
+            {"device_class": "occupancy", "location_id": location_id},
+        )
+        await hass.async_block_till_done()
+
+    mock_async_call.assert_awaited_once_with(
+        "automation",
+        "trigger",
+        {"entity_id": "automation.kitchen_occupied", "skip_condition": False},
+        blocking=True,
+    )
+    assert events[-1].data["transition"] == "occupied"
+    await runtime.async_teardown()
+
+
+async def test_startup_reapply_catches_state_that_changed_during_trigger_pass(
+    hass: HomeAssistant,
+) -> None:
+    """A prerequisite that becomes known while a trigger is awaiting is not missed."""
+    location_id = "area_porch"
+    location_manager = _LocationManager({location_id: {}})
+    runtime = TopomationActionsRuntime(
+        hass,
+        location_manager,
+        EventBus(),
+        startup_delay_seconds=0,
+        startup_reconcile_interval_seconds=30,
+        startup_reconcile_timeout_seconds=60,
+    )
+    hass.data[AUTOMATION_DATA_COMPONENT] = SimpleNamespace(
+        entities=[
+            _AutomationEntity(
+                entity_id="automation.porch_occupied",
+                raw_config={
+                    "description": _metadata_line(
+                        location_id, "on_occupied", run_on_startup=True
+                    )
+                },
+            ),
+            _AutomationEntity(
+                entity_id="automation.porch_dark",
+                raw_config={
+                    "description": _metadata_line(
+                        location_id, "on_dark", run_on_startup=True
+                    ),
+                    "triggers": [
+                        {
+                            "trigger": "numeric_state",
+                            "entity_id": "sensor.porch_lux",
+                            "below": 800,
+                        }
+                    ],
+                },
+            ),
+        ]
+    )
+    hass.states.async_set("automation.porch_occupied", "on")
+    hass.states.async_set("automation.porch_dark", "on")
+    hass.states.async_set("sensor.porch_lux", "unknown")
+    _register_occupancy_entity(hass, location_id, "porch_occupancy")
+    hass.states.async_set(
+        "binary_sensor.porch_occupancy",
+        "on",
+        {"device_class": "occupancy", "location_id": location_id},
+    )
+
+    async def _trigger(domain: str, service: str, data: dict, **kwargs: object) -> None:
+        if data["entity_id"] == "automation.porch_occupied":
+            # Lux becomes known while this blocking trigger is still running,
+            # before the runtime has subscribed to it.
+            hass.states.async_set("sensor.porch_lux", "3")
+
+    mock_async_call = AsyncMock(side_effect=_trigger)
+    with (
+        patch("homeassistant.core.ServiceRegistry.async_call", new=mock_async_call),
+        patch(
+            "custom_components.topomation.actions_runtime.async_call_later",
+            return_value=Mock(),
+        ) as mock_call_later,
+    ):
+        await runtime.async_reapply_startup_actions()
+        await hass.async_block_till_done()
+
+    triggered = [call.args[2]["entity_id"] for call in mock_async_call.await_args_list]
+    assert triggered == ["automation.porch_occupied", "automation.porch_dark"]
+    # Only the reconcile timeout was armed; no poll or timeout fired to get here.
+    assert mock_call_later.call_count == 1
+    assert runtime.startup_reapply_diagnostics()["waiting_locations"] == 0
     await runtime.async_teardown()
 
 
@@ -597,6 +759,7 @@ async def test_startup_reapply_honors_per_rule_run_on_startup_without_global_fla
     hass.states.async_set("automation.kitchen_dark", "on")
     hass.states.async_set("automation.kitchen_occupied", "on")
     hass.states.async_set("sun.sun", "below_horizon")
+    _register_occupancy_entity(hass, location_id, "kitchen_occupancy")
     hass.states.async_set(
         "binary_sensor.kitchen_occupancy",
         "on",
@@ -615,3 +778,144 @@ async def test_startup_reapply_honors_per_rule_run_on_startup_without_global_fla
         {"entity_id": "automation.kitchen_dark", "skip_condition": False},
         blocking=True,
     )
+
+
+async def test_startup_reapply_bounds_concurrency_across_locations(
+    hass: HomeAssistant,
+) -> None:
+    """Locations reapply concurrently up to the limit; each keeps its rule order."""
+    location_ids = [f"area_{index}" for index in range(4)]
+    location_manager = _LocationManager({location_id: {} for location_id in location_ids})
+    runtime = TopomationActionsRuntime(
+        hass,
+        location_manager,
+        EventBus(),
+        startup_delay_seconds=0,
+        startup_reapply_concurrency=2,
+    )
+
+    entities = []
+    for location_id in location_ids:
+        for suffix in ("first", "second"):
+            entity_id = f"automation.{location_id}_{suffix}"
+            entities.append(
+                _AutomationEntity(
+                    entity_id=entity_id,
+                    raw_config={
+                        "description": _metadata_line(
+                            location_id, "on_dark", run_on_startup=True
+                        ),
+                        "triggers": [
+                            {
+                                "trigger": "state",
+                                "entity_id": "sun.sun",
+                                "to": "below_horizon",
+                            }
+                        ],
+                    },
+                )
+            )
+            hass.states.async_set(entity_id, "on")
+        _register_occupancy_entity(hass, location_id, f"{location_id}_occupancy")
+        hass.states.async_set(
+            f"binary_sensor.{location_id}_occupancy",
+            "on",
+            {"device_class": "occupancy", "location_id": location_id},
+        )
+    hass.data[AUTOMATION_DATA_COMPONENT] = SimpleNamespace(entities=entities)
+    hass.states.async_set("sun.sun", "below_horizon")
+
+    in_flight = 0
+    max_in_flight = 0
+    triggered: list[str] = []
+
+    async def _trigger(_domain, _service, data, **_kwargs) -> None:
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        triggered.append(data["entity_id"])
+        in_flight -= 1
+
+    events = async_capture_events(hass, EVENT_TOPOMATION_ACTIONS_SUMMARY)
+    with patch(
+        "homeassistant.core.ServiceRegistry.async_call",
+        new=AsyncMock(side_effect=_trigger),
+    ):
+        await runtime.async_reapply_startup_actions()
+        await hass.async_block_till_done()
+
+    assert max_in_flight == 2
+    assert len(triggered) == 8
+    for location_id in location_ids:
+        assert triggered.index(f"automation.{location_id}_first") < triggered.index(
+            f"automation.{location_id}_second"
+        )
+    assert sorted(event.data["location_id"] for event in events) == location_ids
+    assert all(event.data["phase"] == "startup_reapply" for event in events)
+    summary = runtime.startup_reapply_diagnostics()
+    assert summary is not None
+    assert summary["locations"] == 4
+    assert summary["startup_rules"] == 8
+    assert summary["pending_automations"] == 0
+    assert summary["concurrency"] == 2
+
+
+async def test_automation_catalog_is_reused_until_automations_reload(
+    hass: HomeAssistant,
+) -> None:
+    """Transitions read the parsed catalog; reloads and registry edits rebuild it."""
+    location_id = "area_kitchen"
+    location_manager = _LocationManager({location_id: {}})
+    event_bus = EventBus()
+    runtime = TopomationActionsRuntime(hass, location_manager, event_bus)
+    hass.data[AUTOMATION_DATA_COMPONENT] = SimpleNamespace(
+        entities=[
+            _AutomationEntity(
+                entity_id="automation.kitchen_on_occupied",
+                raw_config={"description": _metadata_line(location_id, "on_occupied")},
+            ),
+        ]
+    )
+    events = async_capture_events(hass, EVENT_TOPOMATION_ACTIONS_SUMMARY)
+    await runtime.async_setup()
+
+    def _occupied() -> None:
+        event_bus.publish(
+            Event(
+                type="occupancy.changed",
+                source="occupancy",
+                location_id=location_id,
+                payload={"occupied": True},
+            )
+        )
+
+    _occupied()
+    _occupied()
+    await hass.async_block_till_done()
+    assert runtime.catalog_diagnostics()["builds"] == 1
+    assert events[-1].data["automations"] == ["automation.kitchen_on_occupied"]
+
+    # Disabling is checked per lookup without a rebuild.
+    hass.states.async_set("automation.kitchen_on_occupied", "off")
+    _occupied()
+    await hass.async_block_till_done()
+    assert events[-1].data["automations"] == []
+    assert runtime.catalog_diagnostics()["builds"] == 1
+
+    hass.bus.async_fire("automation_reloaded")
+    await hass.async_block_till_done()
+    _occupied()
+    await hass.async_block_till_done()
+    assert runtime.catalog_diagnostics()["builds"] == 2
+
+    er.async_get(hass).async_get_or_create(
+        "automation", "automation", "kitchen_extra", suggested_object_id="kitchen_extra"
+    )
+    await hass.async_block_till_done()
+    _occupied()
+    await hass.async_block_till_done()
+    assert runtime.catalog_diagnostics()["builds"] == 3
+
+    await runtime.async_teardown()
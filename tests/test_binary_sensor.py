@@ -5,15 +5,25 @@ from __future__ import annotations
 from collections import defaultdict, deque
 from datetime import UTC, datetime
 from types import SimpleNamespace
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
 import pytest
 from home_topology.core.bus import Event
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
-from custom_components.topomation.binary_sensor import OccupancyBinarySensor, async_setup_entry
-from custom_components.topomation.const import DOMAIN
+from custom_components.topomation.binary_sensor import (
+    OccupancyBinarySensor,
+    async_get_occupancy_entity_id,
+    async_setup_entry,
+)
+from custom_components.topomation.const import (
+    DOMAIN,
+    EXPLAINABILITY_REFRESH_OFF,
+    EXPLAINABILITY_REFRESH_ON_CHANGE,
+)
+from custom_components.topomation.entity_dispatcher import LocationEventDispatcher
 
 
 @pytest.mark.asyncio
@@ -177,6 +187,165 @@ async def test_binary_sensor_refreshes_recent_changes_on_signal_event() -> None:
     assert sensor.async_write_ha_state.call_count == 1
 
 
+def _signal(location_id: str = "kitchen") -> Event:
+    return Event(
+        type="occupancy.signal",
+        source="event_bridge",
+        location_id=location_id,
+        payload={"event_type": "trigger", "source_id": "binary_sensor.kitchen_motion"},
+        timestamp=datetime.now(UTC),
+    )
+
+
+def _explainability_sensor(bus: Mock, **kwargs: object) -> OccupancyBinarySensor:
+    occupancy_module = Mock()
+    occupancy_module.get_location_state.return_value = {"occupied": True, "contributions": []}
+    occupancy_module.get_effective_timeout.return_value = None
+    sensor = OccupancyBinarySensor(
+        "kitchen",
+        "Kitchen",
+        bus,
+        occupancy_module=occupancy_module,
+        recent_changes_provider=lambda _: [{"kind": "signal", "event": "trigger"}],
+        **kwargs,
+    )
+    sensor.async_write_ha_state = Mock()
+    return sensor
+
+
+@pytest.mark.asyncio
+async def test_binary_sensor_throttles_signal_writes_with_trailing_flush(
+    hass: HomeAssistant,
+) -> None:
+    """Throttled mode writes once per interval and flushes the latest state after it."""
+    bus = Mock()
+    sensor = _explainability_sensor(bus, explainability_throttle_seconds=10.0)
+    sensor.hass = hass
+    await sensor.async_added_to_hass()
+    sensor.async_write_ha_state.reset_mock()
+    on_signal = bus.subscribe.call_args_list[1].args[0]
+
+    with (
+        patch("custom_components.topomation.binary_sensor.time.monotonic", return_value=100.0),
+        patch("custom_components.topomation.binary_sensor.async_call_later") as call_later,
+    ):
+        on_signal(_signal())
+        on_signal(_signal())
+        on_signal(_signal())
+
+    assert sensor.async_write_ha_state.call_count == 1
+    call_later.assert_called_once()
+    assert call_later.call_args.args[1] == 10.0
+
+    flush = call_later.call_args.args[2]
+    flush(datetime.now(UTC))
+    assert sensor.async_write_ha_state.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_binary_sensor_throttle_counts_occupancy_change_writes(
+    hass: HomeAssistant,
+) -> None:
+    """A signal right after an occupancy.changed write waits out the throttle window."""
+    bus = Mock()
+    sensor = _explainability_sensor(bus, explainability_throttle_seconds=10.0)
+    sensor.hass = hass
+    await sensor.async_added_to_hass()
+    sensor.async_write_ha_state.reset_mock()
+    on_changed = bus.subscribe.call_args_list[0].args[0]
+    on_signal = bus.subscribe.call_args_list[1].args[0]
+
+    with (
+        patch("custom_components.topomation.binary_sensor.time.monotonic", return_value=100.0),
+        patch("custom_components.topomation.binary_sensor.async_call_later") as call_later,
+    ):
+        on_changed(
+            Event(
+                type="occupancy.changed",
+                source="occupancy",
+                location_id="kitchen",
+                payload={"occupied": True, "contributions": []},
+                timestamp=datetime.now(UTC),
+            )
+        )
+        on_signal(_signal())
+
+    assert sensor.async_write_ha_state.call_count == 1
+    call_later.assert_called_once()
+    assert call_later.call_args.args[1] == 10.0
+
+
+@pytest.mark.asyncio
+async def test_binary_sensor_signal_refresh_on_change_and_off_modes() -> None:
+    """on_change skips identical attributes; off never writes on signals."""
+    bus = Mock()
+    on_change = _explainability_sensor(bus, explainability_refresh=EXPLAINABILITY_REFRESH_ON_CHANGE)
+    await on_change.async_added_to_hass()
+    on_change.async_write_ha_state.reset_mock()
+    bus.subscribe.call_args_list[1].args[0](_signal())
+    on_change.async_write_ha_state.assert_not_called()
+
+    on_change._occupancy_module.get_location_state.return_value = {  # noqa: SLF001
+        "occupied": True,
+        "contributions": [{"source_id": "binary_sensor.kitchen_motion"}],
+    }
+    bus.subscribe.call_args_list[1].args[0](_signal())
+    on_change.async_write_ha_state.assert_called_once()
+
+    off_bus = Mock()
+    off = _explainability_sensor(off_bus, explainability_refresh=EXPLAINABILITY_REFRESH_OFF)
+    await off.async_added_to_hass()
+    off.async_write_ha_state.reset_mock()
+    off_bus.subscribe.call_args_list[1].args[0](_signal())
+    off.async_write_ha_state.assert_not_called()
+
+
+def test_binary_sensor_explainability_attributes_are_unrecorded() -> None:
+    """Heavy explainability attributes stay out of the recorder."""
+    assert {"contributions", "recent_changes", "explanation"} <= (
+        OccupancyBinarySensor._unrecorded_attributes  # noqa: SLF001
+    )
+
+
+@pytest.mark.asyncio
+async def test_binary_sensors_share_dispatcher_bus_subscriptions() -> None:
+    """Sensors given a dispatcher share one bus subscription per event type."""
+    bus = Mock()
+    occupancy_module = Mock()
+    occupancy_module.get_location_state.return_value = None
+    occupancy_module.get_effective_timeout.return_value = None
+    dispatcher = LocationEventDispatcher(bus)
+    sensors = [
+        OccupancyBinarySensor(
+            location_id,
+            location_id.title(),
+            bus,
+            occupancy_module=occupancy_module,
+            dispatcher=dispatcher,
+        )
+        for location_id in ("kitchen", "office")
+    ]
+    for sensor in sensors:
+        sensor.async_write_ha_state = Mock()
+        await sensor.async_added_to_hass()
+
+    assert bus.subscribe.call_count == 2
+    on_changed = bus.subscribe.call_args_list[0].args[0]
+    on_changed(
+        Event(
+            type="occupancy.changed",
+            source="occupancy",
+            location_id="office",
+            payload={"occupied": True},
+            timestamp=datetime.now(UTC),
+        )
+    )
+    assert [sensor.is_on for sensor in sensors] == [False, True]
+
+    sensors[1]._call_on_remove_callbacks()  # noqa: SLF001
+    assert dispatcher.diagnostics()["occupancy.changed"]["locations"] == 1
+
+
 @pytest.mark.asyncio
 async def test_binary_sensor_setup_skips_shadow_host_locations(hass: HomeAssistant) -> None:
     """Floor/building/grounds/property hosts use managed shadow areas for occupancy exposure."""
@@ -219,3 +388,30 @@ async def test_binary_sensor_setup_skips_shadow_host_locations(hass: HomeAssista
 
     assert len(added) == 1
     assert added[0]._location_id == "area_kitchen"
+
+
+@pytest.mark.asyncio
+async def test_occupancy_entity_index_tracks_sensor_lifecycle(hass: HomeAssistant) -> None:
+    """Location lookups should follow sensor add/remove and fall back to the registry."""
+    occupancy_module = Mock()
+    occupancy_module.get_location_state.return_value = None
+    occupancy_module.get_effective_timeout.return_value = None
+    sensor = OccupancyBinarySensor("area_kitchen", "Kitchen", Mock(), occupancy_module)
+    sensor.hass = hass
+    sensor.entity_id = "binary_sensor.kitchen_occupancy"
+
+    assert async_get_occupancy_entity_id(hass, "area_kitchen") is None
+
+    await sensor.async_added_to_hass()
+    assert async_get_occupancy_entity_id(hass, "area_kitchen") == "binary_sensor.kitchen_occupancy"
+
+    await sensor.async_will_remove_from_hass()
+    assert async_get_occupancy_entity_id(hass, "area_kitchen") is None
+
+    registry_entry = er.async_get(hass).async_get_or_create(
+        "binary_sensor",
+        DOMAIN,
+        "occupancy_area_office",
+        suggested_object_id="office_occupancy",
+    )
+    assert async_get_occupancy_entity_id(hass, "area_office") == registry_entry.entity_id
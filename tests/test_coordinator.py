@@ -291,3 +291,135 @@ def test_module_without_timeout_support(
     # WHEN / THEN - Should not raise
     with patch("custom_components.topomation.coordinator.async_track_point_in_time"):
         coordinator.schedule_next_timeout()
+
+
+def test_pushed_deadlines_arm_without_polling(
+    coordinator: TopomationCoordinator,
+    mock_modules: dict[str, Mock],
+) -> None:
+    """Test push modules arm the timer from their own deadlines.
+
+    GIVEN: A module bound through push_deadlines_for
+    WHEN: It pushes per-key deadlines and a timeout fires
+    THEN: It is never polled, and only checked once its deadline is due
+    """
+    # GIVEN
+    now = datetime.now(UTC)
+    pushed = Mock()
+    coordinator.modules["recent_activity"] = pushed
+    set_deadline = coordinator.push_deadlines_for("recent_activity")
+
+    with patch(
+        "custom_components.topomation.coordinator.async_track_point_in_time"
+    ) as mock_track:
+        # WHEN
+        set_deadline("home", now + timedelta(minutes=10))
+        set_deadline("cabin", now + timedelta(minutes=5))
+
+        # THEN
+        assert mock_track.call_args[0][2] == now + timedelta(minutes=5)
+        coordinator.schedule_next_timeout()
+        pushed.get_next_timeout.assert_not_called()
+
+        # A polled-module timeout before the push deadline does not check it.
+        coordinator._handle_timeout(now + timedelta(minutes=1))
+        pushed.check_timeouts.assert_not_called()
+        mock_modules["occupancy"].check_timeouts.assert_called_once()
+
+        coordinator._handle_timeout(now + timedelta(minutes=5))
+        pushed.check_timeouts.assert_called_once()
+        assert mock_track.call_args[0][2] == now + timedelta(minutes=10)
+
+
+def test_timer_replaced_only_when_earliest_deadline_moves(
+    coordinator: TopomationCoordinator,
+) -> None:
+    """Test later or unchanged deadlines leave the armed timer alone.
+
+    GIVEN: A timer armed for the earliest pushed deadline
+    WHEN: Later deadlines are pushed, re-pushed, or cleared
+    THEN: The HA timer is replaced only when the earliest deadline changes
+    """
+    # GIVEN
+    now = datetime.now(UTC)
+    set_deadline = coordinator.push_deadlines_for("recent_activity")
+    cancel_first = Mock()
+    cancel_second = Mock()
+
+    with patch(
+        "custom_components.topomation.coordinator.async_track_point_in_time",
+        side_effect=[cancel_first, cancel_second],
+    ) as mock_track:
+        set_deadline("home", now + timedelta(minutes=5))
+
+        # WHEN
+        set_deadline("cabin", now + timedelta(minutes=30))
+        set_deadline("home", now + timedelta(minutes=5))
+        coordinator.schedule_next_timeout()
+
+        # THEN
+        assert mock_track.call_count == 1
+        cancel_first.assert_not_called()
+
+        # Clearing the earliest deadline moves the timer to the next one.
+        set_deadline("home", None)
+        cancel_first.assert_called_once()
+        assert mock_track.call_count == 2
+        assert mock_track.call_args[0][2] == now + timedelta(minutes=30)
+
+
+async def test_reschedule_requests_coalesce_per_loop_iteration(
+    hass: HomeAssistant,
+    coordinator: TopomationCoordinator,
+    mock_modules: dict[str, Mock],
+) -> None:
+    """Test a burst of reschedule requests recomputes once.
+
+    GIVEN: Several kernel events request a reschedule in one loop iteration
+    WHEN: The event loop runs the deferred callback
+    THEN: Modules are polled once and the saved recomputes are counted
+    """
+    # GIVEN
+    timeout = datetime.now(UTC) + timedelta(minutes=5)
+    mock_modules["occupancy"].get_next_timeout.return_value = timeout
+
+    with patch(
+        "custom_components.topomation.coordinator.async_track_point_in_time"
+    ) as mock_track:
+        for _ in range(5):
+            coordinator.request_reschedule()
+        mock_modules["occupancy"].get_next_timeout.assert_not_called()
+
+        # WHEN
+        await hass.async_block_till_done()
+
+        # THEN
+        mock_modules["occupancy"].get_next_timeout.assert_called_once()
+        mock_track.assert_called_once()
+        assert coordinator.diagnostics()["coalesced_reschedules"] == 4
+
+
+async def test_direct_reschedule_absorbs_pending_request(
+    hass: HomeAssistant,
+    coordinator: TopomationCoordinator,
+    mock_modules: dict[str, Mock],
+) -> None:
+    """Test a timeout check absorbs reschedules requested while it ran.
+
+    GIVEN: check_timeouts publishes events that request a reschedule
+    WHEN: The timeout callback finishes with its own reschedule
+    THEN: The deferred recompute is skipped
+    """
+    # GIVEN
+    mock_modules["occupancy"].check_timeouts.side_effect = (
+        lambda _now: coordinator.request_reschedule()
+    )
+
+    with patch("custom_components.topomation.coordinator.async_track_point_in_time"):
+        # WHEN
+        coordinator._handle_timeout(datetime.now(UTC))
+        await hass.async_block_till_done()
+
+    # THEN
+    mock_modules["occupancy"].get_next_timeout.assert_called_once()
+    assert coordinator.diagnostics()["deferred_reschedules"] == 0
@@ -0,0 +1,55 @@
+"""Tests for Topomation config entry diagnostics."""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.topomation.const import DOMAIN
+from custom_components.topomation.diagnostics import async_get_config_entry_diagnostics
+
+
+async def test_diagnostics_report_event_bridge_counters(hass: HomeAssistant) -> None:
+    """Diagnostics should include location counts and event bridge counters."""
+    entry = SimpleNamespace(entry_id="entry_1")
+    loc_mgr = Mock()
+    loc_mgr.all_locations.return_value = [SimpleNamespace(id="home"), SimpleNamespace(id="kitchen")]
+    event_bridge = Mock()
+    event_bridge.diagnostics.return_value = {
+        "coalesced_triggers": {"suppressed_total": 3, "suppressed_by_source": {"light.x::level": 3}}
+    }
+    persistence = Mock()
+    persistence.diagnostics.return_value = {
+        "config": {"writes": 1, "skipped_unchanged": 0, "bytes_total": 512, "bytes_last_hour": 512},
+        "state": {"writes": 9, "skipped_unchanged": 2, "bytes_total": 900, "bytes_last_hour": 300},
+    }
+    coordinator = Mock()
+    coordinator.diagnostics.return_value = {"reschedule_requests": 5, "coalesced_reschedules": 4}
+    hass.data[DOMAIN] = {
+        "entry_1": {
+            "location_manager": loc_mgr,
+            "coordinator": coordinator,
+            "event_bridge": event_bridge,
+            "persistence": persistence,
+            "startup_timing": SimpleNamespace(as_dict=lambda: {"total_ms": 420.0}),
+        },
+    }
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, entry)
+
+    assert diagnostics["loaded"] is True
+    assert diagnostics["location_count"] == 2
+    assert diagnostics["event_bridge"]["coalesced_triggers"]["suppressed_total"] == 3
+    assert diagnostics["timeouts"]["coalesced_reschedules"] == 4
+    assert diagnostics["persistence"]["state"]["bytes_last_hour"] == 300
+    assert diagnostics["startup"] == {"total_ms": 420.0}
+
+
+async def test_diagnostics_for_unloaded_entry(hass: HomeAssistant) -> None:
+    """Entries without runtime data report as not loaded."""
+    diagnostics = await async_get_config_entry_diagnostics(
+        hass, SimpleNamespace(entry_id="missing")
+    )
+    assert diagnostics == {"loaded": False}
@@ -0,0 +1,55 @@
+"""Tests for per-location entity event dispatch."""
+
+from __future__ import annotations
+
+from unittest.mock import Mock
+
+from home_topology.core.bus import Event, EventBus
+
+from custom_components.topomation.entity_dispatcher import LocationEventDispatcher
+
+
+def _event(event_type: str, location_id: str) -> Event:
+    return Event(type=event_type, source="test", location_id=location_id, payload={})
+
+
+def test_dispatcher_routes_by_location_with_one_bus_subscription() -> None:
+    """Handlers only see their own location and share one bus handler per type."""
+    bus = EventBus()
+    dispatcher = LocationEventDispatcher(bus)
+    kitchen = Mock()
+    office = Mock()
+    kitchen_signal = Mock()
+
+    dispatcher.async_subscribe("occupancy.changed", "kitchen", kitchen)
+    dispatcher.async_subscribe("occupancy.changed", "office", office)
+    dispatcher.async_subscribe("occupancy.signal", "kitchen", kitchen_signal)
+    assert len(bus._handlers) == 2  # noqa: SLF001
+
+    bus.publish(_event("occupancy.changed", "kitchen"))
+    bus.publish(_event("occupancy.signal", "office"))
+
+    kitchen.assert_called_once()
+    office.assert_not_called()
+    kitchen_signal.assert_not_called()
+    assert dispatcher.diagnostics()["occupancy.changed"] == {"locations": 2, "handlers": 2}
+
+
+def test_dispatcher_isolates_handler_errors_and_unsubscribes() -> None:
+    """A failing handler does not block peers; the last removal drops the bus handler."""
+    bus = EventBus()
+    dispatcher = LocationEventDispatcher(bus)
+    failing = Mock(side_effect=RuntimeError("boom"))
+    healthy = Mock()
+
+    remove_failing = dispatcher.async_subscribe("occupancy.changed", "kitchen", failing)
+    remove_healthy = dispatcher.async_subscribe("occupancy.changed", "kitchen", healthy)
+    bus.publish(_event("occupancy.changed", "kitchen"))
+    healthy.assert_called_once()
+
+    remove_failing()
+    remove_failing()
+    assert len(bus._handlers) == 1  # noqa: SLF001
+    remove_healthy()
+    assert bus._handlers == []  # noqa: SLF001
+    assert dispatcher.diagnostics() == {}
@@ -9,8 +9,9 @@ Following HA integration testing best practices:
 
 from __future__ import annotations
 
+import asyncio
 from types import SimpleNamespace
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
 import pytest
 from home_topology import Event, EventBus, EventFilter, LocationManager
@@ -25,6 +26,7 @@ from custom_components.topomation.event_bridge import EventBridge
 def location_manager_fixture() -> Mock:
     """Create a mock LocationManager for event bridge testing."""
     loc_mgr = Mock(spec=LocationManager)
+    loc_mgr.all_locations.return_value = [SimpleNamespace(id="kitchen")]
     loc_mgr.get_entity_location.return_value = "kitchen"
     loc_mgr.get_module_config.return_value = {
         "enabled": True,
@@ -149,13 +151,13 @@ async def test_setup_and_teardown(
     await bridge.async_setup()
 
     # THEN
-    assert bridge._unsub is not None
+    assert "binary_sensor.kitchen_motion" in bridge.tracked_entity_ids
 
     # WHEN - Teardown
     await bridge.async_teardown()
 
     # THEN
-    assert bridge._unsub is None
+    assert bridge.tracked_entity_ids == frozenset()
 
 
 def test_normalize_state_light_brightness_zero(event_bridge: EventBridge) -> None:
@@ -546,6 +548,7 @@ async def test_state_held_source_clears_when_source_turns_off(
             },
         ],
     }
+    event_bridge.invalidate_dispatch()
 
     old_state = State("binary_sensor.hot_tub_spa_in_use", STATE_ON)
     new_state = State("binary_sensor.hot_tub_spa_in_use", STATE_OFF)
@@ -589,6 +592,7 @@ async def test_state_change_publishes_adjacency_handoff_events(
             }
         ]
     )
+    event_bridge.invalidate_handoff_index()
 
     old_state = State("binary_sensor.kitchen_motion", STATE_OFF)
     new_state = State("binary_sensor.kitchen_motion", STATE_ON)
@@ -632,6 +636,75 @@ async def test_state_change_publishes_adjacency_handoff_events(
     assert handoff_trace_event.payload["handoff_window_sec"] == 14
 
 
+async def test_handoff_index_is_cached_and_rebuilt_on_invalidation(
+    event_bridge: EventBridge,
+    event_bus: Mock,
+    location_manager: Mock,
+) -> None:
+    """Handoff edges should be indexed once, matched once per edge, and refreshed on demand."""
+    edges = [
+        {
+            "edge_id": "edge_a_kitchen_hallway",
+            "from_location_id": "kitchen",
+            "to_location_id": "hallway",
+            "directionality": "bidirectional",
+            "boundary_type": "door",
+            # Entity and base source both match: the edge must still fire only once.
+            "crossing_sources": ["binary_sensor.kitchen_motion", "binary_sensor.kitchen_motion"],
+            "handoff_window_sec": 10,
+        },
+        {
+            "edge_id": "edge_b_kitchen_pantry",
+            "from_location_id": "pantry",
+            "to_location_id": "kitchen",
+            "directionality": "b_to_a",
+            "boundary_type": "virtual",
+            "crossing_sources": ["binary_sensor.kitchen_motion"],
+            "handoff_window_sec": 0,
+        },
+        {
+            "edge_id": "edge_c_hallway_den",
+            "from_location_id": "hallway",
+            "to_location_id": "den",
+            "directionality": "bidirectional",
+            "crossing_sources": ["binary_sensor.kitchen_motion"],
+        },
+    ]
+    location_manager.all_adjacency_edges = Mock(return_value=edges)
+    event_bridge.invalidate_handoff_index()
+
+    def _trigger() -> list[Event]:
+        event_bus.publish.reset_mock()
+        ha_event = Mock()
+        ha_event.data = {
+            "entity_id": "binary_sensor.kitchen_motion",
+            "old_state": State("binary_sensor.kitchen_motion", STATE_OFF),
+            "new_state": State("binary_sensor.kitchen_motion", STATE_ON),
+        }
+        event_bridge._state_changed_listener(ha_event)
+        return [
+            call.args[0]
+            for call in event_bus.publish.call_args_list
+            if call.args[0].type == "occupancy.handoff"
+        ]
+
+    handoffs = _trigger()
+    assert [(event.payload["edge_id"], event.location_id) for event in handoffs] == [
+        ("edge_a_kitchen_hallway", "hallway"),
+        ("edge_b_kitchen_pantry", "pantry"),
+    ]
+    assert handoffs[1].payload["handoff_window_sec"] == 1
+
+    _trigger()
+    assert location_manager.all_adjacency_edges.call_count == 1
+
+    edges.pop(0)
+    assert len(_trigger()) == 2
+    event_bridge.invalidate_handoff_index()
+    assert [event.payload["edge_id"] for event in _trigger()] == ["edge_b_kitchen_pantry"]
+    assert location_manager.all_adjacency_edges.call_count == 2
+
+
 async def test_media_volume_change_publishes_trigger(
     event_bridge: EventBridge,
     event_bus: Mock,
@@ -981,6 +1054,97 @@ async def test_media_state_changed_end_to_end_with_module_config(
     await bridge.async_teardown()
 
 
+async def test_dispatch_table_skips_unrelated_entities_and_tracks_config_changes(
+    hass: HomeAssistant,
+) -> None:
+    """Unrelated entities should stop at the dispatch table; config edits must recompile it."""
+    bus = EventBus()
+    loc_mgr = LocationManager()
+    bus.set_location_manager(loc_mgr)
+    loc_mgr.set_event_bus(bus)
+
+    loc_mgr.create_location(id="house", name="House", is_explicit_root=True)
+    loc_mgr.create_location(id="kitchen", name="Kitchen", parent_id="house")
+    loc_mgr.add_entity_to_location("binary_sensor.kitchen_motion", "kitchen")
+    loc_mgr.add_entity_to_location("binary_sensor.kitchen_door", "kitchen")
+    motion_source = {
+        "entity_id": "binary_sensor.kitchen_motion",
+        "mode": "specific_states",
+        "on_event": "trigger",
+        "on_timeout": 300,
+        "off_event": "clear",
+        "off_trailing": 0,
+    }
+    loc_mgr.set_module_config(
+        "kitchen",
+        "occupancy",
+        {"enabled": True, "occupancy_sources": [motion_source]},
+    )
+
+    captured: list[Event] = []
+    bus.subscribe(captured.append, EventFilter(event_type="occupancy.signal"))
+    bridge = EventBridge(hass, bus, loc_mgr)
+    await bridge.async_setup()
+
+    def _fire(entity_id: str) -> None:
+        bridge._state_changed_listener(
+            Mock(
+                data={
+                    "entity_id": entity_id,
+                    "old_state": State(entity_id, STATE_OFF),
+                    "new_state": State(entity_id, STATE_ON),
+                }
+            )
+        )
+
+    _fire("binary_sensor.kitchen_motion")
+    assert [event.payload["source_id"] for event in captured] == ["binary_sensor.kitchen_motion"]
+
+    # Unrelated entities never reach location/config lookups.
+    with (
+        patch.object(loc_mgr, "get_entity_location", wraps=loc_mgr.get_entity_location) as lookup,
+        patch.object(loc_mgr, "get_module_config", wraps=loc_mgr.get_module_config) as config,
+    ):
+        _fire("sensor.grid_power")
+        _fire("binary_sensor.kitchen_door")
+    lookup.assert_not_called()
+    config.assert_not_called()
+    assert len(captured) == 1
+
+    # Replacing the entity's location config is detected on its next event.
+    loc_mgr.set_module_config(
+        "kitchen",
+        "occupancy",
+        {"enabled": True, "occupancy_sources": [{**motion_source, "source_id": "kitchen_pir"}]},
+    )
+    _fire("binary_sensor.kitchen_motion")
+    assert captured[-1].payload["source_id"] == "kitchen_pir"
+
+    # Newly referenced entities are picked up once config writers invalidate the table.
+    loc_mgr.set_module_config(
+        "kitchen",
+        "occupancy",
+        {
+            "enabled": True,
+            "occupancy_sources": [
+                motion_source,
+                {**motion_source, "entity_id": "binary_sensor.kitchen_door"},
+            ],
+        },
+    )
+    bridge.invalidate_dispatch()
+    _fire("binary_sensor.kitchen_door")
+    assert captured[-1].payload["source_id"] == "binary_sensor.kitchen_door"
+
+    # Deleting the location drops its routes.
+    loc_mgr.delete_location("kitchen")
+    captured.clear()
+    _fire("binary_sensor.kitchen_motion")
+    assert captured == []
+
+    await bridge.async_teardown()
+
+
 async def test_policy_source_arm_away_vacates_scoped_target(
     hass: HomeAssistant,
 ) -> None:
@@ -1148,11 +1312,11 @@ async def test_policy_source_invalid_targets_falls_back_to_configured_location(
 async def test_policy_source_all_roots_re_evaluates_after_topology_changes(
     hass: HomeAssistant,
 ) -> None:
-    """all_roots target should resolve current roots on each policy evaluation."""
-    bus = Mock(spec=EventBus)
-    bus.publish = Mock()
-
+    """all_roots targets are cached but re-resolved when kernel topology events fire."""
+    bus = EventBus()
     loc_mgr = LocationManager()
+    bus.set_location_manager(loc_mgr)
+    loc_mgr.set_event_bus(bus)
     loc_mgr.create_location(id="building_main", name="Main Building", parent_id=None)
     loc_mgr.create_location(id="kitchen", name="Kitchen", parent_id="building_main")
     loc_mgr.set_module_config(
@@ -1172,6 +1336,7 @@ async def test_policy_source_all_roots_re_evaluates_after_topology_changes(
 
     occupancy = Mock()
     bridge = EventBridge(hass, bus, loc_mgr, occupancy_module=occupancy)
+    await bridge.async_setup()
 
     ha_event = Mock()
     ha_event.data = {
@@ -1191,6 +1356,76 @@ async def test_policy_source_all_roots_re_evaluates_after_topology_changes(
     second_targets = sorted(call.args[0] for call in occupancy.vacate_area.call_args_list)
     assert second_targets == ["building_main", "grounds"]
 
+    occupancy.vacate_area.reset_mock()
+    loc_mgr.update_location("grounds", parent_id="building_main")
+
+    bridge._state_changed_listener(ha_event)
+    third_targets = sorted(call.args[0] for call in occupancy.vacate_area.call_args_list)
+    assert third_targets == ["building_main"]
+
+    await bridge.async_teardown()
+
+
+async def test_policy_index_caches_targets_and_keeps_state_map_semantics(
+    hass: HomeAssistant,
+) -> None:
+    """Compiled policy routes should match state maps without re-validating targets per event."""
+    bus = Mock(spec=EventBus)
+    bus.publish = Mock()
+
+    loc_mgr = LocationManager()
+    loc_mgr.create_location(id="building_main", name="Main Building", parent_id=None)
+    loc_mgr.create_location(id="kitchen", name="Kitchen", parent_id="building_main")
+    loc_mgr.set_module_config(
+        "kitchen",
+        "occupancy",
+        {
+            "policy_sources": [
+                {
+                    "entity_id": "alarm_control_panel.home",
+                    "targets": ["building_main", "building_main", "missing"],
+                    "state_map": {
+                        "Armed_Away": {"action": "notify"},
+                        "armed_away": "vacate_area",
+                        "triggered": {"action": "vacate_area", "include_locked": False},
+                    },
+                }
+            ]
+        },
+    )
+
+    occupancy = Mock()
+    bridge = EventBridge(hass, bus, loc_mgr, occupancy_module=occupancy)
+
+    def _fire(state: str) -> None:
+        bridge._state_changed_listener(
+            Mock(
+                data={
+                    "entity_id": "alarm_control_panel.home",
+                    "old_state": State("alarm_control_panel.home", "disarmed"),
+                    "new_state": State("alarm_control_panel.home", state),
+                }
+            )
+        )
+
+    _fire("disarmed")
+    with patch.object(loc_mgr, "get_location", wraps=loc_mgr.get_location) as get_location:
+        # An exact key with an unsupported action does not fall back to the lowercased key.
+        _fire("Armed_Away")
+        occupancy.vacate_area.assert_not_called()
+
+        _fire("ARMED_AWAY")
+        occupancy.vacate_area.assert_called_once_with(
+            "building_main", "policy::alarm_control_panel.home", True
+        )
+
+        occupancy.vacate_area.reset_mock()
+        _fire("triggered")
+        occupancy.vacate_area.assert_called_once_with(
+            "building_main", "policy::alarm_control_panel.home", False
+        )
+    get_location.assert_not_called()
+
 
 async def test_wiab_enclosed_room_handles_binary_door_states(
     hass: HomeAssistant,
@@ -1328,3 +1563,262 @@ async def test_wiab_home_containment_runs_for_unmapped_entity(
         "wiab:home_containment:building_home",
         120,
     )
+
+
+async def test_wiab_index_touches_only_rooms_referencing_entity(
+    hass: HomeAssistant,
+) -> None:
+    """WIAB events should reach only referencing rooms, in preset order, without config reads."""
+    bus = Mock(spec=EventBus)
+    bus.publish = Mock()
+
+    loc_mgr = Mock(spec=LocationManager)
+    loc_mgr.get_entity_location.return_value = None
+    loc_mgr.all_locations.return_value = [
+        SimpleNamespace(id="area_bathroom"),
+        SimpleNamespace(id="area_closet"),
+        SimpleNamespace(id="area_hall"),
+    ]
+    configs = {
+        "area_bathroom": {
+            "wiab": {
+                "preset": "hybrid",
+                "interior_entities": ["binary_sensor.bathroom_motion"],
+                "door_entities": ["binary_sensor.bathroom_door"],
+                "exterior_door_entities": ["binary_sensor.front_door"],
+                "hold_timeout_sec": "600",
+                "release_timeout_sec": 999_999,
+            }
+        },
+        "area_closet": {
+            "wiab": {
+                "preset": "enclosed_room",
+                "interior_entities": ["binary_sensor.closet_motion"],
+                "door_entities": ["binary_sensor.closet_door"],
+            }
+        },
+        "area_hall": {
+            "wiab": {"preset": "off", "interior_entities": ["binary_sensor.bathroom_motion"]}
+        },
+    }
+    loc_mgr.get_module_config.side_effect = lambda location_id, _module_id: configs.get(location_id)
+    occupancy = Mock()
+    bridge = EventBridge(hass, bus, loc_mgr, occupancy_module=occupancy)
+
+    def _fire(entity_id: str, old: str, new: str) -> None:
+        bridge._state_changed_listener(
+            Mock(
+                data={
+                    "entity_id": entity_id,
+                    "old_state": State(entity_id, old),
+                    "new_state": State(entity_id, new),
+                }
+            )
+        )
+
+    _fire("sensor.unrelated", STATE_OFF, STATE_ON)
+    loc_mgr.get_module_config.reset_mock()
+
+    _fire("binary_sensor.bathroom_motion", STATE_OFF, STATE_ON)
+    loc_mgr.get_module_config.assert_not_called()
+    assert [call.args for call in occupancy.trigger.call_args_list] == [
+        ("area_bathroom", "wiab:enclosed_room:area_bathroom", 600),
+        ("area_bathroom", "wiab:home_containment:area_bathroom", 600),
+    ]
+    occupancy.lock.assert_called_once_with(
+        "area_bathroom",
+        "wiab:home_containment:area_bathroom",
+        "block_vacant",
+        "self",
+    )
+
+    occupancy.reset_mock()
+    _fire("binary_sensor.front_door", STATE_OFF, STATE_ON)
+    occupancy.unlock.assert_called_once_with(
+        "area_bathroom", "wiab:home_containment:area_bathroom"
+    )
+    occupancy.clear.assert_called_once_with(
+        "area_bathroom", "wiab:home_containment:area_bathroom", 86_400
+    )
+    occupancy.trigger.assert_not_called()
+
+
+async def test_state_subscriptions_follow_relevant_entities(hass: HomeAssistant) -> None:
+    """Only referenced entities are subscribed, and config edits resubscribe incrementally."""
+    bus = EventBus()
+    loc_mgr = LocationManager()
+    bus.set_location_manager(loc_mgr)
+    loc_mgr.set_event_bus(bus)
+    loc_mgr.create_location(id="kitchen", name="Kitchen")
+    loc_mgr.create_location(id="hallway", name="Hallway")
+    for entity_id in ("binary_sensor.kitchen_motion", "binary_sensor.kitchen_door"):
+        loc_mgr.add_entity_to_location(entity_id, "kitchen")
+
+    def _source(entity_id: str) -> dict[str, object]:
+        return {
+            "entity_id": entity_id,
+            "mode": "specific_states",
+            "on_event": "trigger",
+            "on_timeout": 300,
+            "off_event": "clear",
+            "off_trailing": 0,
+        }
+
+    loc_mgr.set_module_config(
+        "kitchen",
+        "occupancy",
+        {"enabled": True, "occupancy_sources": [_source("binary_sensor.kitchen_motion")]},
+    )
+
+    captured: list[Event] = []
+    bus.subscribe(captured.append, EventFilter(event_type="occupancy.signal"))
+    hass.states.async_set("binary_sensor.kitchen_door", STATE_OFF)
+    hass.states.async_set("binary_sensor.kitchen_motion", STATE_OFF)
+    bridge = EventBridge(hass, bus, loc_mgr)
+    await bridge.async_setup()
+    assert bridge.tracked_entity_ids == {"binary_sensor.kitchen_motion"}
+
+    hass.states.async_set("binary_sensor.kitchen_door", STATE_ON)
+    hass.states.async_set("binary_sensor.kitchen_motion", STATE_ON)
+    await hass.async_block_till_done()
+    assert [event.entity_id for event in captured] == ["binary_sensor.kitchen_motion"]
+
+    motion_unsub = bridge._tracked["binary_sensor.kitchen_motion"]
+    loc_mgr.set_module_config(
+        "kitchen",
+        "occupancy",
+        {
+            "enabled": True,
+            "occupancy_sources": [
+                _source("binary_sensor.kitchen_motion"),
+                _source("binary_sensor.kitchen_door"),
+            ],
+        },
+    )
+    with patch.object(bridge, "_compile_dispatch", wraps=bridge._compile_dispatch) as compile_spy:
+        bridge.invalidate_dispatch()
+        bridge.invalidate_dispatch()
+        await asyncio.sleep(0)
+    assert compile_spy.call_count == 1
+    assert bridge.tracked_entity_ids == {
+        "binary_sensor.kitchen_motion",
+        "binary_sensor.kitchen_door",
+    }
+    assert bridge._tracked["binary_sensor.kitchen_motion"] is motion_unsub
+
+    loc_mgr.create_adjacency_edge(
+        edge_id="kitchen_hallway",
+        from_location_id="kitchen",
+        to_location_id="hallway",
+        crossing_sources=["binary_sensor.hallway_beam", "motion_cluster::beam"],
+    )
+    await asyncio.sleep(0)
+    assert "binary_sensor.hallway_beam" in bridge.tracked_entity_ids
+    assert "motion_cluster::beam" not in bridge.tracked_entity_ids
+
+    await bridge.async_teardown()
+    captured.clear()
+    hass.states.async_set("binary_sensor.kitchen_motion", STATE_OFF)
+    await hass.async_block_till_done()
+    assert captured == []
+
+
+async def test_level_bursts_coalesce_to_leading_trigger(
+    event_bridge: EventBridge,
+    event_bus: Mock,
+) -> None:
+    """A dimmer slide should publish its first level trigger and count the suppressed repeats."""
+
+    def _dim(old_brightness: int, new_brightness: int, fired_at: float) -> None:
+        ha_event = Mock()
+        ha_event.time_fired_timestamp = fired_at
+        ha_event.data = {
+            "entity_id": "light.kitchen",
+            "old_state": State("light.kitchen", STATE_ON, {"brightness": old_brightness}),
+            "new_state": State("light.kitchen", STATE_ON, {"brightness": new_brightness}),
+        }
+        event_bridge._state_changed_listener(ha_event)
+
+    for brightness in (60, 80, 100, 120):
+        _dim(brightness, brightness + 20, 100.0)
+    _dim(140, 160, 101.9)
+    _dim(160, 180, 102.5)
+
+    level_triggers = [
+        call.args[0]
+        for call in event_bus.publish.call_args_list
+        if call.args[0].payload["source_id"] == "light.kitchen::level"
+    ]
+    assert len(level_triggers) == 2
+    assert level_triggers[0].payload["attributes"]["brightness"] == 80
+    assert level_triggers[1].payload["attributes"]["brightness"] == 180
+    assert event_bridge.diagnostics()["coalesced_triggers"] == {
+        "suppressed_total": 4,
+        "suppressed_by_source": {"light.kitchen::level": 4},
+    }
+
+
+async def test_coalesce_window_is_configurable_and_reset_by_clear(
+    event_bridge: EventBridge,
+    event_bus: Mock,
+    location_manager: Mock,
+) -> None:
+    """Per-source windows override the default, and a clear makes the next trigger an edge."""
+    location_manager.get_module_config.return_value = {
+        "enabled": True,
+        "occupancy_sources": [
+            {
+                "entity_id": "binary_sensor.kitchen_motion",
+                "on_event": "trigger",
+                "on_timeout": 300,
+                "off_event": "clear",
+                "off_trailing": 60,
+                "coalesce_window_sec": 30,
+            },
+            {
+                "entity_id": "light.kitchen",
+                "source_id": "light.kitchen::level",
+                "signal_key": "level",
+                "on_event": "trigger",
+                "on_timeout": 300,
+                "coalesce_window_sec": 0,
+            },
+        ],
+    }
+    event_bridge.invalidate_dispatch()
+
+    def _fire(entity_id: str, old: str, new: str, old_attrs=None, new_attrs=None) -> None:
+        ha_event = Mock()
+        ha_event.time_fired_timestamp = 10.0
+        ha_event.data = {
+            "entity_id": entity_id,
+            "old_state": State(entity_id, old, old_attrs),
+            "new_state": State(entity_id, new, new_attrs),
+        }
+        event_bridge._state_changed_listener(ha_event)
+
+    _fire("binary_sensor.kitchen_motion", STATE_OFF, STATE_ON)
+    _fire("binary_sensor.kitchen_motion", STATE_ON, STATE_OFF)
+    _fire("binary_sensor.kitchen_motion", STATE_OFF, STATE_ON)
+    for brightness in (10, 20, 30):
+        _fire(
+            "light.kitchen",
+            STATE_ON,
+            STATE_ON,
+            {"brightness": brightness},
+            {"brightness": brightness + 5},
+        )
+
+    published = [
+        (call.args[0].payload["source_id"], call.args[0].payload["event_type"])
+        for call in event_bus.publish.call_args_list
+    ]
+    assert published == [
+        ("binary_sensor.kitchen_motion", "trigger"),
+        ("binary_sensor.kitchen_motion", "clear"),
+        ("binary_sensor.kitchen_motion", "trigger"),
+        ("light.kitchen::level", "trigger"),
+        ("light.kitchen::level", "trigger"),
+        ("light.kitchen::level", "trigger"),
+    ]
+    assert event_bridge.diagnostics()["coalesced_triggers"]["suppressed_total"] == 0
@@ -12,6 +12,7 @@ from __future__ import annotations
 import copy
 import json
 from datetime import UTC, datetime, timedelta
+from pathlib import Path
 from unittest.mock import Mock, patch
 
 from homeassistant.core import HomeAssistant
@@ -21,10 +22,12 @@ from pytest_homeassistant_custom_component.common import MockConfigEntry
 
 from custom_components.topomation import _prune_hidden_entities
 from custom_components.topomation.const import (
+    CONF_STATE_JOURNAL,
     DOMAIN,
     EVENT_TOPOMATION_OCCUPANCY_CHANGED,
     EVENT_TOPOMATION_OCCUPANCY_STATE_CHANGED,
     STORAGE_KEY_CONFIG,
+    STORAGE_KEY_STATE,
     STORAGE_VERSION,
 )
 
@@ -68,6 +71,12 @@ async def test_setup_entry_creates_kernel_components(
         assert "event_bus" in kernel_data
         assert "modules" in kernel_data
 
+        # Every setup phase is timed and kept with the kernel.
+        startup = kernel_data["startup_timing"].as_dict()
+        assert list(startup["phases_ms"])[:2] == ["kernel_init", "config_load"]
+        assert "platform_forwarding" in startup["phases_ms"]
+        assert startup["total_ms"] is not None
+
 
 async def test_setup_entry_attaches_modules(
     hass: HomeAssistant,
@@ -264,7 +273,7 @@ async def test_setup_entry_forwards_minimal_occupancy_projection_event(
         "reason": "event:trigger",
     }
     with patch(
-        "custom_components.topomation.build_occupancy_projection_states",
+        "custom_components.topomation.OccupancyProjectionStore.refresh_location",
         return_value=[
             {
                 "location_id": "area_kitchen",
@@ -732,6 +741,70 @@ async def test_unload_entry_saves_state(
         mock_automation_module.dump_state.assert_called_once()
 
 
+async def test_state_journal_option_restores_journal_on_setup(
+    hass: HomeAssistant,
+) -> None:
+    """Journal mode should replay journaled occupancy and compact it on unload.
+
+    GIVEN: A state snapshot plus a same-generation journal record for a lock
+    WHEN: The integration is set up with the state_journal option, then unloaded
+    THEN: The lock is restored and the journal is folded into a new snapshot
+    """
+    await Store(hass, STORAGE_VERSION, STORAGE_KEY_CONFIG).async_save(
+        {"locations": [{"id": "kitchen", "name": "Kitchen", "parent_id": None}]}
+    )
+    await Store(hass, STORAGE_VERSION, STORAGE_KEY_STATE).async_save(
+        {"journal_generation": 4}
+    )
+    Path(hass.config.path(".storage")).mkdir(exist_ok=True)
+    Path(hass.config.path(".storage", f"{STORAGE_KEY_STATE}.journal")).write_text(
+        json.dumps({"g": 4})
+        + "\n"
+        + json.dumps(
+            {
+                "m": "occupancy",
+                "l": "kitchen",
+                "s": {
+                    "is_occupied": True,
+                    "direct_locks": [
+                        {"source_id": "away", "mode": "freeze", "scope": "self"}
+                    ],
+                },
+            }
+        )
+        + "\n"
+    )
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Topomation",
+        options={CONF_STATE_JOURNAL: True},
+        entry_id="journal_entry",
+    )
+    entry.add_to_hass(hass)
+
+    with (
+        patch("custom_components.topomation.async_register_panel"),
+        patch("custom_components.topomation.async_register_websocket_api"),
+        patch("custom_components.topomation.async_register_services"),
+        patch.object(hass.config_entries, "async_forward_entry_setups", return_value=True),
+    ):
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+    kernel = hass.data[DOMAIN][entry.entry_id]
+    occupancy = kernel["modules"]["occupancy"]
+    assert occupancy.get_location_state("kitchen")["locked_by"] == ["away"]
+    assert kernel["persistence"].journal.generation == 5
+
+    with patch.object(hass.config_entries, "async_unload_platforms", return_value=True):
+        await hass.config_entries.async_unload(entry.entry_id)
+        await hass.async_block_till_done()
+
+    snapshot = await Store(hass, STORAGE_VERSION, STORAGE_KEY_STATE).async_load()
+    assert snapshot["journal_generation"] == 6
+    assert snapshot["occupancy"]["kitchen"]["locked_by"] == ["away"]
+
+
 async def test_unload_entry_cleans_up_data(
     hass: HomeAssistant,
     config_entry: MockConfigEntry,
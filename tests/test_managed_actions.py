@@ -3,14 +3,17 @@
 from __future__ import annotations
 
 import json
+from pathlib import Path
 from types import SimpleNamespace
 from typing import cast
 
 import pytest
+import yaml
 from homeassistant.components.automation import DATA_COMPONENT as AUTOMATION_DATA_COMPONENT
 from homeassistant.const import CONF_ID
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers import area_registry as ar
+from pytest_homeassistant_custom_component.common import async_mock_service
 
 from custom_components.topomation.const import TOPOMATION_AUTOMATION_METADATA_PREFIX
 from custom_components.topomation.managed_actions import (
@@ -1069,6 +1072,217 @@ def test_ambient_trigger_arbitration_preserves_combined_occupancy_trigger_path()
     ]
 
 
+@pytest.mark.asyncio
+async def test_async_create_rules_writes_batch_with_one_reload(
+    hass: HomeAssistant,
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    """Bulk create validates each rule, writes automations.yaml once and reloads once."""
+    hass.config.config_dir = str(tmp_path)
+    automations_path = tmp_path / "automations.yaml"
+    automations_path.write_text(
+        "- alias: User rule\n"
+        "  triggers: []\n"
+        "  actions: []\n"
+        "- id: topomation_kitchen_dark_rule\n"
+        "  alias: Outdated\n",
+        encoding="utf-8",
+    )
+    manager = TopomationManagedActions(hass)
+    reloads = async_mock_service(hass, "automation", "reload")
+    grouped: list[str] = []
+
+    async def _fake_validate(
+        _hass: HomeAssistant,
+        automation_id: str,
+        config_payload: dict[str, object],
+    ) -> dict[str, object] | None:
+        return None if automation_id == "topomation_kitchen_invalid" else config_payload
+
+    async def _fake_resolve(
+        automation_ids: list[str],
+        *,
+        max_attempts: int,
+        wait_seconds: float,
+    ) -> dict[str, str]:
+        return {automation_id: f"automation.{automation_id}" for automation_id in automation_ids}
+
+    monkeypatch.setattr(
+        "custom_components.topomation.managed_actions.async_validate_config_item",
+        _fake_validate,
+    )
+    monkeypatch.setattr(manager, "_resolve_created_entity_ids", _fake_resolve)
+    monkeypatch.setattr(
+        manager, "_resolve_managed_rule_ha_area_id", lambda _location: "area_kitchen"
+    )
+    monkeypatch.setattr(
+        manager,
+        "_apply_topomation_grouping",
+        lambda entity_id, *_args, **_kwargs: grouped.append(entity_id),
+    )
+
+    location = SimpleNamespace(id="kitchen", name="Kitchen", modules={})
+    results = await manager.async_create_rules(
+        [
+            {
+                "location": location,
+                "name": "Kitchen dark",
+                "trigger_type": "on_dark",
+                "automation_id": "topomation_kitchen_dark_rule",
+                "actions": [{"entity_id": "light.kitchen", "service": "turn_on"}],
+            },
+            {
+                "location": location,
+                "name": "Kitchen bright",
+                "trigger_type": "on_bright",
+                "automation_id": "topomation_kitchen_bright_rule",
+                "actions": [{"entity_id": "light.kitchen", "service": "turn_off"}],
+            },
+            {
+                "location": location,
+                "name": "Kitchen invalid",
+                "trigger_type": "on_dark",
+                "automation_id": "topomation_kitchen_invalid",
+            },
+        ]
+    )
+
+    assert [result["id"] for result in results[:2]] == [
+        "topomation_kitchen_dark_rule",
+        "topomation_kitchen_bright_rule",
+    ]
+    assert isinstance(results[2], ValueError)
+    assert len(reloads) == 1
+    assert grouped == [
+        "automation.topomation_kitchen_dark_rule",
+        "automation.topomation_kitchen_bright_rule",
+    ]
+
+    stored = yaml.safe_load(automations_path.read_text(encoding="utf-8"))
+    assert [entry["id"] for entry in stored[1:]] == [
+        "topomation_kitchen_dark_rule",
+        "topomation_kitchen_bright_rule",
+    ]
+    # The user's rule is kept and given an id; the outdated entry is replaced in place.
+    assert stored[0]["alias"] == "User rule"
+    assert stored[0]["id"]
+    assert stored[1]["alias"] == "Kitchen dark"
+    assert list(stored[1])[:3] == ["id", "alias", "description"]
+
+
+
+@pytest.mark.asyncio
+async def test_async_create_rules_fails_when_concurrent_save_drops_batch(
+    hass: HomeAssistant,
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    """A concurrent automations.yaml save that drops the batch should fail it loudly."""
+    hass.config.config_dir = str(tmp_path)
+    automations_path = tmp_path / "automations.yaml"
+    automations_path.write_text("[]\n", encoding="utf-8")
+    manager = TopomationManagedActions(hass)
+
+    async def _editor_save_during_reload(_call: object) -> None:
+        # HA's editor wrote its own copy of the file read before the batch landed.
+        automations_path.write_text("- id: user_rule\n  alias: User rule\n", encoding="utf-8")
+
+    hass.services.async_register("automation", "reload", _editor_save_during_reload)
+
+    async def _fake_validate(
+        _hass: HomeAssistant,
+        automation_id: str,
+        config_payload: dict[str, object],
+    ) -> dict[str, object]:
+        return config_payload
+
+    async def _unexpected_resolve(*_args: object, **_kwargs: object) -> dict[str, str]:
+        raise AssertionError("a lost batch must not be resolved as merely unregistered")
+
+    monkeypatch.setattr(
+        "custom_components.topomation.managed_actions.async_validate_config_item",
+        _fake_validate,
+    )
+    monkeypatch.setattr(manager, "_resolve_created_entity_ids", _unexpected_resolve)
+    monkeypatch.setattr(
+        manager, "_resolve_managed_rule_ha_area_id", lambda _location: "area_kitchen"
+    )
+
+    location = SimpleNamespace(id="kitchen", name="Kitchen", modules={})
+    [result] = await manager.async_create_rules(
+        [
+            {
+                "location": location,
+                "name": "Kitchen dark",
+                "trigger_type": "on_dark",
+                "automation_id": "topomation_kitchen_dark_rule",
+                "actions": [{"entity_id": "light.kitchen", "service": "turn_on"}],
+            }
+        ]
+    )
+
+    assert isinstance(result, ValueError)
+    assert "topomation_kitchen_dark_rule" in str(result)
+    assert manager._recent_rule_snapshots == {}  # noqa: SLF001
+
+
+@pytest.mark.asyncio
+async def test_async_create_rule_post_holds_batch_write_lock(
+    hass: HomeAssistant,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Single-rule POSTs should serialize with batch automations.yaml writes."""
+    manager = TopomationManagedActions(hass)
+    lock_held: list[bool] = []
+
+    async def _fake_validate(
+        _hass: HomeAssistant,
+        automation_id: str,
+        config_payload: dict[str, object],
+    ) -> dict[str, object]:
+        return config_payload
+
+    async def _fake_call(
+        method: str,
+        automation_id: str,
+        payload: dict[str, object] | None = None,
+    ) -> dict[str, object]:
+        lock_held.append(manager._batch_write_lock.locked())  # noqa: SLF001
+        return {}
+
+    async def _fake_resolve_entity_id(
+        automation_id: str,
+        *,
+        max_attempts: int,
+        wait_seconds: float,
+    ) -> str | None:
+        return f"automation.{automation_id}"
+
+    monkeypatch.setattr(
+        "custom_components.topomation.managed_actions.async_validate_config_item",
+        _fake_validate,
+    )
+    monkeypatch.setattr(manager, "_call_automation_config_api", _fake_call)
+    monkeypatch.setattr(manager, "_resolve_created_entity_id", _fake_resolve_entity_id)
+    monkeypatch.setattr(
+        manager, "_resolve_managed_rule_ha_area_id", lambda _location: "area_kitchen"
+    )
+    monkeypatch.setattr(manager, "_apply_topomation_grouping", lambda *args, **kwargs: None)
+
+    location = SimpleNamespace(id="kitchen", name="Kitchen", modules={})
+    rule = await manager.async_create_rule(
+        location=location,
+        name="Kitchen dark",
+        trigger_type="on_dark",
+        actions=[{"entity_id": "light.kitchen", "service": "turn_on"}],
+    )
+    await manager.async_delete_rule(automation_id=rule["id"])
+
+    assert lock_held == [True, True]
+    assert not manager._batch_write_lock.locked()  # noqa: SLF001
+
+
 def _stub_rebuild_manager(
     hass: HomeAssistant,
     monkeypatch: pytest.MonkeyPatch,
@@ -1091,9 +1305,8 @@ def _stub_rebuild_manager(
     written: list[SimpleNamespace] = []
     enabled_updates: list[tuple[str, bool]] = []
 
-    async def _fake_list_rules(location_id: str) -> list[dict[str, object]]:
-        assert location_id == "kitchen"
-        return rules
+    def _fake_rules_by_location() -> dict[str, list[tuple[dict[str, object], None]]]:
+        return {"kitchen": [(rule, None) for rule in rules]}
 
     def _fake_compose(**kwargs: object) -> SimpleNamespace:
         automation_id = str(kwargs.get("automation_id") or "")
@@ -1103,16 +1316,18 @@ def _stub_rebuild_manager(
             gen_hash=str(match.get("expected_gen_hash", "current")),
         )
 
-    async def _fake_write(composed: SimpleNamespace) -> dict[str, object]:
-        written.append(composed)
-        return {"entity_id": f"automation.{composed.automation_id}"}
+    async def _fake_write(composed_rules: list[SimpleNamespace]) -> list[dict[str, object]]:
+        written.extend(composed_rules)
+        return [
+            {"entity_id": f"automation.{composed.automation_id}"} for composed in composed_rules
+        ]
 
     async def _fake_set_enabled(*, entity_id: str, enabled: bool) -> None:
         enabled_updates.append((entity_id, enabled))
 
-    monkeypatch.setattr(manager, "async_list_rules", _fake_list_rules)
+    monkeypatch.setattr(manager, "_managed_rules_by_location", _fake_rules_by_location)
     monkeypatch.setattr(manager, "_compose_rule_config", _fake_compose)
-    monkeypatch.setattr(manager, "_write_composed_rule", _fake_write)
+    monkeypatch.setattr(manager, "_write_composed_rules", _fake_write)
     monkeypatch.setattr(manager, "async_set_rule_enabled", _fake_set_enabled)
     return manager, location, written, enabled_updates
 
@@ -1197,6 +1412,90 @@ async def test_rebuild_stale_rules_min_version_forces_rebuild(
     assert [c.automation_id for c in written] == ["topomation_kitchen_old"]
 
 
+@pytest.mark.asyncio
+async def test_rebuild_stale_rules_indexes_once_and_rereads_only_drifted_rules(
+    hass: HomeAssistant,
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    """One pass over automations, no config API GETs; drifted rules re-read from the file."""
+    hass.config.config_dir = str(tmp_path)
+    manager = TopomationManagedActions(hass)
+    kitchen = SimpleNamespace(id="kitchen", name="Kitchen", modules={})
+    porch = SimpleNamespace(id="porch", name="Porch", modules={})
+    manager._loc_mgr = SimpleNamespace(all_locations=lambda: [kitchen, porch])  # noqa: SLF001
+
+    def _description(location_id: str, gen_hash: str) -> str:
+        return manager._metadata_line(  # noqa: SLF001
+            {
+                "version": _AUTOMATION_METADATA_VERSION,
+                "location_id": location_id,
+                "trigger_type": "on_dark",
+                "gen_hash": gen_hash,
+            }
+        )
+
+    def _config(automation_id: str, location_id: str, gen_hash: str, alias: str):
+        return {
+            CONF_ID: automation_id,
+            "alias": alias,
+            "description": _description(location_id, gen_hash),
+            "actions": [{"action": "light.turn_on", "target": {"entity_id": "light.x"}}],
+        }
+
+    runtime_configs = [
+        _config("topomation_kitchen_fresh", "kitchen", "current", "Kitchen fresh"),
+        _config("topomation_porch_drift", "porch", "stale000", "Porch drift"),
+    ]
+    hass.data[AUTOMATION_DATA_COMPONENT] = SimpleNamespace(
+        entities=[
+            SimpleNamespace(
+                entity_id=f"automation.{config[CONF_ID]}",
+                raw_config=config,
+                unique_id=config[CONF_ID],
+            )
+            for config in runtime_configs
+        ]
+    )
+    # automations.yaml holds a newer alias for the drifted rule than the runtime config.
+    (tmp_path / "automations.yaml").write_text(
+        yaml.safe_dump(
+            [_config("topomation_porch_drift", "porch", "stale000", "Porch renamed")]
+        ),
+        encoding="utf-8",
+    )
+
+    composed_names: list[str] = []
+
+    def _fake_compose(**kwargs: object) -> SimpleNamespace:
+        composed_names.append(str(kwargs["name"]))
+        return SimpleNamespace(automation_id=str(kwargs["automation_id"]), gen_hash="current")
+
+    async def _no_api_call(*_args: object, **_kwargs: object) -> dict[str, object]:
+        raise AssertionError("rebuild must not call the config API")
+
+    written: list[SimpleNamespace] = []
+
+    async def _fake_write(composed_rules: list[SimpleNamespace]) -> list[dict[str, object]]:
+        written.extend(composed_rules)
+        return [{"entity_id": f"automation.{c.automation_id}"} for c in composed_rules]
+
+    monkeypatch.setattr(manager, "_compose_rule_config", _fake_compose)
+    monkeypatch.setattr(manager, "_call_automation_config_api", _no_api_call)
+    monkeypatch.setattr(manager, "_write_composed_rules", _fake_write)
+
+    summary = await manager.async_rebuild_stale_rules()
+
+    assert summary == {"checked": 2, "rebuilt": 1, "failed": 0}
+    assert [c.automation_id for c in written] == ["topomation_porch_drift"]
+    # Fresh rule composed once from raw_config; drifted rule recomposed from the file.
+    assert composed_names == ["Kitchen fresh", "Porch drift", "Porch renamed"]
+    diagnostics = manager.rebuild_diagnostics()
+    assert diagnostics is not None
+    assert diagnostics["drifted"] == 1
+    assert set(diagnostics["phases_ms"]) == {"index", "compare", "reread", "write"}
+
+
 def test_managed_rule_area_resolution_uses_direct_room_area(
     hass: HomeAssistant,
 ) -> None:
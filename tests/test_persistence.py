@@ -2,14 +2,28 @@
 
 from __future__ import annotations
 
+import json
+from datetime import timedelta
 from unittest.mock import Mock, patch
 
 from home_topology import LocationManager
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.storage import Store
-
-from custom_components.topomation import _load_configuration, _save_state
-from custom_components.topomation.const import STORAGE_KEY_CONFIG, STORAGE_VERSION
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.topomation import (
+    _configuration_payload,
+    _load_configuration,
+    _module_state_payload,
+    _save_state,
+)
+from custom_components.topomation.const import (
+    STORAGE_KEY_CONFIG,
+    STORAGE_KEY_STATE,
+    STORAGE_VERSION,
+)
+from custom_components.topomation.persistence import TopomationPersistence
 
 
 async def test_save_and_restore_topology_configuration(hass: HomeAssistant) -> None:
@@ -245,3 +259,263 @@ async def test_adjacency_edges_round_trip_when_supported(
         handoff_window_sec=12,
         priority=50,
     )
+
+
+def _persistence_fixture(
+    hass: HomeAssistant,
+) -> tuple[TopomationPersistence, LocationManager, Mock]:
+    loc_mgr = LocationManager()
+    loc_mgr.create_location(id="kitchen", name="Kitchen")
+    occupancy = Mock()
+    occupancy.dump_state.return_value = {"kitchen": {"occupied": False}}
+    modules = {"occupancy": occupancy}
+    persistence = TopomationPersistence(
+        hass,
+        config_payload=lambda: _configuration_payload(loc_mgr),
+        state_payload=lambda: _module_state_payload(modules),
+        delay=1,
+    )
+    return persistence, loc_mgr, occupancy
+
+
+async def _fire_autosave(hass: HomeAssistant) -> None:
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=2))
+    await hass.async_block_till_done()
+
+
+async def test_runtime_changes_write_only_state_store(hass: HomeAssistant) -> None:
+    """Occupancy churn should rewrite topomation.state and never topomation.config."""
+    persistence, _, occupancy = _persistence_fixture(hass)
+
+    for occupied in (True, False, True):
+        occupancy.dump_state.return_value = {"kitchen": {"occupied": occupied}}
+        persistence.schedule_state("occupancy.changed")
+        await _fire_autosave(hass)
+
+    stats = persistence.diagnostics()
+    assert stats["config"]["writes"] == 0
+    assert stats["state"]["writes"] == 3
+    assert stats["state"]["bytes_total"] > 0
+    assert stats["state"]["bytes_last_hour"] == stats["state"]["bytes_total"]
+    assert await Store(hass, STORAGE_VERSION, STORAGE_KEY_CONFIG).async_load() is None
+    saved_state = await Store(hass, STORAGE_VERSION, STORAGE_KEY_STATE).async_load()
+    assert saved_state == {"occupancy": {"kitchen": {"occupied": True}}}
+
+
+async def test_config_writer_debounces_and_skips_unchanged_payloads(
+    hass: HomeAssistant,
+) -> None:
+    """Config writes should coalesce bursts and skip payloads identical to the last write."""
+    persistence, loc_mgr, _ = _persistence_fixture(hass)
+
+    persistence.schedule_config("locations/create")
+    persistence.schedule_config("locations/update")
+    await _fire_autosave(hass)
+    assert persistence.diagnostics()["config"]["writes"] == 1
+
+    persistence.schedule_config("sync/entity_map")
+    await _fire_autosave(hass)
+    config_stats = persistence.diagnostics()["config"]
+    assert config_stats["writes"] == 1
+    assert config_stats["skipped_unchanged"] == 1
+
+    loc_mgr.create_location(id="pantry", name="Pantry", parent_id="kitchen")
+    persistence.schedule_config("location.created")
+    await _fire_autosave(hass)
+    assert persistence.diagnostics()["config"]["writes"] == 2
+    assert persistence.diagnostics()["state"]["writes"] == 0
+
+    restored_mgr = LocationManager()
+    await _load_configuration(hass, restored_mgr)
+    assert restored_mgr.get_location("pantry").parent_id == "kitchen"
+
+
+async def test_save_all_flushes_both_stores_and_cancels_pending_writes(
+    hass: HomeAssistant,
+) -> None:
+    """Shutdown saves should write both stores once, without a trailing debounced write."""
+    persistence, _, _ = _persistence_fixture(hass)
+    persistence.schedule_state("occupancy.changed")
+
+    await persistence.async_save_all()
+    await _fire_autosave(hass)
+
+    stats = persistence.diagnostics()
+    assert stats["config"]["writes"] == 1
+    assert stats["state"]["writes"] == 1
+    assert stats["state"]["skipped_unchanged"] == 0
+
+
+class _FakeRuntimeModule:
+    """Module stub whose dump_state() returns the current per-location state."""
+
+    def __init__(self) -> None:
+        self.state: dict[str, dict[str, object]] = {}
+
+    def dump_state(self) -> dict[str, dict[str, object]]:
+        return {location_id: dict(state) for location_id, state in self.state.items()}
+
+
+def _journal_fixture(
+    hass: HomeAssistant, tmp_path
+) -> tuple[TopomationPersistence, _FakeRuntimeModule]:
+    occupancy = _FakeRuntimeModule()
+    modules = {"occupancy": occupancy}
+    persistence = TopomationPersistence(
+        hass,
+        config_payload=dict,
+        state_payload=lambda: _module_state_payload(modules),
+    )
+    persistence.enable_journal(modules, tmp_path / "state.journal")
+    return persistence, occupancy
+
+
+async def test_state_journal_appends_deltas_and_replays_over_snapshot(
+    hass: HomeAssistant,
+    tmp_path,
+) -> None:
+    """Journal mode should append per-location deltas instead of rewriting the snapshot."""
+    persistence, occupancy = _journal_fixture(hass, tmp_path)
+    journal = persistence.journal
+    await journal.async_compact()
+
+    occupancy.state = {"kitchen": {"is_occupied": True}, "office": {"is_occupied": True}}
+    persistence.schedule_state("occupancy.changed", "occupancy")
+    await hass.async_block_till_done()
+    occupancy.state["kitchen"] = {"is_occupied": True, "locked_by": ["away"]}
+    del occupancy.state["office"]
+    persistence.schedule_state("occupancy.changed", "occupancy")
+    await hass.async_block_till_done()
+
+    lines = (tmp_path / "state.journal").read_text().splitlines()
+    assert len(lines) == 5
+    assert json.loads(lines[0]) == {"g": 1}
+    assert json.loads(lines[-1]) == {"m": "occupancy", "l": "office", "s": None}
+    assert persistence.diagnostics()["state"]["writes"] == 1
+    assert persistence.diagnostics()["journal"]["records_appended"] == 4
+
+    # A crash mid-append leaves a torn trailing line; replay skips it.
+    with (tmp_path / "state.journal").open("a") as handle:
+        handle.write('{"m": "occupancy", "l": "ki')
+
+    snapshot = await Store(hass, STORAGE_VERSION, STORAGE_KEY_STATE).async_load()
+    replayed = await _journal_fixture(hass, tmp_path)[0].journal.async_replay(snapshot)
+    assert replayed == {"occupancy": {"kitchen": {"is_occupied": True, "locked_by": ["away"]}}}
+
+
+async def test_state_journal_coalesces_event_bursts_into_one_dump(
+    hass: HomeAssistant,
+    tmp_path,
+) -> None:
+    """A burst of runtime events should dump and diff the module once per flush."""
+    persistence, occupancy = _journal_fixture(hass, tmp_path)
+    journal = persistence.journal
+    await journal.async_compact()
+
+    with patch.object(occupancy, "dump_state", wraps=occupancy.dump_state) as dump_state:
+        for index in range(20):
+            occupancy.state["kitchen"] = {"is_occupied": True, "hits": index}
+            persistence.schedule_state("occupancy.changed", "occupancy")
+        assert dump_state.call_count == 0
+        await hass.async_block_till_done()
+
+    assert dump_state.call_count == 1
+    lines = (tmp_path / "state.journal").read_text().splitlines()
+    assert [json.loads(line) for line in lines[1:]] == [
+        {"m": "occupancy", "l": "kitchen", "s": {"is_occupied": True, "hits": 19}}
+    ]
+    assert persistence.diagnostics()["journal"]["records_appended"] == 1
+
+
+async def test_state_journal_serializes_only_the_changed_location(
+    hass: HomeAssistant,
+    tmp_path,
+) -> None:
+    """A location-scoped event should journal that location without dumping the others."""
+    persistence, occupancy = _journal_fixture(hass, tmp_path)
+    occupancy.state = {
+        "kitchen": {"is_occupied": False},
+        "office": {"is_occupied": False},
+        "pantry": {"is_occupied": False},
+    }
+    journal = persistence.journal
+    await journal.async_compact()
+
+    occupancy.dump_location_state = Mock(
+        side_effect=lambda location_id: occupancy.state.get(location_id)
+    )
+    with patch.object(occupancy, "dump_state", wraps=occupancy.dump_state) as dump_state:
+        occupancy.state["kitchen"] = {"is_occupied": True}
+        persistence.schedule_state("occupancy.changed", "occupancy", "kitchen")
+        persistence.schedule_state("occupancy.changed", "occupancy", "kitchen")
+        await hass.async_block_till_done()
+
+    dump_state.assert_not_called()
+    occupancy.dump_location_state.assert_called_once_with("kitchen")
+    lines = (tmp_path / "state.journal").read_text().splitlines()
+    assert [json.loads(line) for line in lines[1:]] == [
+        {"m": "occupancy", "l": "kitchen", "s": {"is_occupied": True}}
+    ]
+
+
+async def test_state_journal_compaction_folds_records_into_snapshot(
+    hass: HomeAssistant,
+    tmp_path,
+) -> None:
+    """Crossing the size threshold should fold the journal into a new snapshot generation."""
+    persistence, occupancy = _journal_fixture(hass, tmp_path)
+    journal = persistence.journal
+    journal._compact_bytes = 1
+    await journal.async_compact()
+
+    occupancy.state = {"kitchen": {"is_occupied": True}}
+    persistence.schedule_state("occupancy.changed", "occupancy")
+    await hass.async_block_till_done()
+
+    assert journal.generation == 2
+    assert (tmp_path / "state.journal").read_text().splitlines() == ['{"g":2}']
+    snapshot = await Store(hass, STORAGE_VERSION, STORAGE_KEY_STATE).async_load()
+    assert snapshot == {"occupancy": {"kitchen": {"is_occupied": True}}, "journal_generation": 2}
+
+    # A journal left behind from an older generation was already folded in.
+    (tmp_path / "state.journal").write_text(
+        '{"g":1}\n{"m":"occupancy","l":"kitchen","s":null}\n'
+    )
+    replayed = await _journal_fixture(hass, tmp_path)[0].journal.async_replay(snapshot)
+    assert replayed == {"occupancy": {"kitchen": {"is_occupied": True}}}
+
+
+async def test_restore_orders_deep_hierarchy_parent_first_in_one_pass(
+    hass: HomeAssistant,
+) -> None:
+    """Children listed before parents, cycles and dangling parents should all restore."""
+    chain = [
+        {"id": f"level_{depth}", "name": f"Level {depth}", "parent_id": f"level_{depth - 1}"}
+        for depth in range(1, 30)
+    ]
+    locations = [
+        *reversed(chain),
+        {"id": "level_0", "name": "Level 0", "parent_id": None, "is_explicit_root": True},
+        {"id": "den", "name": "Den", "parent_id": "level_0", "order": 1},
+        {"id": "attic", "name": "Attic", "parent_id": "level_0", "order": 0},
+        {"id": "loop_a", "name": "Loop A", "parent_id": "loop_b"},
+        {"id": "loop_b", "name": "Loop B", "parent_id": "loop_a"},
+        {"id": "stray", "name": "Stray", "parent_id": "missing_parent"},
+    ]
+    await Store(hass, STORAGE_VERSION, STORAGE_KEY_CONFIG).async_save({"locations": locations})
+
+    loc_mgr = LocationManager()
+    with patch.object(loc_mgr, "get_location", wraps=loc_mgr.get_location) as get_location:
+        await _load_configuration(hass, loc_mgr)
+
+    assert len(loc_mgr.all_locations()) == len(locations)
+    assert loc_mgr.get_location("level_29").parent_id == "level_28"
+    assert loc_mgr.get_location("level_0").is_explicit_root is True
+    assert loc_mgr.get_location("attic").order < loc_mgr.get_location("den").order
+    # The cycle is broken at the smallest restore key (parent "loop_a" sorts first).
+    assert loc_mgr.get_location("loop_b").parent_id is None
+    assert loc_mgr.get_location("loop_a").parent_id == "loop_b"
+    assert loc_mgr.get_location("stray").parent_id is None
+    assert loc_mgr.get_location("stray").is_explicit_root is False
+    # Lookups stay linear (create + config restore + dangling parents), not one per pass.
+    assert get_location.call_count <= 3 * len(locations)
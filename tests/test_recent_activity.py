@@ -95,3 +95,109 @@ def test_non_property_config_change_clears_recent_activity_state() -> None:
     module.on_location_config_changed("pathway", {"enabled": True})
 
     assert "pathway" not in module.dump_state()
+
+
+def test_recent_activity_pushes_property_deadlines() -> None:
+    """Refresh, expiry, and restore push per-property deadlines to the coordinator."""
+    _loc_mgr, _bus, module = _manager_with_property()
+    now = datetime.now(UTC).replace(microsecond=0)
+    module.refresh("home", reason="manual", now=now)
+
+    pushed: list[tuple[str, datetime | None]] = []
+    module.set_deadline_callback(lambda key, deadline: pushed.append((key, deadline)))
+    assert pushed == [("home", now + timedelta(hours=48))]
+
+    module.check_timeouts(now + timedelta(hours=49))
+    assert pushed[-1] == ("home", None)
+
+    module.restore_state(
+        {"home": {"active": True, "active_until": (now + timedelta(hours=2)).isoformat()}}
+    )
+    assert pushed[-1] == ("home", now + timedelta(hours=2))
+
+
+def test_restore_state_accepts_legacy_iso_payload_and_round_trips() -> None:
+    """Persisted ISO payloads restore into datetimes and dump back unchanged."""
+    _loc_mgr, _bus, module = _manager_with_property()
+    now = datetime.now(UTC).replace(microsecond=0)
+    payload = {
+        "home": {
+            "active": True,
+            "last_activity_at": now.isoformat(),
+            "active_until": (now + timedelta(hours=1)).isoformat(),
+            "reason": " descendant_occupancy ",
+            "source_location_id": "pathway",
+            "source_id": "",
+        },
+        # Active without an expiry can never lapse, so it restores inactive.
+        "cabin": {"active": True, "active_until": None},
+    }
+
+    module.restore_state(payload)
+
+    assert module.dump_state()["home"] == {
+        **payload["home"],
+        "reason": "descendant_occupancy",
+        "source_id": None,
+    }
+    assert module.dump_state()["cabin"]["active"] is False
+    assert module.get_state("home")["active"] is True
+    assert module.get_next_timeout() == now + timedelta(hours=1)
+
+
+def test_refresh_supersedes_queued_expiry() -> None:
+    """An extended window leaves the earlier heap entry stale instead of expiring."""
+    _loc_mgr, _bus, module = _manager_with_property()
+    now = datetime.now(UTC).replace(microsecond=0)
+    module.refresh("home", reason="manual", now=now - timedelta(hours=47))
+    module.refresh("home", reason="manual", now=now)
+
+    module.check_timeouts(now + timedelta(hours=2))
+    assert module.get_state("home")["active"] is True
+    assert module.get_next_timeout() == now + timedelta(hours=48)
+
+    module.check_timeouts(now + timedelta(hours=48))
+    assert module.get_state("home")["active"] is False
+    assert module.get_next_timeout() is None
+
+
+def test_ancestor_property_cache_tracks_topology_and_meta_changes() -> None:
+    """Occupancy refreshes reuse cached ancestors until the topology changes."""
+    loc_mgr, bus, module = _manager_with_property()
+    loc_mgr.create_location(id="cabin", name="Cabin")
+    loc_mgr.set_module_config("cabin", "_meta", {"type": "property"})
+    loc_mgr.set_module_config("cabin", MODULE_ID, {"enabled": True})
+    module.invalidate_ancestor_cache()
+    ancestor_calls: list[str] = []
+    ancestors_of = loc_mgr.ancestors_of
+
+    def _counting_ancestors_of(location_id: str):
+        ancestor_calls.append(location_id)
+        return ancestors_of(location_id)
+
+    loc_mgr.ancestors_of = _counting_ancestors_of
+
+    def _occupied(location_id: str) -> None:
+        bus.publish(
+            Event(
+                type="occupancy.changed",
+                source="test",
+                location_id=location_id,
+                payload={"occupied": True},
+            )
+        )
+
+    _occupied("pathway")
+    _occupied("pathway")
+    assert ancestor_calls == ["pathway"]
+    assert module.get_state("home")["active"] is True
+
+    # Reparenting publishes location.parent_changed and drops the cache.
+    loc_mgr.update_location("pathway", parent_id="cabin")
+    _occupied("pathway")
+    assert ancestor_calls == ["pathway", "pathway"]
+    assert module.get_state("cabin")["active"] is True
+
+    # Replacing the stored config is picked up without an explicit invalidation.
+    loc_mgr.set_module_config("cabin", MODULE_ID, {"enabled": False})
+    assert module.get_state("cabin")["enabled"] is False
@@ -0,0 +1,44 @@
+"""Tests for setup phase timing."""
+
+from __future__ import annotations
+
+import logging
+from unittest.mock import patch
+
+import pytest
+
+from custom_components.topomation.startup_timing import StartupTimer
+
+
+def test_startup_timer_laps_and_warns_over_budget(caplog: pytest.LogCaptureFixture) -> None:
+    """Each lap covers the time since the previous one; over-budget setups warn."""
+    clock = iter([100.0, 100.5, 102.0, 102.25, 103.0])
+    with patch(
+        "custom_components.topomation.startup_timing.time.monotonic",
+        side_effect=lambda: next(clock),
+    ):
+        startup = StartupTimer(budget_seconds=2.5)
+        startup.lap("config_load")
+        startup.lap("sync_import")
+        startup.lap("platform_forwarding")
+        with caplog.at_level(logging.WARNING):
+            assert startup.finish("entry_1") == 3.0
+
+    assert startup.as_dict() == {
+        "total_ms": 3000.0,
+        "budget_ms": 2500.0,
+        "over_budget": True,
+        "phases_ms": {"config_load": 500.0, "sync_import": 1500.0, "platform_forwarding": 250.0},
+    }
+    assert "slowest phases: sync_import=1500ms, config_load=500ms" in caplog.text
+
+
+def test_startup_timer_within_budget_does_not_warn(caplog: pytest.LogCaptureFixture) -> None:
+    """Setups inside the budget should only log at debug level."""
+    startup = StartupTimer(budget_seconds=60.0)
+    startup.lap("config_load")
+    with caplog.at_level(logging.WARNING):
+        startup.finish("entry_1")
+
+    assert startup.over_budget is False
+    assert caplog.text == ""
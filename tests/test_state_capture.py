@@ -0,0 +1,217 @@
+"""Tests for EventBridge state-stream capture."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from pathlib import Path
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+import voluptuous as vol
+from home_topology import Event, EventBus, EventFilter, LocationManager
+from homeassistant.const import STATE_OFF, STATE_ON
+from homeassistant.core import HomeAssistant
+
+from custom_components.topomation.const import DOMAIN
+from custom_components.topomation.event_bridge import EventBridge
+from custom_components.topomation.services import async_register_services
+from custom_components.topomation.state_capture import (
+    CAPTURE_DIRECTORY,
+    async_fire_recorded_state_change,
+    load_state_stream,
+    state_changed_data,
+)
+
+
+async def test_capture_records_bridge_stream_for_replay(
+    hass: HomeAssistant,
+    tmp_path: Path,
+) -> None:
+    """Captured events should carry the topology header and replay to the same signals."""
+    bus = EventBus()
+    loc_mgr = LocationManager()
+    bus.set_location_manager(loc_mgr)
+    loc_mgr.set_event_bus(bus)
+    loc_mgr.create_location(id="kitchen", name="Kitchen")
+    loc_mgr.add_entity_to_location("binary_sensor.kitchen_motion", "kitchen")
+    loc_mgr.set_module_config(
+        "kitchen",
+        "occupancy",
+        {
+            "enabled": True,
+            "occupancy_sources": [
+                {
+                    "entity_id": "binary_sensor.kitchen_motion",
+                    "mode": "specific_states",
+                    "on_event": "trigger",
+                    "on_timeout": 300,
+                    "off_event": "clear",
+                    "off_trailing": 0,
+                }
+            ],
+        },
+    )
+    hass.states.async_set("binary_sensor.kitchen_motion", STATE_OFF)
+    captured: list[Event] = []
+    bus.subscribe(captured.append, EventFilter(event_type="occupancy.signal"))
+
+    bridge = EventBridge(hass, bus, loc_mgr)
+    await bridge.async_setup()
+    capture_path = tmp_path / "capture.jsonl"
+    await bridge.async_start_capture(capture_path)
+
+    hass.states.async_set("sensor.power_meter", "12")
+    hass.states.async_set("binary_sensor.kitchen_motion", STATE_ON, {"device_class": "motion"})
+    await hass.async_block_till_done()
+
+    assert await bridge.async_stop_capture() == 1
+    assert await bridge.async_stop_capture() is None
+    await bridge.async_teardown()
+
+    header, records = load_state_stream(capture_path)
+    assert header["v"] == 1
+    [kitchen] = header["config"]["locations"]
+    assert kitchen["entity_ids"] == ["binary_sensor.kitchen_motion"]
+    assert kitchen["modules"]["occupancy"]["occupancy_sources"][0]["on_timeout"] == 300
+    assert [record["e"] for record in records] == ["binary_sensor.kitchen_motion"]
+
+    data = state_changed_data(records[0])
+    assert data["old_state"].state == STATE_OFF
+    assert data["new_state"].state == STATE_ON
+    assert data["new_state"].attributes["device_class"] == "motion"
+
+    replay_bridge = EventBridge(hass, bus, loc_mgr)
+    replay_bridge._state_changed_listener(Mock(data=data))
+    assert [event.payload["source_id"] for event in captured] == [
+        "binary_sensor.kitchen_motion",
+        "binary_sensor.kitchen_motion",
+    ]
+
+
+async def test_capture_state_stream_service_toggles_bridge_capture(hass: HomeAssistant) -> None:
+    """The service should start/stop the bridge capture inside the config directory."""
+    event_bridge = Mock()
+    event_bridge.async_start_capture = AsyncMock()
+    event_bridge.async_stop_capture = AsyncMock(return_value=3)
+    hass.data[DOMAIN] = {"entry_1": {"modules": {}, "event_bridge": event_bridge}}
+    async_register_services(hass)
+
+    await hass.services.async_call(
+        DOMAIN,
+        "capture_state_stream",
+        {"enabled": True, "filename": "storm.jsonl"},
+        blocking=True,
+    )
+    event_bridge.async_start_capture.assert_awaited_once_with(
+        Path(hass.config.path(CAPTURE_DIRECTORY, "storm.jsonl"))
+    )
+
+    await hass.services.async_call(
+        DOMAIN, "capture_state_stream", {"enabled": False}, blocking=True
+    )
+    event_bridge.async_stop_capture.assert_awaited_once()
+
+    with pytest.raises(vol.Invalid):
+        await hass.services.async_call(
+            DOMAIN,
+            "capture_state_stream",
+            {"enabled": True, "filename": "../secrets.yaml"},
+            blocking=True,
+        )
+    with pytest.raises(vol.Invalid):
+        await hass.services.async_call(
+            DOMAIN,
+            "capture_state_stream",
+            {"enabled": True, "filename": "configuration.yaml"},
+            blocking=True,
+        )
+    event_bridge.async_start_capture.assert_awaited_once()
+
+
+async def test_capture_refuses_to_replace_a_file_that_is_not_a_capture(
+    hass: HomeAssistant,
+    tmp_path: Path,
+) -> None:
+    """Only a previous capture may be replaced; any other existing file is left intact."""
+    bus = EventBus()
+    loc_mgr = LocationManager()
+    bus.set_location_manager(loc_mgr)
+    loc_mgr.set_event_bus(bus)
+    bridge = EventBridge(hass, bus, loc_mgr)
+
+    notes = tmp_path / "captures" / "notes.jsonl"
+    notes.parent.mkdir()
+    notes.write_text('{"important": true}\n')
+    with pytest.raises(FileExistsError):
+        await bridge.async_start_capture(notes)
+    assert notes.read_text() == '{"important": true}\n'
+    assert await bridge.async_stop_capture() is None
+
+    previous = tmp_path / "captures" / "previous.jsonl"
+    await bridge.async_start_capture(previous)
+    assert await bridge.async_stop_capture() == 0
+    await bridge.async_start_capture(previous)
+    assert await bridge.async_stop_capture() == 0
+    header, records = load_state_stream(previous)
+    assert header["kind"] == "header"
+    assert records == []
+
+
+async def test_replay_coalesces_on_recorded_time_at_any_speed(hass: HomeAssistant) -> None:
+    """Replaying a dimmer slide faster than real time should suppress the same triggers."""
+    bus = EventBus()
+    loc_mgr = LocationManager()
+    bus.set_location_manager(loc_mgr)
+    loc_mgr.set_event_bus(bus)
+    loc_mgr.create_location(id="kitchen", name="Kitchen")
+    loc_mgr.add_entity_to_location("light.kitchen", "kitchen")
+    loc_mgr.set_module_config(
+        "kitchen",
+        "occupancy",
+        {
+            "enabled": True,
+            "occupancy_sources": [
+                {
+                    "entity_id": "light.kitchen",
+                    "source_id": "light.kitchen::level",
+                    "signal_key": "level",
+                    "on_event": "trigger",
+                    "on_timeout": 300,
+                }
+            ],
+        },
+    )
+    # Level triggers recorded across 5 s; the default 2 s window lets 0.0, 2.5 and 5.0 through.
+    records = [
+        {
+            "t": offset,
+            "e": "light.kitchen",
+            "o": ["on", {"brightness": 10 * index + 10}],
+            "n": ["on", {"brightness": 10 * index + 20}],
+        }
+        for index, offset in enumerate((0.0, 0.5, 1.0, 2.5, 2.7, 5.0))
+    ]
+
+    async def _replay(speed: float) -> tuple[int, int]:
+        captured: list[Event] = []
+        unsubscribe = bus.subscribe(captured.append, EventFilter(event_type="occupancy.signal"))
+        bridge = EventBridge(hass, bus, loc_mgr)
+        await bridge.async_setup()
+        replay_started = time.time()
+        paced_from = time.perf_counter()
+        for record in records:
+            if speed > 0:
+                delay = record["t"] / speed - (time.perf_counter() - paced_from)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            async_fire_recorded_state_change(hass, record, replay_started)
+            await hass.async_block_till_done()
+        suppressed = bridge.diagnostics()["coalesced_triggers"]["suppressed_total"]
+        await bridge.async_teardown()
+        if callable(unsubscribe):
+            unsubscribe()
+        return len(captured), suppressed
+
+    assert await _replay(0) == (3, 3)
+    assert await _replay(100) == (3, 3)
@@ -532,6 +532,28 @@ class TestHAToTopologySync:
         location = loc_mgr.get_location(f"area_{kitchen.id}")
         assert location.name == "Culinary Space"
 
+    async def test_registry_sync_reports_topology_changes(
+        self,
+        hass: HomeAssistant,
+        loc_mgr: LocationManager,
+        event_bus: EventBus,
+        clean_registries,
+    ):
+        """Registry-driven mutations should notify the config persistence hook."""
+        reasons: list[str] = []
+        manager = SyncManager(hass, loc_mgr, event_bus, on_topology_changed=reasons.append)
+        area_reg = ar.async_get(hass)
+        kitchen = area_reg.async_create("Kitchen")
+
+        await manager.async_setup()
+        assert reasons == ["sync/import"]
+
+        area_reg.async_update(kitchen.id, name="Culinary Space")
+        await hass.async_block_till_done()
+        assert reasons[-1] == "sync/area_update"
+
+        await manager.async_teardown()
+
     async def test_floor_rename_updates_location(
         self,
         hass: HomeAssistant,
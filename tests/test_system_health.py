@@ -8,7 +8,8 @@ from unittest.mock import Mock, patch
 from home_topology import __version__ as home_topology_version
 from homeassistant.core import HomeAssistant
 
-from custom_components.topomation.const import VERSION
+from custom_components.topomation.const import DOMAIN, VERSION
+from custom_components.topomation.startup_timing import StartupTimer
 from custom_components.topomation.system_health import async_register, system_health_info
 
 
@@ -45,3 +46,17 @@ async def test_system_health_info_handles_missing_distribution(
         info = await system_health_info(hass)
 
     assert info["home_topology_installed_version"] == "unknown"
+
+
+async def test_system_health_info_reports_startup_phases(hass: HomeAssistant) -> None:
+    """Startup phase timings of a loaded entry should be surfaced."""
+    startup = StartupTimer(budget_seconds=2.0)
+    startup.phases = {"config_load": 0.0125, "sync_import": 0.25}
+    startup.total_seconds = 0.3
+    hass.data[DOMAIN] = {"entry_1": {"startup_timing": startup}}
+
+    info = await system_health_info(hass)
+
+    assert info["startup_total_ms"] == 300.0
+    assert info["startup_budget_ms"] == 2000.0
+    assert info["startup_phases_ms"] == "config_load=12.5, sync_import=250"
@@ -22,7 +22,7 @@ from homeassistant.helpers import area_registry as ar
 from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers import floor_registry as fr
 from homeassistant.helpers.storage import Store
-from home_topology import LocationManager
+from home_topology import Event, EventFilter, LocationManager
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
 from custom_components.topomation.const import (  # type: ignore[import]
@@ -49,6 +49,7 @@ from custom_components.topomation.const import (  # type: ignore[import]
     WS_TYPE_SYNC_ENABLE,
     WS_TYPE_SYNC_STATUS,
 )
+from custom_components.topomation import websocket_api as websocket_api_module
 from custom_components.topomation.websocket_api import (  # type: ignore[import]
     build_occupancy_projection_states,
     handle_adjacency_create,
@@ -2395,6 +2396,222 @@ def test_occupancy_projection_rolls_area_children_into_parent_area(
     ]
 
 
+@pytest.mark.asyncio
+async def test_occupancy_projection_store_matches_full_rebuild_incrementally(
+    hass: HomeAssistant,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Incremental projection refresh should match a full rebuild and touch only peers."""
+    entry = MockConfigEntry(domain=DOMAIN, data={}, entry_id="test_entry")
+    entry.add_to_hass(hass)
+
+    with patch("custom_components.topomation.async_register_panel", AsyncMock()):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+    kernel = hass.data[DOMAIN][entry.entry_id]
+    loc_mgr = kernel["location_manager"]
+    occupancy_module = kernel["modules"]["occupancy"]
+    store = kernel["occupancy_projection"]
+
+    if loc_mgr.get_location("building_main") is None:
+        loc_mgr.create_location(id="building_main", name="Home", parent_id=None)
+    loc_mgr.set_module_config("building_main", "_meta", {"type": "building"})
+    loc_mgr.create_location(id="floor_main", name="Main Floor", parent_id="building_main")
+    loc_mgr.set_module_config("floor_main", "_meta", {"type": "floor"})
+    for location_id, name in (
+        ("area_kitchen", "Kitchen"),
+        ("area_front_entry", "Front Entry"),
+        ("area_office", "Office"),
+    ):
+        loc_mgr.create_location(id=location_id, name=name, parent_id="floor_main")
+        loc_mgr.set_module_config(location_id, "_meta", {"type": "area"})
+
+    connection = _fake_connection()
+    for request_id, location_id in ((4301, "area_kitchen"), (4302, "area_front_entry")):
+        handle_locations_set_module_config(
+            hass,
+            connection,
+            {
+                "id": request_id,
+                "type": WS_TYPE_LOCATIONS_SET_MODULE_CONFIG,
+                "location_id": location_id,
+                "module_id": "occupancy",
+                "config": {
+                    "enabled": True,
+                    "occupancy_sources": [],
+                    "occupancy_group_id": "main_open_area",
+                },
+                "entry_id": entry.entry_id,
+            },
+        )
+    await hass.async_block_till_done()
+
+    store.states()
+    assert store.verify() == []
+
+    with patch(
+        "custom_components.topomation.websocket_api._project_location_state",
+        wraps=websocket_api_module._project_location_state,
+    ) as project_row:
+        occupancy_module.trigger("area_front_entry", "sensor.front_entry_motion", None)
+        await hass.async_block_till_done()
+
+    projected_ids = {call.args[5].id for call in project_row.call_args_list}
+    assert "area_office" not in projected_ids
+    assert {"area_front_entry", "area_kitchen"} <= projected_ids
+    assert store.verify() == []
+    store.consistency_check = True
+
+    states_by_id = {row["location_id"]: row for row in store.states()}
+    assert states_by_id["area_kitchen"]["occupied"] is True
+    assert states_by_id["floor_main"]["occupied"] is True
+    assert states_by_id["area_office"]["occupied"] is False
+    assert store.verify() == []
+
+    live_rows = store.refresh_location("area_kitchen")
+    assert [row["location_id"] for row in live_rows] == ["area_front_entry", "area_kitchen"]
+
+    occupancy_module.vacate("area_front_entry")
+    await hass.async_block_till_done()
+
+    states_by_id = {row["location_id"]: row for row in store.states()}
+    assert states_by_id["area_kitchen"]["occupied"] is False
+    assert states_by_id["floor_main"]["occupied"] is False
+    assert store.verify() == []
+    full_by_id = {row["location_id"]: row for row in build_occupancy_projection_states(hass, kernel)}
+    assert full_by_id.keys() == states_by_id.keys()
+    assert "drifted from full rebuild" not in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_occupancy_projection_store_rereads_state_after_signal_without_transition(
+    hass: HomeAssistant,
+) -> None:
+    """A re-trigger that only extends the timeout should reach the next projection read."""
+    entry = MockConfigEntry(domain=DOMAIN, data={}, entry_id="test_entry")
+    entry.add_to_hass(hass)
+
+    with patch("custom_components.topomation.async_register_panel", AsyncMock()):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+    kernel = hass.data[DOMAIN][entry.entry_id]
+    loc_mgr = kernel["location_manager"]
+    occupancy_module = kernel["modules"]["occupancy"]
+    bus = kernel["event_bus"]
+    store = kernel["occupancy_projection"]
+
+    if loc_mgr.get_location("building_main") is None:
+        loc_mgr.create_location(id="building_main", name="Home", parent_id=None)
+    loc_mgr.set_module_config("building_main", "_meta", {"type": "building"})
+    loc_mgr.create_location(id="floor_main", name="Main Floor", parent_id="building_main")
+    loc_mgr.set_module_config("floor_main", "_meta", {"type": "floor"})
+    loc_mgr.create_location(id="area_office", name="Office", parent_id="floor_main")
+    loc_mgr.set_module_config("area_office", "_meta", {"type": "area"})
+
+    occupancy_module.trigger("area_office", "binary_sensor.office_motion", 300)
+    await hass.async_block_till_done()
+    first = {row["location_id"]: row for row in store.states()}
+    assert first["area_office"]["occupied"] is True
+
+    changed_events: list[object] = []
+    bus.subscribe(changed_events.append, EventFilter(event_type="occupancy.changed"))
+    # Suppress the transition so only occupancy.signal reaches the store.
+    with patch.object(occupancy_module, "_emit_occupancy_changed"):
+        bus.publish(
+            Event(
+                type="occupancy.signal",
+                source="ha",
+                entity_id="binary_sensor.office_motion",
+                location_id="area_office",
+                payload={
+                    "event_type": "trigger",
+                    "source_id": "binary_sensor.office_motion",
+                    "timeout": 3600,
+                },
+                timestamp=datetime.now(UTC),
+            )
+        )
+        await hass.async_block_till_done()
+    assert changed_events == []
+
+    second = {row["location_id"]: row for row in store.states()}
+    assert second["area_office"]["occupied"] is True
+    assert second["area_office"]["contributions"] != first["area_office"]["contributions"]
+    full_by_id = {row["location_id"]: row for row in build_occupancy_projection_states(hass, kernel)}
+    assert second["area_office"]["contributions"] == full_by_id["area_office"]["contributions"]
+
+
+def test_subtree_rollups_match_descendant_walk() -> None:
+    """Single-pass rollups should match a per-location depth-first descendant walk."""
+    loc_mgr = LocationManager()
+    loc_mgr.create_location(id="home", name="Home")
+    loc_mgr.set_module_config("home", "_meta", {"type": "property"})
+    loc_mgr.create_location(id="floor_main", name="Main", parent_id="home")
+    loc_mgr.set_module_config(
+        "floor_main", "_meta", {"type": "floor", "shadow_area_id": "area_main_shadow"}
+    )
+    loc_mgr.create_location(id="area_main_shadow", name="Main", parent_id="floor_main")
+    loc_mgr.set_module_config(
+        "area_main_shadow",
+        "_meta",
+        {"type": "area", "role": "managed_shadow", "shadow_for_location_id": "floor_main"},
+    )
+    parent_id = "floor_main"
+    for index in range(30):
+        location_id = f"area_chain_{index}"
+        loc_mgr.create_location(id=location_id, name=location_id, parent_id=parent_id)
+        loc_mgr.set_module_config(location_id, "_meta", {"type": "area"})
+        parent_id = location_id
+    loc_mgr.create_location(id="area_office", name="Office", parent_id="floor_main")
+    loc_mgr.set_module_config("area_office", "_meta", {"type": "area"})
+    loc_mgr.create_location(id="floor_up", name="Upstairs", parent_id="home")
+    loc_mgr.set_module_config("floor_up", "_meta", {"type": "floor"})
+
+    occupied = {"area_main_shadow": True, "area_chain_12": True, "area_chain_25": True}
+    raw_states: dict[str, dict[str, object] | None] = {}
+    for index, location in enumerate(loc_mgr.all_locations()):
+        if location.id in occupied:
+            raw_states[location.id] = {"occupied": True}
+        elif index % 4 == 0:
+            raw_states[location.id] = None
+        else:
+            raw_states[location.id] = {"occupied": False}
+
+    topology = websocket_api_module._projection_topology(loc_mgr)
+    rollups = websocket_api_module._subtree_rollups(topology, raw_states)
+
+    def descendants(location_id: str) -> list[str]:
+        result: list[str] = []
+        for child in topology.by_parent.get(location_id, []):
+            result.append(child.id)
+            result.extend(descendants(child.id))
+        return result
+
+    for location in topology.locations:
+        counted = [
+            child_id
+            for child_id in descendants(location.id)
+            if not websocket_api_module._is_managed_shadow_area(
+                topology.locations_by_id[child_id]
+            )
+        ]
+        expected_first = next(
+            (child_id for child_id in counted if (raw_states[child_id] or {}).get("occupied")),
+            None,
+        )
+        expected_vacant = sum(
+            1 for child_id in counted if (raw_states[child_id] or {}).get("occupied") is False
+        )
+        assert rollups[location.id].first_occupied_id == expected_first, location.id
+        assert rollups[location.id].vacant_count == expected_vacant, location.id
+
+    assert rollups["home"].first_occupied_id == "area_chain_12"
+    assert rollups["area_chain_12"].first_occupied_id == "area_chain_25"
+    assert rollups["floor_up"] == websocket_api_module._SubtreeRollup()
+
+
 @pytest.mark.asyncio
 async def test_grouped_area_binary_sensors_timeout_together(
     hass: HomeAssistant,